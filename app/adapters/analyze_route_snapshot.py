@@ -1,14 +1,18 @@
 import argparse
 import csv
-import statistics
+import gzip
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, TextIO
+
+from app.adapters.binlog import BinLogReader, is_binlog
 
 MINUTES_PER_DAY = 24 * 60
 
 
-def _to_int(s: str):
+def to_int(s: str):
     s = (s or "").strip()
     if s == "":
         return None
@@ -47,101 +51,212 @@ class SeriesStats:
     jumps_ge_5: int
 
 
+class StreamingMedian:
+    """
+    정확한 중앙값을 값 히스토그램으로 계산한다.
+    - 간격은 초 단위 정수라 서로 다른 값의 수가 작다 -> 표본 수와 무관한 메모리
+    """
+
+    def __init__(self):
+        self._hist: Counter = Counter()
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        self._hist[x] += 1
+        self.count += 1
+
+    def median(self) -> float | None:
+        if self.count == 0:
+            return None
+        # statistics.median과 같게: 짝수면 가운데 두 값의 평균
+        lo_rank = (self.count - 1) // 2
+        hi_rank = self.count // 2
+        lo = hi = None
+        seen = 0
+        for value in sorted(self._hist):
+            seen += self._hist[value]
+            if lo is None and seen > lo_rank:
+                lo = value
+            if seen > hi_rank:
+                hi = value
+                break
+        return (lo + hi) / 2
+
+
+class SeriesAccumulator:
+    """
+    한 series의 SeriesStats를 1회 순회로 누적한다(행을 저장하지 않음).
+    """
+
+    def __init__(self, name: str, circular: bool = False):
+        self.name = name
+        self.circular = circular
+        self.n = 0
+        self.missing = 0
+        self.change_events = 0
+        self.jump_max: int | None = None
+        self.jumps_ge_2 = 0
+        self.jumps_ge_5 = 0
+        self._prev: int | None = None
+        self._last_change: datetime | None = None
+        self._change_intervals = StreamingMedian()
+
+    def add(self, t: datetime, v: int | None) -> None:
+        if v is None:
+            self.missing += 1
+
+        if self.n > 0:
+            prev = self._prev
+            if v != prev:
+                self.change_events += 1
+                if self._last_change is not None:
+                    self._change_intervals.add((t - self._last_change).total_seconds())
+                self._last_change = t
+
+            if v is not None and prev is not None:
+                jump = _circular_diff_min(v, prev) if self.circular else abs(v - prev)
+                if self.jump_max is None or jump > self.jump_max:
+                    self.jump_max = jump
+                if jump >= 2:
+                    self.jumps_ge_2 += 1
+                if jump >= 5:
+                    self.jumps_ge_5 += 1
+
+        self._prev = v
+        self.n += 1
+
+    def result(self) -> SeriesStats:
+        median = self._change_intervals.median()
+        return SeriesStats(
+            name=self.name,
+            n=self.n,
+            missing=self.missing,
+            change_events=self.change_events,
+            change_rate=(self.change_events / (self.n - 1)) if self.n > 1 else 0.0,
+            change_interval_median_sec=None if median is None else float(median),
+            jump_max=self.jump_max,
+            jumps_ge_2=self.jumps_ge_2,
+            jumps_ge_5=self.jumps_ge_5,
+        )
+
+
 def compute_series_stats(name: str, times: list[datetime], values: list[int | None], circular: bool = False) -> SeriesStats:
-    n = len(values)
-    missing = sum(1 for v in values if v is None)
-
-    change_times: list[datetime] = []
-    for i in range(1, n):
-        if values[i] != values[i - 1]:
-            change_times.append(times[i])
-
-    change_events = len(change_times)
-    change_rate = (change_events / (n - 1)) if n > 1 else 0.0
-
-    change_interval_median_sec = None
-    if len(change_times) >= 2:
-        intervals = [(change_times[i] - change_times[i - 1]).total_seconds() for i in range(1, len(change_times))]
-        change_interval_median_sec = float(statistics.median(intervals))
-
-    jumps = []
-    for i in range(1, n):
-        a = values[i]
-        b = values[i - 1]
-        if a is None or b is None:
-            continue
-        if circular:
-            jumps.append(_circular_diff_min(a, b))
-        else:
-            jumps.append(abs(a - b))
+    acc = SeriesAccumulator(name, circular=circular)
+    for t, v in zip(times, values):
+        acc.add(t, v)
+    return acc.result()
 
-    jump_max = max(jumps) if jumps else None
-    jumps_ge_2 = sum(1 for j in jumps if j >= 2)
-    jumps_ge_5 = sum(1 for j in jumps if j >= 5)
 
-    return SeriesStats(
-        name=name,
+# (series 이름, CSV 컬럼, 파서, circular)
+SERIES_COLUMNS = [
+    ("bus51_eta_min", "bus51_eta_min", to_int, False),
+    ("bus5100_eta_min", "bus5100_eta_min", to_int, False),
+    ("subway_eta1_min", "subway_eta1_min", to_int, False),
+    ("recommended_departure_time(min)", "recommended_departure_time", _to_hhmm_minutes, True),
+]
+ERROR_COLUMNS = ["bus_error", "subway_error", "engine_error"]
+
+
+@dataclass
+class SnapshotReport:
+    n: int
+    first_time: datetime | None
+    last_time: datetime | None
+    interval_median_sec: float
+    interval_min_sec: float
+    interval_max_sec: float
+    errors: dict[str, int]
+    stats: list[SeriesStats]
+    departure_min: int | None
+    departure_max: int | None
+
+
+def analyze_rows(rows: Iterable[dict]) -> SnapshotReport:
+    """
+    route snapshot 행들을 1회 순회하며 집계한다(상수 메모리, 입력은 iterator여도 된다).
+    """
+    n = 0
+    first_time = last_time = None
+    sampling = StreamingMedian()
+    min_dt = max_dt = None
+    errors = {col: 0 for col in ERROR_COLUMNS}
+    series = [SeriesAccumulator(name, circular=circ) for name, _, _, circ in SERIES_COLUMNS]
+    dep_lo = dep_hi = None
+
+    for r in rows:
+        t = datetime.fromisoformat(r["collected_at"])
+        if last_time is not None:
+            dt = (t - last_time).total_seconds()
+            sampling.add(dt)
+            min_dt = dt if min_dt is None else min(min_dt, dt)
+            max_dt = dt if max_dt is None else max(max_dt, dt)
+        if first_time is None:
+            first_time = t
+        last_time = t
+        n += 1
+
+        for col in ERROR_COLUMNS:
+            if (r.get(col) or "").strip() != "":
+                errors[col] += 1
+
+        for acc, (_, col, parse, circ) in zip(series, SERIES_COLUMNS):
+            v = parse(r.get(col, ""))
+            acc.add(t, v)
+            if circ and v is not None:
+                dep_lo = v if dep_lo is None else min(dep_lo, v)
+                dep_hi = v if dep_hi is None else max(dep_hi, v)
+
+    med_dt = sampling.median()
+    return SnapshotReport(
         n=n,
-        missing=missing,
-        change_events=change_events,
-        change_rate=change_rate,
-        change_interval_median_sec=change_interval_median_sec,
-        jump_max=jump_max,
-        jumps_ge_2=jumps_ge_2,
-        jumps_ge_5=jumps_ge_5,
+        first_time=first_time,
+        last_time=last_time,
+        interval_median_sec=med_dt if med_dt is not None else 0,
+        interval_min_sec=min_dt if min_dt is not None else 0,
+        interval_max_sec=max_dt if max_dt is not None else 0,
+        errors=errors,
+        stats=[acc.result() for acc in series],
+        departure_min=dep_lo,
+        departure_max=dep_hi,
     )
 
 
-def main() -> int:
-    p = argparse.ArgumentParser(description="Analyze day6_route_snapshot.csv")
-    p.add_argument("--input", default="logs/day6_route_snapshot.csv")
-    args = p.parse_args()
-
-    path = Path(args.input)
-    if not path.exists():
-        raise SystemExit(f"File not found: {path}")
+def open_log_text(path: Path) -> TextIO:
+    """CSV 로그를 연다. .gz(collect_daemon이 압축한 세그먼트)면 풀면서 읽는다"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return path.open("r", encoding="utf-8-sig", newline="")
 
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
 
-    if not rows:
-        raise SystemExit("No rows in CSV")
+def analyze_file(path: Path) -> SnapshotReport:
+    if is_binlog(path):
+        with BinLogReader(path) as reader:
+            return analyze_rows(reader.iter_dicts())
+    with open_log_text(path) as f:
+        return analyze_rows(csv.DictReader(f))
 
-    times = [datetime.fromisoformat(r["collected_at"]) for r in rows]
-    n = len(times)
 
-    intervals = [(times[i] - times[i - 1]).total_seconds() for i in range(1, n)]
-    med_dt = statistics.median(intervals) if intervals else 0
-    min_dt = min(intervals) if intervals else 0
-    max_dt = max(intervals) if intervals else 0
+def print_report(path: Path, report: SnapshotReport) -> None:
+    n = report.n
 
     print(f"File: {path}")
     print(f"Rows: {n}")
-    print(f"Time range: {times[0]}  ->  {times[-1]}")
-    print(f"Sampling interval (sec): median={med_dt:.1f}, min={min_dt:.1f}, max={max_dt:.1f}")
+    print(f"Time range: {report.first_time}  ->  {report.last_time}")
+    print(
+        f"Sampling interval (sec): median={report.interval_median_sec:.1f}, "
+        f"min={report.interval_min_sec:.1f}, max={report.interval_max_sec:.1f}"
+    )
     print()
 
-    bus51 = [_to_int(r.get("bus51_eta_min", "")) for r in rows]
-    bus5100 = [_to_int(r.get("bus5100_eta_min", "")) for r in rows]
-    sub1 = [_to_int(r.get("subway_eta1_min", "")) for r in rows]
-    dep = [_to_hhmm_minutes(r.get("recommended_departure_time", "")) for r in rows]
-
-    bus_err = sum(1 for r in rows if (r.get("bus_error") or "").strip() != "")
-    sub_err = sum(1 for r in rows if (r.get("subway_error") or "").strip() != "")
-    eng_err = sum(1 for r in rows if (r.get("engine_error") or "").strip() != "")
+    bus_err = report.errors["bus_error"]
+    sub_err = report.errors["subway_error"]
+    eng_err = report.errors["engine_error"]
 
     print(f"Errors: bus_error={bus_err}/{n}, subway_error={sub_err}/{n}, engine_error={eng_err}/{n}")
     print()
 
-    stats = [
-        compute_series_stats("bus51_eta_min", times, bus51),
-        compute_series_stats("bus5100_eta_min", times, bus5100),
-        compute_series_stats("subway_eta1_min", times, sub1),
-        compute_series_stats("recommended_departure_time(min)", times, dep, circular=True),
-    ]
-
-    for s in stats:
+    for s in report.stats:
         miss_pct = (s.missing / s.n) * 100.0
         print(f"[{s.name}]")
         print(f"  missing: {s.missing}/{s.n} ({miss_pct:.1f}%)")
@@ -154,16 +269,46 @@ def main() -> int:
         print(f"  jumps >=2min: {s.jumps_ge_2}, jumps >=5min: {s.jumps_ge_5}")
         print()
 
-    dep_vals = [v for v in dep if v is not None]
-    if dep_vals:
-        lo = min(dep_vals)
-        hi = max(dep_vals)
+    if report.departure_min is not None:
+        lo = report.departure_min
+        hi = report.departure_max
         lo_hh = f"{lo//60:02d}:{lo%60:02d}"
         hi_hh = f"{hi//60:02d}:{hi%60:02d}"
         print(f"Departure range: {lo_hh} ~ {hi_hh} (span={_circular_diff_min(hi, lo)} min)")
     else:
         print("Departure range: (no departure values)")
 
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Analyze day6_route_snapshot.csv")
+    p.add_argument("--input", nargs="+", default=["logs/day6_route_snapshot.csv"])
+    p.add_argument(
+        "--columnar",
+        action="store_true",
+        help="NumPy 열 배열로 모든 파일을 한 번에 계산(대용량 로그용, numpy 필요)",
+    )
+    args = p.parse_args()
+
+    paths = [Path(x) for x in args.input]
+    for path in paths:
+        if not path.exists():
+            raise SystemExit(f"File not found: {path}")
+
+    if args.columnar:
+        from app.adapters.analyze_route_snapshot_columnar import analyze_files
+
+        reports = analyze_files(paths)
+    else:
+        # 파일을 1번만 읽으며 집계(행 전체를 메모리에 올리지 않음)
+        reports = [analyze_file(path) for path in paths]
+
+    for i, (path, report) in enumerate(zip(paths, reports)):
+        if report.n == 0:
+            raise SystemExit(f"No rows in CSV: {path}")
+        if i:
+            print()
+        print_report(path, report)
+
     return 0
 
 
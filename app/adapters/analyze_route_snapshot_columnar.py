@@ -0,0 +1,247 @@
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from app.adapters.analyze_route_snapshot import (
+    ERROR_COLUMNS,
+    MINUTES_PER_DAY,
+    SERIES_COLUMNS,
+    SeriesStats,
+    SnapshotReport,
+    open_log_text,
+)
+from app.adapters.binlog import HHMM_NULL, INT_NULL, ROUTE_SNAPSHOT, BinLogReader, is_binlog
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise RuntimeError("columnar mode needs numpy (pip install numpy)") from e
+    return np
+
+
+@dataclass
+class SnapshotColumns:
+    """
+    여러 route snapshot CSV를 이어 붙인 열(column) 배열.
+    - values/missing: (series, 행) — SERIES_COLUMNS 순서, 결측 자리 값은 0
+    - file_id: 행별 원본 파일 번호(파일 경계를 넘는 변화/점프는 세지 않는다)
+    """
+    paths: list[Path]
+    t_us: "np.ndarray"      # collected_at (epoch microseconds, int64)
+    values: "np.ndarray"    # int64
+    missing: "np.ndarray"   # bool
+    errors: "np.ndarray"    # (ERROR_COLUMNS, 행) bool
+    file_id: "np.ndarray"   # int64
+
+
+def _parse_unique(np, cells: list[str], parse: Callable[[str], int | None]):
+    # 값 종류는 적으므로 고유 문자열만 기존 파서로 변환 -> 행 파싱 결과가 row 방식과 동일
+    uniq, inv = np.unique(np.array(cells, dtype=str), return_inverse=True)
+    parsed = [parse(u) for u in uniq.tolist()]
+    vals = np.array([0 if p is None else p for p in parsed], dtype=np.int64)
+    miss = np.array([p is None for p in parsed], dtype=bool)
+    return vals[inv], miss[inv]
+
+
+def _parse_times(np, cells: list[str]):
+    try:
+        t = np.array(cells, dtype="datetime64[us]")
+    except ValueError:
+        t = np.array([datetime.fromisoformat(s) for s in cells], dtype="datetime64[us]")
+    return t.astype(np.int64)
+
+
+def _load_csv(np, path: Path):
+    wanted = ["collected_at"] + [col for _, col, _, _ in SERIES_COLUMNS] + ERROR_COLUMNS
+    cells: dict[str, list[str]] = {col: [] for col in wanted}
+
+    with open_log_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        pos = {name: i for i, name in enumerate(header)}
+        for row in reader:
+            for col in wanted:
+                i = pos.get(col)
+                cells[col].append(row[i] if i is not None and i < len(row) else "")
+
+    n = len(cells["collected_at"])
+    values, missing = [], []
+    for _, col, parse, _ in SERIES_COLUMNS:
+        v, m = _parse_unique(np, cells[col], parse)
+        values.append(v)
+        missing.append(m)
+
+    return (
+        _parse_times(np, cells["collected_at"]),
+        np.vstack(values).reshape(len(SERIES_COLUMNS), n),
+        np.vstack(missing).reshape(len(SERIES_COLUMNS), n),
+        np.array([[c.strip() != "" for c in cells[col]] for col in ERROR_COLUMNS], dtype=bool).reshape(
+            len(ERROR_COLUMNS), n
+        ),
+    )
+
+
+def _load_binlog(np, path: Path):
+    # 레코드를 numpy 뷰로 바로 읽는다(행 파싱 없음)
+    with BinLogReader(path) as reader:
+        if reader.schema is not ROUTE_SNAPSHOT:
+            raise ValueError(f"{path}: not a route snapshot binlog")
+        kinds = {f.name: f.kind for f in reader.schema.fields}
+        blank = np.array([s.strip() == "" for s in reader.strings], dtype=bool)
+
+        arr = reader.as_numpy()
+        t_us = arr["collected_at"].astype(np.int64) * 1_000_000
+        values, missing = [], []
+        for _, col, _, _ in SERIES_COLUMNS:
+            raw = arr[col].astype(np.int64)
+            m = raw == (HHMM_NULL if kinds[col] == "hhmm" else INT_NULL)
+            values.append(np.where(m, 0, raw))
+            missing.append(m)
+        errors = [~blank[arr[col]] for col in ERROR_COLUMNS]
+        del arr
+
+    n = len(t_us)
+    return (
+        t_us,
+        np.vstack(values).reshape(len(SERIES_COLUMNS), n),
+        np.vstack(missing).reshape(len(SERIES_COLUMNS), n),
+        np.vstack(errors).reshape(len(ERROR_COLUMNS), n),
+    )
+
+
+def load_columns(paths: list[Path]) -> SnapshotColumns:
+    """
+    CSV 또는 route snapshot binlog(.otlog) 파일들을 1번씩 읽어 타입이 있는 배열로 만든다.
+    """
+    np = _require_numpy()
+
+    parts = [_load_binlog(np, p) if is_binlog(p) else _load_csv(np, p) for p in paths]
+    file_sizes = [len(part[0]) for part in parts]
+
+    def cat(i, rows):
+        if not parts:
+            return np.zeros((rows, 0), dtype=np.int64)
+        return np.concatenate([part[i] for part in parts], axis=-1)
+
+    return SnapshotColumns(
+        paths=[Path(p) for p in paths],
+        t_us=np.concatenate([part[0] for part in parts]) if parts else np.zeros(0, dtype=np.int64),
+        values=cat(1, len(SERIES_COLUMNS)),
+        missing=cat(2, len(SERIES_COLUMNS)).astype(bool),
+        errors=cat(3, len(ERROR_COLUMNS)).astype(bool),
+        file_id=np.repeat(np.arange(len(paths), dtype=np.int64), file_sizes),
+    )
+
+
+def _median_sec(np, t_us) -> float | None:
+    if len(t_us) < 2:
+        return None
+    return float(np.median(np.diff(t_us))) / 1e6
+
+
+def analyze_columns(cols: SnapshotColumns) -> list[SnapshotReport]:
+    """
+    모든 series x 모든 파일의 통계를 벡터 연산으로 한 번에 계산한다(파일별 SnapshotReport).
+    - 결과는 analyze_route_snapshot.analyze_rows와 같다
+    """
+    np = _require_numpy()
+
+    n_files = len(cols.paths)
+    V, M, t, fid = cols.values, cols.missing, cols.t_us, cols.file_id
+    circular = np.array([circ for _, _, _, circ in SERIES_COLUMNS], dtype=bool)[:, None]
+
+    # 인접한 두 행(같은 파일 안) 단위의 비교
+    same_file = fid[1:] == fid[:-1]
+    pair_file = fid[1:]
+    Mp, Mc = M[:, :-1], M[:, 1:]
+    changed = ((Mp != Mc) | (~Mp & ~Mc & (V[:, 1:] != V[:, :-1]))) & same_file
+
+    both = ~Mp & ~Mc & same_file
+    d = V[:, 1:] - V[:, :-1]
+    d_mod = d % MINUTES_PER_DAY
+    jumps = np.where(circular, np.minimum(d_mod, MINUTES_PER_DAY - d_mod), np.abs(d))
+
+    def per_file(mask_2d):
+        # (series, pair) bool -> (series, file) 개수
+        out = np.zeros((mask_2d.shape[0], n_files), dtype=np.int64)
+        for k in range(mask_2d.shape[0]):
+            out[k] = np.bincount(pair_file[mask_2d[k]], minlength=n_files)
+        return out
+
+    change_events = per_file(changed)
+    ge2 = per_file(both & (jumps >= 2))
+    ge5 = per_file(both & (jumps >= 5))
+    with_jump = per_file(both)
+
+    jump_max = np.full((V.shape[0], n_files), -1, dtype=np.int64)
+    masked_jumps = np.where(both, jumps, -1)
+    for k in range(V.shape[0]):
+        np.maximum.at(jump_max[k], pair_file, masked_jumps[k])
+
+    sizes = np.bincount(fid, minlength=n_files)
+    missing = np.zeros((V.shape[0], n_files), dtype=np.int64)
+    for k in range(V.shape[0]):
+        missing[k] = np.bincount(fid[M[k]], minlength=n_files)
+    errors = [np.bincount(fid[e], minlength=n_files) for e in cols.errors]
+
+    dep_k = next(k for k, (_, _, _, circ) in enumerate(SERIES_COLUMNS) if circ)
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+
+    reports = []
+    for f in range(n_files):
+        lo, hi = starts[f], starts[f + 1]
+        n = int(sizes[f])
+        tf = t[lo:hi]
+        dt = np.diff(tf) / 1e6
+
+        stats = []
+        for k, (name, _, _, _) in enumerate(SERIES_COLUMNS):
+            # 변화 시각 사이 간격의 중앙값(변화 pair 위치의 오른쪽 행 시각)
+            change_t = t[1:][lo:max(lo, hi - 1)][changed[k, lo:max(lo, hi - 1)]]
+            events = int(change_events[k, f])
+            stats.append(
+                SeriesStats(
+                    name=name,
+                    n=n,
+                    missing=int(missing[k, f]),
+                    change_events=events,
+                    change_rate=(events / (n - 1)) if n > 1 else 0.0,
+                    change_interval_median_sec=_median_sec(np, change_t),
+                    jump_max=int(jump_max[k, f]) if with_jump[k, f] else None,
+                    jumps_ge_2=int(ge2[k, f]),
+                    jumps_ge_5=int(ge5[k, f]),
+                )
+            )
+
+        dep_present = ~M[dep_k, lo:hi]
+        dep_vals = V[dep_k, lo:hi][dep_present]
+        reports.append(
+            SnapshotReport(
+                n=n,
+                first_time=_as_datetime(np, tf[0]) if n else None,
+                last_time=_as_datetime(np, tf[-1]) if n else None,
+                interval_median_sec=float(np.median(dt)) if len(dt) else 0,
+                interval_min_sec=float(dt.min()) if len(dt) else 0,
+                interval_max_sec=float(dt.max()) if len(dt) else 0,
+                errors={col: int(errors[i][f]) for i, col in enumerate(ERROR_COLUMNS)},
+                stats=stats,
+                departure_min=int(dep_vals.min()) if len(dep_vals) else None,
+                departure_max=int(dep_vals.max()) if len(dep_vals) else None,
+            )
+        )
+    return reports
+
+
+def _as_datetime(np, t_us) -> datetime:
+    return np.datetime64(int(t_us), "us").astype(datetime)
+
+
+def analyze_files(paths: list[Path]) -> list[SnapshotReport]:
+    return analyze_columns(load_columns(paths))
@@ -0,0 +1,374 @@
+"""
+고정 길이 레코드의 append-only 바이너리 로그(.otlog).
+- 파일 = 16바이트 헤더 + 레코드 * N. 문자열(정류장/노선/에러)은 <path>.strings에 intern(JSON 1줄 = id 1개)
+- 시각은 epoch 초(벽시계 시각을 UTC처럼 저장 -> 수집 PC의 시간대와 무관하게 같은 문자열로 복원)
+- 분 값은 int16(결측 = -32768), HH:MM은 하루 중 분 uint16(결측 = 0xFFFF). 빈 값만 결측이고 형식이 틀리면 ValueError
+- 문자열 id는 모든 필드가 한 intern 표를 공유하므로 uint32
+- 읽기는 mmap + struct(또는 numpy 뷰)라 행 파싱이 없다
+"""
+
+import argparse
+import calendar
+import csv
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+BINLOG_SUFFIX = ".otlog"
+MAGIC = b"OTLG"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHII")  # magic, version, schema id, record size, reserved
+
+INT_NULL = -32768
+HHMM_NULL = 0xFFFF
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class _Field:
+    name: str   # CSV 컬럼명
+    kind: str   # "ts" | "int" | "str" | "hhmm"
+    code: str   # struct 코드
+
+
+@dataclass(frozen=True)
+class BinLogSchema:
+    schema_id: int
+    name: str
+    fields: tuple[_Field, ...]
+
+    @property
+    def csv_fields(self) -> list[str]:
+        return [f.name for f in self.fields]
+
+    @property
+    def record(self) -> struct.Struct:
+        return struct.Struct("<" + "".join(f.code for f in self.fields))
+
+    def numpy_dtype(self):
+        import numpy as np
+
+        codes = {"I": "<u4", "H": "<u2", "h": "<i2"}
+        return np.dtype([(f.name, codes[f.code]) for f in self.fields])
+
+
+def _ts(name):
+    return _Field(name, "ts", "I")
+
+
+def _int(name):
+    return _Field(name, "int", "h")
+
+
+def _str(name):
+    # id는 모든 문자열 필드가 공유하는 표의 번호라 필드마다 값이 적어도 uint32
+    return _Field(name, "str", "I")
+
+
+def _hhmm(name):
+    return _Field(name, "hhmm", "H")
+
+
+# collect_eta.CSV_FIELDS
+ETA_SAMPLES = BinLogSchema(
+    schema_id=1,
+    name="eta",
+    fields=(
+        _ts("collected_at"), _str("stop"), _str("route"), _int("eta_min"),
+        _str("provider"), _str("error"),
+    ),
+)
+
+# collect_route_snapshot.CSV_FIELDS
+ROUTE_SNAPSHOT = BinLogSchema(
+    schema_id=2,
+    name="route",
+    fields=(
+        _ts("collected_at"),
+        _str("bus51_stop"), _int("bus51_eta_min"),
+        _str("bus5100_stop"), _int("bus5100_eta_min"),
+        _str("subway_stop"), _str("subway_route"),
+        _int("subway_eta1_min"), _int("subway_eta2_min"), _int("subway_eta3_min"),
+        _hhmm("destination_time"), _hhmm("recommended_departure_time"),
+        _str("bus_error"), _str("subway_error"), _str("engine_error"),
+    ),
+)
+
+SCHEMAS = {s.schema_id: s for s in (ETA_SAMPLES, ROUTE_SNAPSHOT)}
+SCHEMAS_BY_NAME = {s.name: s for s in SCHEMAS.values()}
+
+
+def _strings_path(path: Path) -> Path:
+    return path.with_name(path.name + ".strings")
+
+
+def _read_strings(path: Path) -> list[str]:
+    sp = _strings_path(path)
+    if not sp.exists():
+        return [""]
+    with sp.open("r", encoding="utf-8") as f:
+        strings = [json.loads(line) for line in f if line.strip()]
+    return strings or [""]
+
+
+def is_binlog(path: Path | str) -> bool:
+    try:
+        with Path(path).open("rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _to_int_or_null(s, name: str) -> int:
+    """빈 값 -> INT_NULL. 정수가 아니거나 범위를 넘으면 ValueError(조용히 결측으로 바꾸지 않는다)"""
+    s = "" if s is None else str(s).strip()
+    if s == "":
+        return INT_NULL
+    try:
+        v = int(s)
+    except ValueError:
+        raise ValueError(f"{name}: not an integer: {s!r}") from None
+    if not (INT_NULL < v <= 32767):
+        raise ValueError(f"{name}: out of int16 range: {v}")
+    return v
+
+
+def _to_hhmm_or_null(s, name: str) -> int:
+    """빈 값 -> HHMM_NULL. HH:MM이 아니면 ValueError"""
+    s = "" if s is None else str(s).strip()
+    if s == "":
+        return HHMM_NULL
+    try:
+        t = datetime.strptime(s, "%H:%M")
+    except ValueError:
+        raise ValueError(f"{name}: not HH:MM: {s!r}") from None
+    return t.hour * 60 + t.minute
+
+
+class BinLogWriter:
+    """
+    append-only writer. 새 문자열은 레코드보다 먼저 .strings에 기록한다(읽는 쪽은 항상 id를 찾을 수 있다).
+    - 형식이 틀린 값이 있는 batch는 아무것도 쓰지 않고 ValueError
+    """
+
+    def __init__(self, path: Path | str, schema: BinLogSchema):
+        self.path = Path(path)
+        self.schema = schema
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open("rb") as f:
+                header = f.read(_HEADER.size)
+            magic, version, schema_id, rec_size, _ = _HEADER.unpack(header)
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or schema_id != schema.schema_id
+                or rec_size != schema.record.size
+            ):
+                raise ValueError(f"{self.path} is not a {schema.name!r} binlog")
+        else:
+            with self.path.open("wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, schema.schema_id, schema.record.size, 0))
+
+        self._record = schema.record
+
+        self._strings = _read_strings(self.path)
+        self._ids = {s: i for i, s in enumerate(self._strings)}
+        if not _strings_path(self.path).exists():
+            self._append_strings([""])
+
+    def _append_strings(self, new: list[str]) -> None:
+        with _strings_path(self.path).open("a", encoding="utf-8") as f:
+            for s in new:
+                f.write(json.dumps(s, ensure_ascii=False) + "\n")
+
+    def _intern(self, s, new: list[str]) -> int:
+        s = "" if s is None else str(s)
+        i = self._ids.get(s)
+        if i is None:
+            i = len(self._strings)
+            self._strings.append(s)
+            self._ids[s] = i
+            new.append(s)
+        return i
+
+    def _encode(self, row: dict, new: list[str]) -> bytes:
+        values = []
+        for f in self.schema.fields:
+            v = row.get(f.name)
+            if f.kind == "ts":
+                dt = v if isinstance(v, datetime) else datetime.fromisoformat(str(v))
+                values.append(calendar.timegm(dt.timetuple()))
+            elif f.kind == "int":
+                values.append(_to_int_or_null(v, f.name))
+            elif f.kind == "hhmm":
+                values.append(_to_hhmm_or_null(v, f.name))
+            else:
+                values.append(self._intern(v, new))
+        return self._record.pack(*values)
+
+    def append(self, rows: Iterable[dict]) -> int:
+        """CSV 스키마의 dict 행들을 추가한다. 반환: 추가한 레코드 수"""
+        new: list[str] = []
+        try:
+            payload = b"".join(self._encode(row, new) for row in rows)
+        except Exception:
+            # 쓰지 못한 batch의 새 문자열은 표에서 되돌린다(파일에 없는 id를 다음 batch가 쓰지 않게)
+            del self._strings[len(self._strings) - len(new):]
+            for s in new:
+                del self._ids[s]
+            raise
+        if new:
+            self._append_strings(new)
+        with self.path.open("ab") as f:
+            f.write(payload)
+        return len(payload) // self._record.size
+
+
+class BinLogReader:
+    """
+    mmap 기반 reader. 쓰기 도중의 잘린 마지막 레코드는 무시한다.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        size = self.path.stat().st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        header = self._mm[: _HEADER.size] if self._mm else b""
+        if len(header) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{self.path}: not a binlog")
+        magic, version, schema_id, rec_size, _ = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or schema_id not in SCHEMAS:
+            self.close()
+            raise ValueError(f"{self.path}: unsupported binlog")
+
+        self.schema = SCHEMAS[schema_id]
+        self._record = self.schema.record
+        if rec_size != self._record.size:
+            self.close()
+            raise ValueError(f"{self.path}: record size mismatch")
+        self._count = (size - _HEADER.size) // rec_size
+        self.strings = _read_strings(self.path)
+
+    def __enter__(self) -> "BinLogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if getattr(self, "_mm", None) is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # as_numpy() 뷰가 살아 있으면 GC 때 닫힌다
+            self._mm = None
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def records(self) -> Iterator[tuple]:
+        """원시 레코드 tuple(정수 값 그대로)"""
+        size = self._record.size
+        unpack_from = self._record.unpack_from
+        for offset in range(_HEADER.size, _HEADER.size + self._count * size, size):
+            yield unpack_from(self._mm, offset)
+
+    def as_numpy(self):
+        """레코드 전체를 numpy structured array 뷰로(복사 없음)."""
+        import numpy as np
+
+        if not self._count:
+            return np.zeros(0, dtype=self.schema.numpy_dtype())
+        return np.frombuffer(
+            self._mm, dtype=self.schema.numpy_dtype(), count=self._count, offset=_HEADER.size
+        )
+
+    def iter_dicts(self) -> Iterator[dict]:
+        """CSV와 같은 문자열 dict 행(분석/리플레이 코드를 그대로 쓰기 위함)"""
+        fields = self.schema.fields
+        strings = self.strings
+        for rec in self.records():
+            row = {}
+            for f, v in zip(fields, rec):
+                if f.kind == "ts":
+                    row[f.name] = (_EPOCH + timedelta(seconds=v)).isoformat(timespec="seconds")
+                elif f.kind == "int":
+                    row[f.name] = "" if v == INT_NULL else str(v)
+                elif f.kind == "hhmm":
+                    row[f.name] = "" if v == HHMM_NULL else f"{v // 60:02d}:{v % 60:02d}"
+                else:
+                    row[f.name] = strings[v]
+            yield row
+
+
+def csv_to_binlog(csv_path: Path, bin_path: Path, schema: BinLogSchema, chunk_rows: int = 10000) -> int:
+    writer = BinLogWriter(bin_path, schema)
+    total = 0
+    with Path(csv_path).open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        chunk: list[dict] = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                total += writer.append(chunk)
+                chunk = []
+        if chunk:
+            total += writer.append(chunk)
+    return total
+
+
+def binlog_to_csv(bin_path: Path, csv_path: Path) -> int:
+    csv_path = Path(csv_path)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with BinLogReader(bin_path) as reader, csv_path.open("w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=reader.schema.csv_fields)
+        w.writeheader()
+        n = 0
+        for row in reader.iter_dicts():
+            w.writerow(row)
+            n += 1
+    return n
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Convert ETA/route snapshot logs between CSV and binlog.")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    to_bin = sub.add_parser("to-bin", help="CSV -> binlog (기존 binlog면 뒤에 추가)")
+    to_bin.add_argument("input")
+    to_bin.add_argument("output")
+    to_bin.add_argument("--schema", choices=sorted(SCHEMAS_BY_NAME), default="route")
+
+    to_csv = sub.add_parser("to-csv", help="binlog -> CSV")
+    to_csv.add_argument("input")
+    to_csv.add_argument("output")
+
+    args = p.parse_args()
+    src, dst = Path(args.input), Path(args.output)
+    if not src.exists():
+        raise SystemExit(f"File not found: {src}")
+
+    if args.cmd == "to-bin":
+        n = csv_to_binlog(src, dst, SCHEMAS_BY_NAME[args.schema])
+    else:
+        n = binlog_to_csv(src, dst)
+
+    size_in = src.stat().st_size + (_strings_path(src).stat().st_size if _strings_path(src).exists() else 0)
+    size_out = dst.stat().st_size + (_strings_path(dst).stat().st_size if _strings_path(dst).exists() else 0)
+    print(f"{n} rows: {src} ({size_in} B) -> {dst} ({size_out} B)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
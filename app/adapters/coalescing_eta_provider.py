@@ -0,0 +1,33 @@
+from app.adapters.eta_provider import EtaProvider
+from app.adapters.single_flight import SingleFlightCache
+
+
+class CoalescingEtaProvider:
+    """
+    아무 EtaProvider 앞에 두는 single-flight + TTL 캐시 계층.
+    - 같은 인자로 동시에 들어온 호출은 upstream 호출 1번을 공유
+    - TTL이 지난 뒤 stale_sec 동안은 이전 값을 바로 주고 백그라운드에서 갱신(만료 순간 몰림 방지)
+    - inner에 get_next_arrivals/get_station_arrivals가 있으면 같은 방식으로 감싼다
+    """
+
+    def __init__(self, inner: EtaProvider, ttl_sec: float = 15.0, stale_sec: float = 15.0, max_entries: int = 4096):
+        self.inner = inner
+        self.name = inner.name
+        self.cache: SingleFlightCache = SingleFlightCache(ttl_sec, stale_sec=stale_sec, max_entries=max_entries)
+
+    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        return self.cache.get(
+            ("eta", stop.strip(), route.strip()),
+            lambda: self.inner.get_eta_minutes(stop, route),
+        )
+
+    def get_next_arrivals(self, stop: str, *args, **kwargs) -> list[int]:
+        fn = self.inner.get_next_arrivals
+        return self.cache.get(
+            ("next", stop.strip(), args, tuple(sorted(kwargs.items()))),
+            lambda: fn(stop, *args, **kwargs),
+        )
+
+    def get_station_arrivals(self, stop: str) -> dict[str, list[int]]:
+        fn = self.inner.get_station_arrivals
+        return self.cache.get(("station", stop.strip()), lambda: fn(stop))
@@ -0,0 +1,272 @@
+"""
+수집기를 몇 달씩 켜 두기 위한 daemon 모드(collect_eta / collect_route_snapshot --daemon).
+- RotatingRowWriter: 기간(day/hour)·크기별 세그먼트 파일, 닫힌 CSV 세그먼트 gzip, 오래된 세그먼트 삭제
+- QueuedRowWriter: bounded queue + 기록 스레드(디스크가 느려도 수집 라운드는 멈추지 않음)
+- run_collector: SIGINT/SIGTERM을 받으면 현재 라운드까지 마치고 남은 행을 모두 기록한 뒤 종료
+"""
+
+import argparse
+import gzip
+import itertools
+import queue
+import re
+import shutil
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+from app.adapters.binlog import BINLOG_SUFFIX, BinLogSchema
+from app.adapters.collect_scheduler import BufferedRowWriter, RoundClock
+
+PERIOD_FORMATS = {"day": "%Y%m%d", "hour": "%Y%m%d-%H", "none": ""}
+
+
+class RotatingRowWriter:
+    """
+    <directory>/<stem>-<기간><suffix> 세그먼트에 기록한다.
+    - 기간은 행의 collected_at 기준(tick 시각 -> 재시작해도 같은 세그먼트에 이어 씀)
+    - max_bytes를 넘으면 같은 기간 안에서 <stem>-<기간>.<n><suffix>로 넘어간다(크기는 flush 때마다 확인)
+    - compress=True면 로테이션으로 닫힌 CSV 세그먼트를 .gz로 바꾼다(binlog는 mmap으로 읽으므로 그대로)
+    - keep_days가 있으면 새 세그먼트를 열 때 그보다 오래된 세그먼트를 지운다
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        stem: str,
+        suffix: str,
+        fields: list[str],
+        schema: BinLogSchema,
+        rotate: str = "day",
+        max_bytes: int | None = None,
+        compress: bool = False,
+        keep_days: float | None = None,
+        flush_rows: int = 1000,
+        flush_interval_sec: float = 10.0,
+    ):
+        if rotate not in PERIOD_FORMATS:
+            raise ValueError(f"Unknown rotate: {rotate!r}")
+        self.directory = Path(directory)
+        self.stem = stem
+        self.suffix = suffix
+        self.fields = fields
+        self.schema = schema
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        self.compress = compress and suffix != BINLOG_SUFFIX
+        self.keep_days = keep_days
+        self.flush_rows = flush_rows
+        self.flush_interval_sec = flush_interval_sec
+        self.closed_segments: list[Path] = []
+        self._period: str | None = None
+        self._writer: BufferedRowWriter | None = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "RotatingRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path | None:
+        return self._writer.path if self._writer else None
+
+    def _period_of(self, row: dict) -> str:
+        fmt = PERIOD_FORMATS[self.rotate]
+        if not fmt:
+            return ""
+        return datetime.fromisoformat(str(row["collected_at"])).strftime(fmt)
+
+    def _segment_path(self, period: str) -> Path:
+        base = f"{self.stem}-{period}" if period else self.stem
+        for n in itertools.count():
+            path = self.directory / f"{base}{f'.{n}' if n else ''}{self.suffix}"
+            if path.with_name(path.name + ".gz").exists():
+                continue
+            if self.max_bytes and path.exists() and path.stat().st_size >= self.max_bytes:
+                continue
+            return path
+        raise AssertionError("unreachable")
+
+    def _open(self, period: str) -> None:
+        self._close_segment(rotated=True)
+        self._period = period
+        self._writer = BufferedRowWriter(
+            self._segment_path(period),
+            self.fields,
+            self.schema,
+            flush_rows=self.flush_rows,
+            flush_interval_sec=self.flush_interval_sec,
+        )
+        self._remove_expired()
+
+    def _close_segment(self, rotated: bool) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        path = self._writer.path
+        self._writer = None
+        if rotated and self.compress and path.exists():
+            gz = path.with_name(path.name + ".gz")
+            with path.open("rb") as src, gzip.open(gz, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            path.unlink()
+            path = gz
+        self.closed_segments.append(path)
+
+    def _remove_expired(self) -> None:
+        if self.keep_days is None:
+            return
+        cutoff = time.time() - self.keep_days * 86400
+        pattern = re.compile(rf"^{re.escape(self.stem)}-\d{{8}}")
+        current = self._writer.path
+        for p in self.directory.iterdir():
+            if not pattern.match(p.name) or p == current or p.name.startswith(f"{current.name}."):
+                continue
+            if p.is_file() and p.stat().st_mtime < cutoff:
+                p.unlink()
+
+    def write(self, rows: Iterable[dict]) -> None:
+        for period, group in itertools.groupby(rows, key=self._period_of):
+            if self._writer is None or period != self._period:
+                self._open(period)
+            self._writer.write(group)
+            if self.max_bytes and self._writer.path.stat().st_size >= self.max_bytes:
+                self._open(period)
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        # 종료 시 열린 세그먼트는 압축하지 않는다(재시작하면 이어 쓴다)
+        self._close_segment(rotated=False)
+
+
+_STOP = object()
+
+
+class QueuedRowWriter:
+    """
+    행 묶음(라운드 1번)을 bounded queue에 넣고 기록 스레드가 sink에 쓴다.
+    - 큐가 가득 차면 기다리지 않고 그 묶음을 버린다(dropped_rows) -> 느린 디스크가 수집을 멈추지 않음
+    - sink 쓰기 오류는 stderr에 남기고 계속한다(write_errors)
+    - close(): 큐에 남은 행을 모두 기록하고 sink를 닫는다
+    """
+
+    def __init__(self, sink, max_pending: int = 1000):
+        self.sink = sink
+        self.dropped_rows = 0
+        self.write_errors = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="collect-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "QueuedRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, rows: Iterable[dict]) -> None:
+        batch = list(rows)
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.dropped_rows += len(batch)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is _STOP:
+                return
+            try:
+                self.sink.write(batch)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"collect-writer: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.sink.close()
+
+
+def add_daemon_args(p: argparse.ArgumentParser) -> None:
+    g = p.add_argument_group("daemon")
+    g.add_argument("--daemon", action="store_true", help="--count 없이 종료 신호까지 수집, 파일 로테이션")
+    g.add_argument("--rotate", choices=sorted(PERIOD_FORMATS), default="day")
+    g.add_argument("--max-mb", type=float, default=None, help="세그먼트 최대 크기(MB)")
+    g.add_argument("--compress", action="store_true", help="닫힌 CSV 세그먼트를 gzip")
+    g.add_argument("--keep-days", type=float, default=None, help="이보다 오래된 세그먼트 삭제")
+    g.add_argument("--queue-rounds", type=int, default=1000, help="기록 대기열 최대 라운드 수")
+
+
+def open_row_writer(
+    args: argparse.Namespace,
+    out: Path,
+    fields: list[str],
+    schema: BinLogSchema,
+    flush_rows: int,
+    flush_interval_sec: float,
+) -> BufferedRowWriter | QueuedRowWriter:
+    """--daemon이면 <out 디렉터리>/<out 이름>-<기간><확장자> 세그먼트, 아니면 out 파일 1개"""
+    if not args.daemon:
+        return BufferedRowWriter(out, fields, schema, flush_rows=flush_rows, flush_interval_sec=flush_interval_sec)
+
+    sink = RotatingRowWriter(
+        out.parent,
+        out.stem,
+        out.suffix,
+        fields,
+        schema,
+        rotate=args.rotate,
+        max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb else None,
+        compress=args.compress,
+        keep_days=args.keep_days,
+        flush_rows=flush_rows,
+        flush_interval_sec=flush_interval_sec,
+    )
+    return QueuedRowWriter(sink, max_pending=args.queue_rounds)
+
+
+def install_stop_handlers(stop: threading.Event) -> None:
+    def handler(signum, frame):
+        stop.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, handler)
+
+
+def run_collector(
+    collect: Callable[[datetime], list[dict]],
+    writer,
+    interval_sec: float,
+    count: int | None,
+    stop: threading.Event,
+) -> int:
+    """
+    tick마다 collect(tick 시각)의 행을 writer에 넘긴다. count가 None이면 stop까지.
+    - tick 대기 중에도 stop이 걸리면 바로 깨어난다
+    - 반환: 수집한 라운드 수
+    """
+    clock = RoundClock(interval_sec, sleep=stop.wait)
+    rounds = 0
+    while count is None or rounds < count:
+        tick = clock.wait()
+        if stop.is_set():
+            break
+        writer.write(collect(datetime.fromtimestamp(tick)))
+        rounds += 1
+    if clock.skipped:
+        print(f"Skipped {clock.skipped} ticks (round took longer than --interval-sec)")
+    return rounds
@@ -1,9 +1,13 @@
 import argparse
 import csv
-import time
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from app.adapters.binlog import BINLOG_SUFFIX, ETA_SAMPLES, BinLogWriter
+from app.adapters.coalescing_eta_provider import CoalescingEtaProvider
+from app.adapters.collect_daemon import add_daemon_args, install_stop_handlers, open_row_writer, run_collector
+from app.adapters.collect_scheduler import ConcurrentFetcher
 from app.adapters.eta_provider import EtaQuery, EtaSample, EtaProvider
 from app.adapters.dummy_eta_provider import DummyEtaProvider
 
@@ -11,8 +15,8 @@ from app.adapters.dummy_eta_provider import DummyEtaProvider
 CSV_FIELDS = ["collected_at", "stop", "route", "eta_min", "provider", "error"]
 
 
-def collect_once(provider: EtaProvider, query: EtaQuery) -> EtaSample:
-    now = datetime.now()
+def collect_once(provider: EtaProvider, query: EtaQuery, now: datetime | None = None) -> EtaSample:
+    now = now or datetime.now()
     try:
         eta = provider.get_eta_minutes(query.stop, query.route)
         if eta is not None and eta < 0:
@@ -36,6 +40,44 @@ def collect_once(provider: EtaProvider, query: EtaQuery) -> EtaSample:
         )
 
 
+def collect_round(
+    fetcher: ConcurrentFetcher,
+    provider: EtaProvider,
+    queries: list[EtaQuery],
+    now: datetime,
+) -> list[EtaSample]:
+    """
+    모든 대상을 동시에 조회한다(collected_at = 라운드 tick 시각).
+    - 제한 시간 안에 응답이 없으면 그 대상만 error로 기록
+    """
+    results = fetcher.run({q: (lambda q=q: collect_once(provider, q, now)) for q in queries})
+    batch: list[EtaSample] = []
+    for q in queries:
+        sample, err = results[q]
+        if sample is None:
+            sample = EtaSample(
+                collected_at=now,
+                stop=q.stop,
+                route=q.route,
+                eta_min=None,
+                provider=provider.name,
+                error=err,
+            )
+        batch.append(sample)
+    return batch
+
+
+def sample_to_row(s: EtaSample) -> dict:
+    return {
+        "collected_at": s.collected_at.isoformat(timespec="seconds"),
+        "stop": s.stop,
+        "route": s.route,
+        "eta_min": "" if s.eta_min is None else s.eta_min,
+        "provider": s.provider,
+        "error": "" if s.error is None else s.error,
+    }
+
+
 def write_samples_csv(path: Path, samples: list[EtaSample], append: bool = True) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -48,20 +90,14 @@ def write_samples_csv(path: Path, samples: list[EtaSample], append: bool = True)
         if not (append and file_exists):
             writer.writeheader()
 
-        for s in samples:
-            writer.writerow(
-                {
-                    "collected_at": s.collected_at.isoformat(timespec="seconds"),
-                    "stop": s.stop,
-                    "route": s.route,
-                    "eta_min": "" if s.eta_min is None else s.eta_min,
-                    "provider": s.provider,
-                    "error": "" if s.error is None else s.error,
-                }
-            )
+        writer.writerows(sample_to_row(s) for s in samples)
         f.flush()
 
 
+def write_samples_binlog(path: Path, samples: list[EtaSample]) -> None:
+    BinLogWriter(path, ETA_SAMPLES).append(sample_to_row(s) for s in samples)
+
+
 def parse_targets(targets: list[str]) -> list[EtaQuery]:
     """
     --target "이마트앞,51" 형태를 파싱한다.
@@ -75,18 +111,33 @@ def parse_targets(targets: list[str]) -> list[EtaQuery]:
     return queries
 
 
+def read_targets_file(path: Path) -> list[str]:
+    """한 줄에 "STOP,ROUTE" 1개. 빈 줄/#주석은 무시"""
+    with Path(path).open("r", encoding="utf-8-sig") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Collect ETA samples and write CSV.")
-    parser.add_argument("--output", default="logs/eta_samples.csv", help="CSV output path")
+    parser.add_argument("--output", default="logs/eta_samples.csv", help="CSV output path (.otlog = binlog)")
     parser.add_argument("--count", type=int, default=10, help="How many rounds to collect")
-    parser.add_argument("--interval-sec", type=float, default=60.0, help="Sleep between rounds")
+    parser.add_argument("--interval-sec", type=float, default=60.0, help="Round period (rounds start on clock ticks)")
     parser.add_argument(
         "--target",
         action="append",
         help="Repeatable. Format: \"STOP,ROUTE\"  (e.g., \"이마트앞,51\")",
     )
+    parser.add_argument("--targets-file", help="One \"STOP,ROUTE\" per line")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests per round")
+    parser.add_argument("--timeout-sec", type=float, default=5.0, help="Per-target timeout")
+    parser.add_argument("--flush-rows", type=int, default=1000, help="Buffered rows before writing")
+    parser.add_argument("--flush-sec", type=float, default=30.0, help="Max seconds between writes")
+    parser.add_argument(
+        "--cache-sec", type=float, default=0.0, help="Share identical lookups for this many seconds (0 = off)"
+    )
     parser.add_argument("--seed", type=int, default=0, help="Dummy provider random seed")
     parser.add_argument("--missing-rate", type=float, default=0.0, help="Dummy missing rate 0~1")
+    add_daemon_args(parser)
 
     args = parser.parse_args()
 
@@ -95,9 +146,13 @@ def main() -> int:
     if args.interval_sec < 0:
         raise ValueError("--interval-sec must be >= 0")
 
+    targets = list(args.target or [])
+    if args.targets_file:
+        targets += read_targets_file(Path(args.targets_file))
+
     # 기본 타겟(고정 경로 기반)
-    if args.target:
-        queries = parse_targets(args.target)
+    if targets:
+        queries = parse_targets(targets)
     else:
         queries = [
             EtaQuery(stop="이마트앞", route="51"),
@@ -106,19 +161,27 @@ def main() -> int:
         ]
 
     provider: EtaProvider = DummyEtaProvider(seed=args.seed, missing_rate=args.missing_rate)
+    if args.cache_sec > 0:
+        # 같은 (정류장, 노선)이 여러 번 있거나 라운드가 TTL보다 짧을 때 upstream 호출 공유
+        provider = CoalescingEtaProvider(provider, ttl_sec=args.cache_sec, stale_sec=args.cache_sec)
     out_path = Path(args.output)
 
-    for i in range(args.count):
-        batch: list[EtaSample] = []
-        for q in queries:
-            batch.append(collect_once(provider, q))
-
-        write_samples_csv(out_path, batch, append=True)
-
-        if i < args.count - 1 and args.interval_sec > 0:
-            time.sleep(args.interval_sec)
+    stop = threading.Event()
+    install_stop_handlers(stop)
+    with (
+        ConcurrentFetcher(max_workers=args.workers, timeout_sec=args.timeout_sec) as fetcher,
+        open_row_writer(args, out_path, CSV_FIELDS, ETA_SAMPLES, args.flush_rows, args.flush_sec) as writer,
+    ):
+        run_collector(
+            lambda now: [sample_to_row(s) for s in collect_round(fetcher, provider, queries, now)],
+            writer,
+            args.interval_sec,
+            None if args.daemon else args.count,
+            stop,
+        )
 
-    print(f"Saved CSV: {out_path}")
+    saved = out_path.parent / f"{out_path.stem}-*{out_path.suffix}" if args.daemon else out_path
+    print(f"Saved {'binlog' if out_path.suffix == BINLOG_SUFFIX else 'CSV'}: {saved}")
     return 0
 
 
@@ -1,13 +1,16 @@
 import argparse
-import csv
-import time
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from app.adapters.binlog import BINLOG_SUFFIX, ROUTE_SNAPSHOT
+from app.adapters.collect_daemon import add_daemon_args, install_stop_handlers, open_row_writer, run_collector
+from app.adapters.collect_scheduler import ConcurrentFetcher
 from app.adapters.gbis_bus_eta_provider import GbisBusEtaProvider
 from app.adapters.suin_bundang_position_eta_provider import SuinBundangPositionEtaProvider
-from app.adapters.wait_provider_snapshot import build_wait_provider_snapshot
+from app.adapters.wait_provider_snapshot import WaitSnapshot, norm_stop
 from app.services.decision_engine import FIXED_ROUTE_SEGMENTS, compute_departure_time
+from app.adapters.live_bindings import DEFAULT_LIVE_BINDINGS, BindingPlan, plan_bindings
 
 CSV_FIELDS = [
     "collected_at",
@@ -19,105 +22,129 @@ CSV_FIELDS = [
     "bus_error", "subway_error", "engine_error",
 ]
 
+BUS51_STOP = "206000043"     # 성남 이마트앞
+BUS5100_STOP = "203000075"   # 청명역 4번출구
+SUBWAY_STOP = "미금"
+SUBWAY_ROUTE = "수인분당선"
+MAX_WAIT_BY_ROUTE = {"51": 15, "5100": 25, "수인분당선": 10}
+
 
 def _as_str(x) -> str:
     return "" if x is None else str(x)
 
 
+def collect_round(
+    fetcher: ConcurrentFetcher,
+    bus: GbisBusEtaProvider,
+    subway: SuinBundangPositionEtaProvider,
+    now: datetime,
+    destination_time: str,
+    engine_plan: BindingPlan | None = None,
+) -> dict:
+    """
+    정류소 2곳 + 지하철을 동시에 1번씩 조회하고, 그 결과 스냅샷으로 엔진을 1회 계산한다(CSV 1행).
+    - 스냅샷 키는 실제 정류장 ID/노선명 그대로(recommended_departure_time 의미는 기존 로그와 같다)
+    - engine_plan을 주면 엔진 키로도 조회한다(replay_route_snapshot과 같은 입력, --engine-keys)
+    """
+    got = fetcher.run(
+        {
+            "bus51": lambda: bus.get_station_arrivals(BUS51_STOP),
+            "bus5100": lambda: bus.get_station_arrivals(BUS5100_STOP),
+            "subway": lambda: subway.get_next_arrivals(SUBWAY_STOP, max_results=3),
+        }
+    )
+
+    arrivals: dict[tuple[str, str], list[int]] = {}
+    first_eta: dict[str, int | None] = {}
+    bus_errors: list[str] = []
+    for key, stop, route in (("bus51", BUS51_STOP, "51"), ("bus5100", BUS5100_STOP, "5100")):
+        by_route, err = got[key]
+        if err:
+            bus_errors.append(err)
+        times = [int(x) for x in (by_route or {}).get(route, [])]
+        if times:
+            arrivals[(norm_stop(stop), route)] = times
+        first_eta[key] = times[0] if times else None
+
+    sub_etas, subway_err = got["subway"]
+    sub_etas = [int(x) for x in sub_etas or []]
+    if sub_etas:
+        arrivals[(norm_stop(SUBWAY_STOP), SUBWAY_ROUTE)] = sub_etas
+
+    dep = None
+    engine_err = ""
+    try:
+        if engine_plan is None:
+            wait_provider = WaitSnapshot(now=now, arrivals_after_now=arrivals, max_wait_by_route=MAX_WAIT_BY_ROUTE)
+        else:
+            wait_provider = WaitSnapshot(
+                now=now, arrivals_after_now=arrivals, max_wait_by_route=engine_plan.max_wait_by_route
+            ).with_aliases(engine_plan.aliases)
+        dep = compute_departure_time(
+            destination_time=destination_time,
+            segments=FIXED_ROUTE_SEGMENTS,
+            wait_provider=wait_provider,
+        )
+    except Exception as e:
+        engine_err = f"{type(e).__name__}: {e}"
+
+    return {
+        "collected_at": now.isoformat(timespec="seconds"),
+        "bus51_stop": BUS51_STOP,
+        "bus51_eta_min": _as_str(first_eta["bus51"]),
+        "bus5100_stop": BUS5100_STOP,
+        "bus5100_eta_min": _as_str(first_eta["bus5100"]),
+        "subway_stop": SUBWAY_STOP,
+        "subway_route": SUBWAY_ROUTE,
+        "subway_eta1_min": _as_str(sub_etas[0] if len(sub_etas) > 0 else None),
+        "subway_eta2_min": _as_str(sub_etas[1] if len(sub_etas) > 1 else None),
+        "subway_eta3_min": _as_str(sub_etas[2] if len(sub_etas) > 2 else None),
+        "destination_time": destination_time,
+        "recommended_departure_time": _as_str(dep),
+        "bus_error": "; ".join(bus_errors),
+        "subway_error": subway_err,
+        "engine_error": engine_err,
+    }
+
+
 def main() -> int:
     p = argparse.ArgumentParser(description="Collect route snapshot into one CSV.")
-    p.add_argument("--output", default="logs/day6_route_snapshot.csv")
+    p.add_argument("--output", default="logs/day6_route_snapshot.csv", help=".otlog면 binlog로 기록")
     p.add_argument("--count", type=int, default=60)
-    p.add_argument("--interval-sec", type=float, default=60.0)
+    p.add_argument("--interval-sec", type=float, default=60.0, help="라운드 주기(시계 tick에 맞춰 시작)")
+    p.add_argument("--timeout-sec", type=float, default=10.0, help="대상별 응답 제한 시간")
+    p.add_argument("--flush-sec", type=float, default=300.0, help="기록 최대 지연(초)")
     p.add_argument("--destination-time", default="10:00")
+    p.add_argument(
+        "--engine-keys",
+        action="store_true",
+        help="엔진 키(DEFAULT_LIVE_BINDINGS)로 계산. recommended_departure_time 의미가 기존 로그와 달라진다",
+    )
+    add_daemon_args(p)
     args = p.parse_args()
 
     out = Path(args.output)
-    out.parent.mkdir(parents=True, exist_ok=True)
-
-    bus51_stop = "206000043"     # 성남 이마트앞
-    bus5100_stop = "203000075"   # 청명역 4번출구
-    subway_stop = "미금"
-    subway_route = "수인분당선"
 
     bus = GbisBusEtaProvider()
     subway = SuinBundangPositionEtaProvider(toward_station="청명")
-
-    file_exists = out.exists()
-    with out.open("a", newline="", encoding="utf-8-sig") as f:
-        w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        if not file_exists:
-            w.writeheader()
-
-        for i in range(args.count):
-            now = datetime.now()
-
-            bus_err = ""
-            subway_err = ""
-            engine_err = ""
-
-            bus51_eta = None
-            bus5100_eta = None
-            sub_etas = []
-
-            # 1) 버스 ETA
-            try:
-                bus51_eta = bus.get_eta_minutes(bus51_stop, "51")
-                bus5100_eta = bus.get_eta_minutes(bus5100_stop, "5100")
-            except Exception as e:
-                bus_err = f"{type(e).__name__}: {e}"
-
-            # 2) 지하철(next 3)
-            try:
-                sub_etas = subway.get_next_arrivals(subway_stop, max_results=3)
-            except Exception as e:
-                subway_err = f"{type(e).__name__}: {e}"
-                sub_etas = []
-
-            # 3) 엔진 출력(스냅샷 wait_provider로 1회 계산)
-            dep = None
-            try:
-                wait_provider = build_wait_provider_snapshot(
-                    now=now,
-                    bus_provider=bus,
-                    subway_provider=subway,
-                    bus_stops=[(bus51_stop, "51"), (bus5100_stop, "5100")],
-                    subway_stops=[(subway_stop, subway_route)],
-                    max_wait_by_route={"51": 15, "5100": 25, "수인분당선": 10},
-                )
-                dep = compute_departure_time(
-                    destination_time=args.destination_time,
-                    segments=FIXED_ROUTE_SEGMENTS,
-                    wait_provider=wait_provider,
-                )
-            except Exception as e:
-                engine_err = f"{type(e).__name__}: {e}"
-
-            row = {
-                "collected_at": now.isoformat(timespec="seconds"),
-                "bus51_stop": bus51_stop,
-                "bus51_eta_min": _as_str(bus51_eta),
-                "bus5100_stop": bus5100_stop,
-                "bus5100_eta_min": _as_str(bus5100_eta),
-                "subway_stop": subway_stop,
-                "subway_route": subway_route,
-                "subway_eta1_min": _as_str(sub_etas[0] if len(sub_etas) > 0 else None),
-                "subway_eta2_min": _as_str(sub_etas[1] if len(sub_etas) > 1 else None),
-                "subway_eta3_min": _as_str(sub_etas[2] if len(sub_etas) > 2 else None),
-                "destination_time": args.destination_time,
-                "recommended_departure_time": _as_str(dep),
-                "bus_error": bus_err,
-                "subway_error": subway_err,
-                "engine_error": engine_err,
-            }
-
-            w.writerow(row)
-            f.flush()
-
-            if i < args.count - 1 and args.interval_sec > 0:
-                time.sleep(args.interval_sec)
-
-    print(f"Saved CSV: {out}")
+    engine_plan = plan_bindings(DEFAULT_LIVE_BINDINGS) if args.engine_keys else None
+
+    stop = threading.Event()
+    install_stop_handlers(stop)
+    with (
+        ConcurrentFetcher(max_workers=3, timeout_sec=args.timeout_sec) as fetcher,
+        open_row_writer(args, out, CSV_FIELDS, ROUTE_SNAPSHOT, 60, args.flush_sec) as writer,
+    ):
+        run_collector(
+            lambda now: [collect_round(fetcher, bus, subway, now, args.destination_time, engine_plan)],
+            writer,
+            args.interval_sec,
+            None if args.daemon else args.count,
+            stop,
+        )
+
+    saved = out.parent / f"{out.stem}-*{out.suffix}" if args.daemon else out
+    print(f"Saved {'binlog' if out.suffix == BINLOG_SUFFIX else 'CSV'}: {saved}")
     return 0
 
 
@@ -0,0 +1,174 @@
+"""
+수집기(collect_eta / collect_route_snapshot) 공용 스케줄링/기록 도구.
+- RoundClock: 라운드를 절대 시각 tick에 시작(라운드 소요 시간이 간격에 더해지지 않음)
+- ConcurrentFetcher: 대상별 호출을 thread pool에서 동시에 실행, 대상별 timeout
+- BufferedRowWriter: 행을 모아 한 번에 기록(행마다 open/flush 하지 않음)
+"""
+
+import csv
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+from app.adapters.binlog import BINLOG_SUFFIX, BinLogSchema, BinLogWriter
+
+
+class RoundClock:
+    """
+    tick = k * interval_sec(epoch 기준 정렬)에 라운드를 시작한다.
+    - 라운드가 간격보다 오래 걸리면 놓친 tick은 건너뛴다(밀린 라운드를 몰아서 돌지 않음)
+    - interval_sec <= 0이면 기다리지 않는다
+    """
+
+    def __init__(
+        self,
+        interval_sec: float,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.interval_sec = interval_sec
+        self.skipped = 0
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._next = (math.floor(now / interval_sec) + 1) * interval_sec if interval_sec > 0 else now
+
+    def wait(self) -> float:
+        """다음 tick까지 잔다. 반환: 이번 라운드의 tick 시각(epoch 초)"""
+        now = self._clock()
+        if self.interval_sec <= 0:
+            return now
+
+        if now > self._next:
+            missed = int((now - self._next) // self.interval_sec)
+            self._next += missed * self.interval_sec
+            self.skipped += missed
+        if self._next > now:
+            self._sleep(self._next - now)
+
+        tick = self._next
+        self._next += self.interval_sec
+        return tick
+
+
+class ConcurrentFetcher:
+    """
+    키별 호출을 동시에 실행하고 timeout_sec 안에 끝난 결과만 받는다.
+    - 결과: {key: (값 | None, 에러 문자열)} — 에러가 없으면 ""
+    - 스레드는 중간에 멈출 수 없으므로, 시간 초과한 호출이 끝나기 전에는 같은 키를 다시 보내지 않는다
+      (느린 대상 하나가 라운드마다 worker를 하나씩 더 잡아먹지 않게)
+    """
+
+    def __init__(self, max_workers: int = 16, timeout_sec: float = 5.0):
+        self.timeout_sec = timeout_sec
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect")
+        self._inflight: dict[Hashable, Future] = {}
+
+    def __enter__(self) -> "ConcurrentFetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, calls: dict[Hashable, Callable[[], object]]) -> dict[Hashable, tuple[object | None, str]]:
+        deadline = time.monotonic() + self.timeout_sec
+        out: dict[Hashable, tuple[object | None, str]] = {}
+        futures: dict[Hashable, Future] = {}
+
+        for key, call in calls.items():
+            prev = self._inflight.get(key)
+            if prev is not None and not prev.done():
+                out[key] = (None, "TimeoutError: previous request still running")
+                continue
+            futures[key] = self._inflight[key] = self._executor.submit(call)
+
+        wait(list(futures.values()), timeout=max(0.0, deadline - time.monotonic()))
+
+        for key, fut in futures.items():
+            if not fut.done():
+                fut.cancel()  # 아직 대기열에 있으면 취소
+                out[key] = (None, f"TimeoutError: no response within {self.timeout_sec:g}s")
+                continue
+            del self._inflight[key]
+            try:
+                out[key] = (fut.result(), "")
+            except Exception as e:
+                out[key] = (None, f"{type(e).__name__}: {e}")
+
+        return {key: out[key] for key in calls}
+
+
+class BufferedRowWriter:
+    """
+    dict 행을 모았다가 flush_rows개가 쌓이거나 flush_interval_sec가 지나면 한 번에 기록한다.
+    - 경로가 .otlog면 binlog(schema), 아니면 CSV(UTF-8-BOM, 빈 파일일 때만 헤더)
+    - CSV 파일은 닫을 때까지 열어 둔다
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fields: list[str],
+        schema: BinLogSchema,
+        flush_rows: int = 1000,
+        flush_interval_sec: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = Path(path)
+        self.flush_rows = flush_rows
+        self.flush_interval_sec = flush_interval_sec
+        self.rows_written = 0
+        self._clock = clock
+        self._pending: list[dict] = []
+        self._closed = False
+        self._last_flush = clock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._bin: BinLogWriter | None = None
+        self._file = None
+        self._csv: csv.DictWriter | None = None
+        if self.path.suffix == BINLOG_SUFFIX:
+            self._bin = BinLogWriter(self.path, schema)
+        else:
+            empty = not self.path.exists() or self.path.stat().st_size == 0
+            self._file = self.path.open("a", newline="", encoding="utf-8-sig")
+            self._csv = csv.DictWriter(self._file, fieldnames=fields)
+            if empty:
+                self._csv.writeheader()
+                self._file.flush()
+
+    def __enter__(self) -> "BufferedRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, rows: Iterable[dict]) -> None:
+        self._pending.extend(rows)
+        if len(self._pending) >= self.flush_rows or self._clock() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self) -> None:
+        rows, self._pending = self._pending, []
+        self._last_flush = self._clock()
+        if self._bin is not None:
+            if rows:
+                self._bin.append(rows)
+        else:
+            self._csv.writerows(rows)
+            self._file.flush()
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,208 @@
+"""
+여러 ETA source를 순서대로 시도하는 fallback chain(요청당 시간 예산 + source별 circuit breaker).
+- 기본 순서(지하철): 위치 기반 추정 -> 역 도착정보 API -> 배차간격(headway) 모델
+- 느린 source는 남은 예산만큼만 기다리고, 연속 실패한 source는 잠시 건너뛴다
+- 어느 source가 답했는지 EtaLookup.source / last_sources로 남긴다
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+
+
+class CircuitBreaker:
+    """
+    연속 failure_threshold번 실패하면 open -> reset_after_sec 동안 호출을 막는다.
+    그 뒤 시험 호출 1번만 허용(half-open): 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_after_sec: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_after_sec = reset_after_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at < self.reset_after_sec:
+                return "open"
+            return "half_open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_after_sec or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+@dataclass(frozen=True)
+class EtaSource:
+    """
+    chain의 한 단계. fetch(stop, route, max_results) -> [분, ...] (async chain이면 coroutine 함수)
+    - local=True면 네트워크를 쓰지 않는 source(예산/차단기 없이 바로 호출)
+    """
+    name: str
+    fetch: Callable
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    local: bool = False
+
+
+@dataclass(frozen=True)
+class EtaLookup:
+    etas: list[int]
+    source: str | None          # 답한 source 이름(모두 실패하면 None)
+    errors: tuple[str, ...]     # 건너뛴 source별 사유
+
+
+def position_source(provider, breaker: CircuitBreaker | None = None) -> EtaSource:
+    """SubwayPositionEtaProvider(또는 Async 버전)"""
+    return EtaSource(
+        provider.name,
+        lambda stop, route, n: provider.get_next_arrivals(stop, max_results=n),
+        breaker or CircuitBreaker(),
+    )
+
+
+def arrival_api_source(provider, breaker: CircuitBreaker | None = None) -> EtaSource:
+    """SeoulSubwayEtaProvider(또는 Async 버전): 역 도착정보 API, 다음 1대만"""
+    return EtaSource(
+        provider.name,
+        lambda stop, route, n: provider.get_next_arrivals(stop, route, max_results=1),
+        breaker or CircuitBreaker(),
+    )
+
+
+def headway_source(model: HeadwayWaitProvider, clock: Callable[[], datetime] = datetime.now) -> EtaSource:
+    """
+    배차간격 모델로 만든 다음 도착들(실시간 아님, 항상 답함)
+    - clock: 기준 시각. 스냅샷 builder는 벽시계 대신 스냅샷의 now를 넘긴다
+    """
+
+    def fetch(stop: str, route: str, n: int) -> list[int]:
+        now = clock()
+        wait = model.wait_minutes(stop, route, now.hour * 60 + now.minute)
+        return [wait + k * model.headway(route) for k in range(n)]
+
+    return EtaSource("headway", fetch, local=True)
+
+
+class _ChainBase:
+    """
+    - budget_sec: lookup 1번 전체의 시간 예산
+    - source_timeout_sec: source 1개가 쓸 수 있는 최대 시간(멈춘 첫 source가 예산을 다 쓰지 않게)
+    """
+
+    def __init__(
+        self,
+        route: str,
+        sources: list[EtaSource],
+        budget_sec: float = 3.0,
+        source_timeout_sec: float | None = None,
+    ):
+        if not sources:
+            raise ValueError("sources must not be empty")
+        self.name = "fallback(" + ">".join(s.name for s in sources) + ")"
+        self.route = route
+        self.sources = list(sources)
+        self.budget_sec = budget_sec
+        self.source_timeout_sec = source_timeout_sec
+        # stop -> 마지막으로 답한 source 이름(없으면 "")
+        self.last_sources: dict[str, str] = {}
+
+    def _timeout(self, remaining: float) -> float:
+        if self.source_timeout_sec is None:
+            return remaining
+        return min(remaining, self.source_timeout_sec)
+
+    def _skip_reason(self, src: EtaSource, remaining: float) -> str | None:
+        if src.local:
+            return None
+        if remaining <= 0:
+            return "no budget left"
+        if not src.breaker.allow():
+            return "circuit open"
+        return None
+
+    def _finish(self, stop: str, etas: list[int], source: str | None, errors: list[str]) -> EtaLookup:
+        self.last_sources[stop] = source or ""
+        return EtaLookup(etas=etas, source=source, errors=tuple(errors))
+
+
+class AsyncFallbackEtaProvider(_ChainBase):
+    """
+    async chain. 네트워크 source는 asyncio.wait_for(남은 예산)로 끊는다.
+    - get_next_arrivals(stop, max_results)는 AsyncSubwayPositionEtaProvider와 같은 모양(스냅샷 builder에 그대로 사용)
+    """
+
+    async def lookup(self, stop: str, max_results: int = 3) -> EtaLookup:
+        deadline = time.monotonic() + self.budget_sec
+        errors: list[str] = []
+        for src in self.sources:
+            remaining = deadline - time.monotonic()
+            reason = self._skip_reason(src, remaining)
+            if reason:
+                errors.append(f"{src.name}: {reason}")
+                continue
+            timeout = self._timeout(remaining)
+            try:
+                result = src.fetch(stop, self.route, max_results)
+                if inspect.isawaitable(result):
+                    result = await asyncio.wait_for(result, timeout=timeout)
+                etas = result
+            except asyncio.TimeoutError:
+                src.breaker.record_failure()
+                errors.append(f"{src.name}: TimeoutError after {timeout:.1f}s")
+                continue
+            except Exception as e:
+                if not src.local:
+                    src.breaker.record_failure()
+                errors.append(f"{src.name}: {type(e).__name__}: {e}")
+                continue
+            if not src.local:
+                src.breaker.record_success()
+
+            etas = [int(x) for x in etas or []][:max_results]
+            if etas:
+                return self._finish(stop, etas, src.name, errors)
+            errors.append(f"{src.name}: no data")
+        return self._finish(stop, [], None, errors)
+
+    async def get_next_arrivals(self, stop: str, max_results: int = 3) -> list[int]:
+        return (await self.lookup(stop, max_results)).etas
+
+    async def get_eta_minutes(self, stop: str, route: str | None = None) -> int | None:
+        etas = await self.get_next_arrivals(stop, max_results=1)
+        return etas[0] if etas else None
@@ -0,0 +1,74 @@
+import argparse
+import csv
+from datetime import datetime
+from pathlib import Path
+
+from app.adapters.subway_line_graph import load_line_graphs
+from app.adapters.subway_position_eta_provider import _parse_dt
+from app.adapters.subway_travel_model import (
+    DEFAULT_TRAVEL_TABLE_PATH,
+    fit_travel_table,
+    load_travel_tables,
+    save_travel_tables,
+)
+
+
+def _read_position_logs(paths: list[Path]) -> dict[str, dict[str, list[tuple[datetime, str]]]]:
+    """
+    위치 로그 CSV(seoul_subway_position_probe --log) -> {노선: {열차 키: [(시각, 역)]}}
+    - 열차 키 = 수집 날짜 + trainNo(열차번호는 날마다 재사용)
+    """
+    by_line: dict[str, dict[str, list[tuple[datetime, str]]]] = {}
+    for path in paths:
+        with path.open("r", encoding="utf-8-sig", newline="") as f:
+            for r in csv.DictReader(f):
+                train_no = (r.get("trainNo") or "").strip()
+                station = (r.get("statnNm") or "").strip()
+                if not train_no or not station:
+                    continue
+
+                collected = datetime.fromisoformat(r["collected_at"])
+                ts = _parse_dt(r.get("recptnDt") or "") or collected
+                key = f"{collected.date()}:{train_no}"
+                by_line.setdefault(r.get("line") or "수인분당선", {}).setdefault(key, []).append((ts, station))
+    return by_line
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Fit per-segment subway travel times from position logs.")
+    # collect_route_snapshot CSV는 쓰지 않는다: 지하철 ETA가 이 위치 추정치 자체이고 열차/위치 정보가 없다
+    p.add_argument("inputs", nargs="+", help="위치 로그 CSV 파일들")
+    p.add_argument("--output", default=str(DEFAULT_TRAVEL_TABLE_PATH))
+    p.add_argument("--lines-file", default="", help="노선 데이터 파일(기본: data/subway_lines.json)")
+    p.add_argument("--min-samples", type=int, default=3)
+    args = p.parse_args()
+
+    paths = [Path(x) for x in args.inputs]
+    for path in paths:
+        if not path.exists():
+            raise SystemExit(f"File not found: {path}")
+
+    graphs = load_line_graphs(args.lines_file or None)
+    # 같은 파일의 다른 노선 학습 결과는 유지
+    tables = load_travel_tables(args.output)
+
+    for line, trains in _read_position_logs(paths).items():
+        graph = graphs.get(line)
+        if graph is None:
+            print(f"[{line}] skipped: not in line graph")
+            continue
+
+        table = fit_travel_table(graph, trains, min_samples=args.min_samples)
+        tables[line] = table
+
+        learned = sum(v is not None for steps in table.steps.values() for v in steps)
+        total = sum(2 * (len(s) - 1) for s in graph.branches.values())
+        print(f"[{line}] trains={len(trains)} learned segments={learned}/{total}")
+
+    save_travel_tables(args.output, tables)
+    print(f"Saved travel table: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,13 @@
+import asyncio
 import os
 from urllib.parse import unquote
 
+import httpx
 import requests
 
 from app.adapters.eta_provider import EtaProvider
+from app.adapters.gbis_cache import STATION_SEARCH, GbisLookupCache, default_lookup_cache
+from app.adapters.single_flight import SingleFlightCache
 
 
 ARRIVAL_LIST_URL = "https://apis.data.go.kr/6410000/busarrivalservice/v2/getBusArrivalListv2"
@@ -23,6 +27,105 @@ def _as_list(x):
     return [x]
 
 
+def _ensure_ok(data: dict) -> dict:
+    header = data.get("response", {}).get("msgHeader", {})
+    code = int(header.get("resultCode", 0))
+    if code != 0:
+        raise ValueError(f"GBIS error: {header}")
+    return data.get("response", {}).get("msgBody", {}) or {}
+
+
+def _station_id_from_search(stations: list[dict], keyword: str) -> str:
+    if not stations:
+        raise ValueError(f"No station found for keyword={keyword!r}")
+
+    # 1개면 자동 선택
+    if len(stations) == 1:
+        return str(stations[0].get("stationId"))
+
+    # 여러 개면 “선택”이 필요하므로, 후보를 보여주고 에러로 멈춘다
+    lines = []
+    for s in stations[:10]:
+        lines.append(
+            f"stationId={s.get('stationId')} name={s.get('stationName')} "
+            f"region={s.get('regionName')} mobileNo={s.get('mobileNo')}"
+        )
+    raise ValueError(
+        "Ambiguous station keyword. Use stationId directly.\n" + "\n".join(lines)
+    )
+
+
+def _arrivals_by_route(body: dict) -> dict[str, list[int]]:
+    """
+    정류소 도착 목록 -> {routeName: [predictTime1, predictTime2]} (유효한 값만, 오름차순)
+    """
+    by_route: dict[str, list[int]] = {}
+    for a in _as_list(body.get("busArrivalList")):
+        route = str(a.get("routeName", "")).strip()
+
+        candidates = []
+        for t in (a.get("predictTime1"), a.get("predictTime2")):
+            try:
+                tt = int(t)
+                if tt >= 0:
+                    candidates.append(tt)
+            except Exception:
+                pass
+
+        if candidates:
+            by_route.setdefault(route, []).extend(candidates)
+
+    return {route: sorted(times) for route, times in by_route.items()}
+
+
+class _GbisApi:
+    """
+    GBIS 요청 파라미터 + 응답 해석(전송은 각 provider가 한다).
+    - 정류소명 -> stationId 검색 결과는 lookup_cache(디스크 + LRU, CLI와 공유)에 둔다
+    """
+
+    def __init__(
+        self,
+        service_key: str | None,
+        arrival_url: str,
+        station_search_url: str,
+        lookup_cache: GbisLookupCache | None,
+    ):
+        key = service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY")
+        if not key:
+            raise ValueError("Missing DATA_GO_KR_SERVICE_KEY (or pass service_key)")
+        self._service_key = _norm_key(key)
+        self.arrival_url = arrival_url
+        self.station_search_url = station_search_url
+        self._lookup_cache = lookup_cache or default_lookup_cache()
+
+    def arrival_params(self, station_id: str) -> dict:
+        return {"serviceKey": self._service_key, "stationId": station_id, "format": "json"}
+
+    def search_params(self, keyword: str) -> dict:
+        return {"serviceKey": self._service_key, "keyword": keyword, "format": "json"}
+
+    def cached_station_id(self, stop: str) -> tuple[str, bool]:
+        """stop -> (stationId 또는 검색어, 확정 여부). 확정이 아니면 search_params로 검색해야 한다"""
+        keyword = stop.strip()
+        if keyword.isdigit():
+            return keyword, True
+        stations = self._lookup_cache.get(STATION_SEARCH, keyword)
+        if stations is None:
+            return keyword, False
+        return _station_id_from_search(stations, keyword), True
+
+    def station_id_from_search(self, data: dict, keyword: str) -> str:
+        stations = _as_list(_ensure_ok(data).get("busStationList"))
+        if stations:
+            self._lookup_cache.put(STATION_SEARCH, keyword, stations)
+        return _station_id_from_search(stations, keyword)
+
+    @staticmethod
+    def arrivals(data: dict) -> dict[str, list[int]]:
+        return _arrivals_by_route(_ensure_ok(data))
+
+
 class GbisBusEtaProvider:
     """
     GBIS(경기버스정보) 버스 ETA provider.
@@ -31,80 +134,111 @@ class GbisBusEtaProvider:
     """
     name = "gbis_bus"
 
-    def __init__(self, service_key: str | None = None, timeout_sec: int = 10):
-        key = service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY")
-        if not key:
-            raise ValueError("Missing DATA_GO_KR_SERVICE_KEY (or pass service_key)")
-        self._service_key = _norm_key(key)
+    def __init__(
+        self,
+        service_key: str | None = None,
+        timeout_sec: int = 10,
+        session: requests.Session | None = None,
+        arrival_url: str = ARRIVAL_LIST_URL,
+        station_search_url: str = STATION_SEARCH_URL,
+        station_ttl_sec: float = 15.0,
+        lookup_cache: GbisLookupCache | None = None,
+    ):
+        self._api = _GbisApi(service_key, arrival_url, station_search_url, lookup_cache)
         self._timeout = timeout_sec
+        # keep-alive 연결 재사용(매 호출 TCP/TLS 핸드셰이크 방지)
+        self._session = session or requests.Session()
+
+        # stationId -> {routeName: [분, ...]}. 같은 정류소 동시 조회는 upstream 1번(single-flight)
+        self._station_memo: SingleFlightCache[dict[str, list[int]]] = SingleFlightCache(station_ttl_sec)
 
     def _get_json(self, url: str, params: dict) -> dict:
-        r = requests.get(url, params=params, timeout=self._timeout)
+        r = self._session.get(url, params=params, timeout=self._timeout)
         r.raise_for_status()
         return r.json()
 
-    def _ensure_ok(self, data: dict) -> dict:
-        header = data.get("response", {}).get("msgHeader", {})
-        code = int(header.get("resultCode", 0))
-        if code != 0:
-            raise ValueError(f"GBIS error: {header}")
-        return data.get("response", {}).get("msgBody", {}) or {}
-
-    def _resolve_station_id(self, keyword: str) -> str:
-        params = {"serviceKey": self._service_key, "keyword": keyword, "format": "json"}
-        data = self._get_json(STATION_SEARCH_URL, params)
-        body = self._ensure_ok(data)
-        stations = _as_list(body.get("busStationList"))
-
-        if not stations:
-            raise ValueError(f"No station found for keyword={keyword!r}")
-
-        # 1개면 자동 선택
-        if len(stations) == 1:
-            return str(stations[0].get("stationId"))
-
-        # 여러 개면 “선택”이 필요하므로, 후보를 보여주고 에러로 멈춘다
-        lines = []
-        for s in stations[:10]:
-            lines.append(
-                f"stationId={s.get('stationId')} name={s.get('stationName')} "
-                f"region={s.get('regionName')} mobileNo={s.get('mobileNo')}"
-            )
-        raise ValueError(
-            "Ambiguous station keyword. Use stationId directly.\n" + "\n".join(lines)
-        )
+    def _fetch_station(self, station_id: str) -> dict[str, list[int]]:
+        return self._api.arrivals(self._get_json(self._api.arrival_url, self._api.arrival_params(station_id)))
+
+    def _resolve_station_id(self, stop: str) -> str:
+        station_id, resolved = self._api.cached_station_id(stop)
+        if resolved:
+            return station_id
+        data = self._get_json(self._api.station_search_url, self._api.search_params(station_id))
+        return self._api.station_id_from_search(data, station_id)
+
+    def get_station_arrivals(self, stop: str) -> dict[str, list[int]]:
+        """
+        한 정류소의 모든 노선 도착 예정(분)을 1번의 호출로 가져온다.
+        - 반환: {routeName: [predictTime1, predictTime2]} (station_ttl_sec 동안 memo)
+        """
+        station_id = self._resolve_station_id(stop)
+        return self._station_memo.get(station_id, lambda: self._fetch_station(station_id))
+
+    def get_next_arrivals(self, stop: str, route: str, max_results: int = 3) -> list[int]:
+        """
+        (정류소, 노선)의 다가오는 도착 예정(분) 목록. predictTime1/predictTime2를 모두 쓴다.
+        """
+        return self.get_station_arrivals(stop).get(route.strip(), [])[:max_results]
 
     def get_eta_minutes(self, stop: str, route: str) -> int | None:
-        station_id = stop.strip()
-        if not station_id.isdigit():
-            station_id = self._resolve_station_id(station_id)
-
-        params = {"serviceKey": self._service_key, "stationId": station_id, "format": "json"}
-        data = self._get_json(ARRIVAL_LIST_URL, params)
-        body = self._ensure_ok(data)
+        arr = self.get_next_arrivals(stop, route, max_results=1)
+        return arr[0] if arr else None
 
-        arrivals = _as_list(body.get("busArrivalList"))
-        if not arrivals:
-            return None
 
-        # routeName이 "51"처럼 들어오는 항목을 찾는다
-        candidates = []
-        for a in arrivals:
-            if str(a.get("routeName", "")).strip() != route.strip():
-                continue
-
-            t1 = a.get("predictTime1")
-            t2 = a.get("predictTime2")
+class AsyncGbisBusEtaProvider:
+    """
+    GbisBusEtaProvider의 async 버전(요청/해석은 _GbisApi 공유).
+    - 여러 provider가 하나의 httpx.AsyncClient(연결 풀, keep-alive)를 공유한다
+    """
+    name = "gbis_bus"
 
-            for t in (t1, t2):
-                try:
-                    tt = int(t)
-                    if tt >= 0:
-                        candidates.append(tt)
-                except Exception:
-                    pass
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        service_key: str | None = None,
+        timeout_sec: int = 10,
+        arrival_url: str = ARRIVAL_LIST_URL,
+        station_search_url: str = STATION_SEARCH_URL,
+        station_ttl_sec: float = 15.0,
+        lookup_cache: GbisLookupCache | None = None,
+    ):
+        self._api = _GbisApi(service_key, arrival_url, station_search_url, lookup_cache)
+        self._timeout = timeout_sec
+        self._client = client
+        self._station_memo: SingleFlightCache[dict[str, list[int]]] = SingleFlightCache(station_ttl_sec)
+        self._station_locks: dict[str, asyncio.Lock] = {}
 
-        if not candidates:
-            return None
+    async def _get_json(self, url: str, params: dict) -> dict:
+        r = await self._client.get(url, params=params, timeout=self._timeout)
+        r.raise_for_status()
+        return r.json()
 
-        return min(candidates)
+    async def _resolve_station_id(self, stop: str) -> str:
+        station_id, resolved = self._api.cached_station_id(stop)
+        if resolved:
+            return station_id
+        data = await self._get_json(self._api.station_search_url, self._api.search_params(station_id))
+        return self._api.station_id_from_search(data, station_id)
+
+    async def get_station_arrivals(self, stop: str) -> dict[str, list[int]]:
+        station_id = await self._resolve_station_id(stop)
+
+        # 같은 정류소를 동시에 물으면 1번만 호출하고 나머지는 memo를 읽는다
+        lock = self._station_locks.setdefault(station_id, asyncio.Lock())
+        async with lock:
+            by_route = self._station_memo.peek(station_id)
+            if by_route is not None:
+                return by_route
+
+            data = await self._get_json(self._api.arrival_url, self._api.arrival_params(station_id))
+            by_route = self._api.arrivals(data)
+            self._station_memo.put(station_id, by_route)
+            return by_route
+
+    async def get_next_arrivals(self, stop: str, route: str, max_results: int = 3) -> list[int]:
+        return (await self.get_station_arrivals(stop)).get(route.strip(), [])[:max_results]
+
+    async def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        arr = await self.get_next_arrivals(stop, route, max_results=1)
+        return arr[0] if arr else None
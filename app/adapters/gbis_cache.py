@@ -0,0 +1,170 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "ontime-engine" / "gbis_lookup.json"
+DEFAULT_TTL_SEC = 7 * 24 * 3600  # 정류소/경유노선은 거의 바뀌지 않는다
+
+# namespace
+STATION_SEARCH = "station_search"  # keyword -> busStationList
+STATION_ROUTES = "station_routes"  # stationId -> busRouteList
+
+
+class GbisLookupCache:
+    """
+    GBIS 정류소 검색/경유노선 조회 결과 캐시.
+    - 디스크(JSON 파일)에 저장해 재시작 후에도 유지, provider와 CLI가 같은 파일을 공유
+    - 앞단의 프로세스 내 LRU가 반복 조회에서 파일 읽기를 막는다
+    - 파일은 한 번 읽어 두고, 다른 프로세스가 바꿨을 때(stat 변화)만 다시 읽는다
+    - 쓰기는 파일 락 아래에서 최신 파일과 합친 뒤 임시 파일 -> 원자적 교체(동시 쓰기에도 항목 유실 없음)
+    - ttl_sec이 지난 항목은 없는 것으로 본다
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.time,
+    ):
+        if path is None:
+            path = os.environ.get("GBIS_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self._path = Path(path)
+        self._ttl = ttl_sec
+        self._max = max_entries
+        self._clock = clock
+        self._lru: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # 마지막으로 읽은 파일 내용과 그때의 stat
+        self._file_entries: dict[str, dict] = {}
+        self._file_stat: tuple[int, int, int] | None = None
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        k = f"{namespace}:{key}"
+        now = self._clock()
+
+        with self._lock:
+            hit = self._lru.get(k)
+            if hit is None:
+                entry = self._load_file().get(k)
+                if entry is None:
+                    return None
+                hit = (float(entry["saved_at"]), entry["value"])
+                self._remember(k, hit)
+            else:
+                self._lru.move_to_end(k)
+
+        if now - hit[0] > self._ttl:
+            return None
+        return hit[1]
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        k = f"{namespace}:{key}"
+        saved_at = self._clock()
+
+        with self._lock, self._file_lock():
+            self._remember(k, (saved_at, value))
+
+            # 락 안에서 다시 읽어 다른 프로세스가 그 사이 쓴 항목과 합친다
+            self._file_stat = None
+            entries = dict(self._load_file())
+            entries[k] = {"saved_at": saved_at, "value": value}
+            # 만료된 항목은 쓰는 김에 정리
+            entries = {
+                name: e for name, e in entries.items() if saved_at - float(e["saved_at"]) <= self._ttl
+            }
+            self._write_file(entries)
+
+    def _remember(self, k: str, hit: tuple[float, Any]) -> None:
+        self._lru[k] = hit
+        self._lru.move_to_end(k)
+        while len(self._lru) > self._max:
+            self._lru.popitem(last=False)
+
+    def _stat(self) -> tuple[int, int, int] | None:
+        try:
+            st = self._path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load_file(self) -> dict[str, dict]:
+        """파일이 마지막으로 읽은 뒤 바뀌었을 때만 다시 파싱한다"""
+        stat = self._stat()
+        if stat is None:
+            self._file_entries, self._file_stat = {}, None
+        elif stat != self._file_stat:
+            self._file_entries, self._file_stat = self._read_file(), stat
+        return self._file_entries
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """같은 파일을 쓰는 프로세스 간 배타 락(<파일>.lock)"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self._path.with_suffix(self._path.suffix + ".lock")
+        with open(lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_file(self) -> dict[str, dict]:
+        try:
+            with self._path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def _write_file(self, entries: dict[str, dict]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._path.parent, prefix=self._path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 교체는 원자적으로
+            os.replace(tmp, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._file_entries, self._file_stat = entries, self._stat()
+
+
+_default_cache: GbisLookupCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_lookup_cache() -> GbisLookupCache:
+    """
+    프로세스 전체가 공유하는 기본 캐시(GBIS_CACHE_PATH 또는 ~/.cache/ontime-engine/gbis_lookup.json).
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = GbisLookupCache()
+        return _default_cache
@@ -4,6 +4,8 @@ from urllib.parse import unquote
 
 import requests
 
+from app.adapters.gbis_cache import STATION_SEARCH, GbisLookupCache, default_lookup_cache
+
 
 STATION_SEARCH_URL = "https://apis.data.go.kr/6410000/busstationservice/v2/getBusStationListv2"
 
@@ -13,19 +15,13 @@ def _norm_key(k: str) -> str:
     return unquote(k) if "%" in k else k
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="GBIS station lookup (keyword -> stationId list)")
-    parser.add_argument("--keyword", required=True, help="정류소명/번호 키워드 (예: 이마트앞)")
-    parser.add_argument("--service-key", default=None, help="data.go.kr serviceKey (없으면 env DATA_GO_KR_SERVICE_KEY)")
-    parser.add_argument("--limit", type=int, default=10, help="출력 개수")
-    args = parser.parse_args()
-
-    key = args.service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY")
+def _fetch_stations(keyword: str, service_key: str | None) -> list[dict]:
+    key = service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY")
     if not key:
         raise SystemExit("Missing service key. Set DATA_GO_KR_SERVICE_KEY or pass --service-key")
     key = _norm_key(key)
 
-    params = {"serviceKey": key, "keyword": args.keyword, "format": "json"}
+    params = {"serviceKey": key, "keyword": keyword, "format": "json"}
     r = requests.get(STATION_SEARCH_URL, params=params, timeout=10)
     if r.status_code != 200:
         # URL(키 포함) 대신 응답 내용만 일부 출력
@@ -41,6 +37,24 @@ def main() -> int:
     stations = body.get("busStationList") or []
     if isinstance(stations, dict):
         stations = [stations]
+    return stations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GBIS station lookup (keyword -> stationId list)")
+    parser.add_argument("--keyword", required=True, help="정류소명/번호 키워드 (예: 이마트앞)")
+    parser.add_argument("--service-key", default=None, help="data.go.kr serviceKey (없으면 env DATA_GO_KR_SERVICE_KEY)")
+    parser.add_argument("--limit", type=int, default=10, help="출력 개수")
+    parser.add_argument("--cache-path", default=None, help="조회 캐시 파일 (없으면 env GBIS_CACHE_PATH 또는 기본 경로)")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 무시하고 API를 다시 조회")
+    args = parser.parse_args()
+
+    cache = GbisLookupCache(args.cache_path) if args.cache_path else default_lookup_cache()
+    stations = None if args.no_cache else cache.get(STATION_SEARCH, args.keyword)
+    if stations is None:
+        stations = _fetch_stations(args.keyword, args.service_key)
+        if stations:
+            cache.put(STATION_SEARCH, args.keyword, stations)
 
     print(f"Found {len(stations)} stations for keyword={args.keyword!r}")
     for s in stations[: args.limit]:
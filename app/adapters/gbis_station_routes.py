@@ -4,6 +4,8 @@ from urllib.parse import unquote
 
 import requests
 
+from app.adapters.gbis_cache import STATION_ROUTES, GbisLookupCache, default_lookup_cache
+
 URL = "https://apis.data.go.kr/6410000/busstationservice/v2/getBusStationViaRouteListv2"
 
 
@@ -20,18 +22,13 @@ def _as_list(x):
     return [x]
 
 
-def main() -> int:
-    p = argparse.ArgumentParser(description="GBIS: list routes that pass a stationId")
-    p.add_argument("--station-id", required=True)
-    p.add_argument("--route", default="", help="Optional: check if routeName exists (e.g., 5100)")
-    args = p.parse_args()
-
+def _fetch_routes(station_id: str) -> list[dict]:
     key = os.environ.get("DATA_GO_KR_SERVICE_KEY")
     if not key:
         raise SystemExit("Missing DATA_GO_KR_SERVICE_KEY")
     key = _norm_key(key)
 
-    r = requests.get(URL, params={"serviceKey": key, "stationId": args.station_id, "format": "json"}, timeout=10)
+    r = requests.get(URL, params={"serviceKey": key, "stationId": station_id, "format": "json"}, timeout=10)
     if r.status_code != 200:
         raise SystemExit(f"HTTP {r.status_code}: {r.text[:200]}")
 
@@ -41,7 +38,24 @@ def main() -> int:
         raise SystemExit(f"GBIS error: {header}")
 
     body = data.get("response", {}).get("msgBody", {}) or {}
-    routes = _as_list(body.get("busRouteList"))
+    return _as_list(body.get("busRouteList"))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="GBIS: list routes that pass a stationId")
+    p.add_argument("--station-id", required=True)
+    p.add_argument("--route", default="", help="Optional: check if routeName exists (e.g., 5100)")
+    p.add_argument("--cache-path", default=None, help="Lookup cache file (default: env GBIS_CACHE_PATH or ~/.cache)")
+    p.add_argument("--no-cache", action="store_true", help="Ignore cached route list and call the API")
+    args = p.parse_args()
+
+    cache = GbisLookupCache(args.cache_path) if args.cache_path else default_lookup_cache()
+    routes = None if args.no_cache else cache.get(STATION_ROUTES, args.station_id)
+    if routes is None:
+        routes = _fetch_routes(args.station_id)
+        if routes:
+            cache.put(STATION_ROUTES, args.station_id, routes)
+
     names = sorted({str(x.get("routeName", "")).strip() for x in routes if x.get("routeName")})
 
     target = args.route.strip()
@@ -0,0 +1,50 @@
+import hashlib
+from functools import cached_property, lru_cache
+
+from app.services.decision_engine import MINUTES_PER_DAY, DepartureSchedule
+
+
+@lru_cache(maxsize=None)
+def _schedule_for_headway(headway: int) -> DepartureSchedule:
+    # 매 시 정각부터 headway 분마다 출발 (예: 8분 -> :00, :08, ..., :56)
+    departures = tuple(m for m in range(MINUTES_PER_DAY) if (m % 60) % headway == 0)
+    return DepartureSchedule(departures=departures)
+
+
+class HeadwayWaitProvider:
+    """
+    배차간격(headway) 기반 대기시간 모델.
+    - 실시간 데이터가 없을 때, 대기 0분 같은 비현실적인 결과를 피하기 위한 fallback
+    - wait_provider(stop, route, "HH:MM") 또는 wait_minutes(stop, route, 분) 형태로 호출 가능
+    """
+
+    def __init__(self, headway_by_route: dict[str, int], default_headway: int = 8):
+        for route, headway in {**headway_by_route, "": default_headway}.items():
+            if headway <= 0:
+                raise ValueError(f"headway must be > 0 (route={route!r}): {headway}")
+        self._headway_by_route = dict(headway_by_route)
+        self._default = default_headway
+
+    @cached_property
+    def content_version(self) -> str:
+        """배차간격 설정의 해시(설정이 같으면 프로세스가 달라도 같은 값)"""
+        parts = [f"{route}\x1f{h}" for route, h in sorted(self._headway_by_route.items())]
+        parts.append(f"\x1f{self._default}")
+        return hashlib.blake2b("\x1e".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+    def headway(self, route: str) -> int:
+        return self._headway_by_route.get(route, self._default)
+
+    def wait_minutes(self, stop: str, route: str, minute_of_day: int) -> int:
+        headway = self.headway(route)
+        minutes = minute_of_day % 60
+        return (headway - (minutes % headway)) % headway
+
+    def wait(self, stop: str, route: str, time_hhmm: str) -> int:
+        return self.wait_minutes(stop, route, int(time_hhmm.split(":")[1]))
+
+    def __call__(self, stop: str, route: str, time_hhmm: str) -> int:
+        return self.wait(stop, route, time_hhmm)
+
+    def departure_schedule(self, stop: str, route: str) -> DepartureSchedule:
+        return _schedule_for_headway(self.headway(route))
@@ -0,0 +1,20 @@
+import httpx
+
+
+def create_async_client(
+    timeout_sec: float = 10.0,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+) -> httpx.AsyncClient:
+    """
+    GBIS/서울 API async provider들이 공유하는 연결 풀 client.
+    - keep-alive로 호출마다 TCP/TLS 핸드셰이크를 반복하지 않는다
+    - 사용이 끝나면 await client.aclose()
+    """
+    return httpx.AsyncClient(
+        timeout=timeout_sec,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+    )
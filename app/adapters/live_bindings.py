@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LiveBinding:
+    """
+    엔진 경로의 Board(stop, route)를 실시간 API의 (정류장, 노선)에 연결한다.
+    - kind: "bus"(GBIS) 또는 "subway"(수인분당선 위치 기반)
+    """
+    kind: str
+    stop: str
+    route: str
+    live_stop: str
+    live_route: str
+    max_wait_min: int
+
+
+# FIXED_ROUTE_SEGMENTS의 Board들 <-> collect_route_snapshot과 같은 실제 정류장 ID
+DEFAULT_LIVE_BINDINGS = [
+    LiveBinding("subway", "migeum_station", "subway_suin", "미금", "수인분당선", 10),
+    LiveBinding("bus", "stop_b", "bus_5100", "203000075", "5100", 25),  # 청명역 4번출구
+    LiveBinding("bus", "stop_c", "bus_51", "206000043", "51", 15),      # 성남 이마트앞
+]
+
+
+@dataclass(frozen=True)
+class BindingPlan:
+    """binding 목록을 조회할 정류장(버스/지하철), 엔진 키 alias, 노선별 최대 대기로 나눈 것"""
+    bus_stops: list[tuple[str, str]]
+    subway_stops: list[tuple[str, str]]
+    aliases: dict[tuple[str, str], tuple[str, str]]
+    max_wait_by_route: dict[str, int]
+
+
+def plan_bindings(bindings: list[LiveBinding]) -> BindingPlan:
+    for b in bindings:
+        if b.kind not in ("bus", "subway"):
+            raise ValueError(f"Unknown binding kind: {b.kind!r}")
+
+    max_wait_by_route = {b.live_route: b.max_wait_min for b in bindings}
+    max_wait_by_route.update({b.route: b.max_wait_min for b in bindings})
+    return BindingPlan(
+        bus_stops=[(b.live_stop, b.live_route) for b in bindings if b.kind == "bus"],
+        subway_stops=[(b.live_stop, b.live_route) for b in bindings if b.kind == "subway"],
+        aliases={(b.stop, b.route): (b.live_stop, b.live_route) for b in bindings},
+        max_wait_by_route=max_wait_by_route,
+    )
@@ -0,0 +1,284 @@
+import argparse
+import csv
+import itertools
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from app.adapters.analyze_route_snapshot import open_log_text, to_int
+from app.adapters.binlog import BinLogReader, is_binlog
+from app.adapters.wait_provider_snapshot import WaitSnapshot, norm_stop
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    MINUTES_PER_DAY,
+    Board,
+    Move,
+    compute_departure_minutes_batch,
+    hhmm_to_minutes,
+    minutes_to_hhmm,
+)
+from app.adapters.live_bindings import DEFAULT_LIVE_BINDINGS, LiveBinding, plan_bindings
+
+REPLAY_FIELDS = [
+    "collected_at", "policy", "destination_time", "departure_time", "slack_min", "error",
+]
+
+DEFAULT_MAX_WAIT = {"51": 15, "5100": 25, "수인분당선": 10}  # collect_route_snapshot과 동일
+
+
+@dataclass(frozen=True)
+class ReplayPolicy:
+    name: str
+    transfer_buffer_min: int
+    max_wait_by_route: tuple[tuple[str, int], ...]  # (실제 노선명, 분), pickle/hash 가능하게 tuple
+
+
+def snapshot_from_row(
+    row: dict,
+    max_wait_by_route: dict[str, int],
+    bindings: list[LiveBinding] = DEFAULT_LIVE_BINDINGS,
+) -> WaitSnapshot:
+    """
+    collect_route_snapshot CSV 1행 -> 수집 시점의 WaitSnapshot(엔진 키로도 조회 가능).
+    """
+    arrivals: dict[tuple[str, str], list[int]] = {}
+
+    for prefix, route in (("bus51", "51"), ("bus5100", "5100")):
+        stop = (row.get(f"{prefix}_stop") or "").strip()
+        eta = to_int(row.get(f"{prefix}_eta_min", ""))
+        if stop and eta is not None:
+            arrivals[(norm_stop(stop), route)] = [eta]
+
+    stop = (row.get("subway_stop") or "").strip()
+    route = (row.get("subway_route") or "").strip()
+    etas = [to_int(row.get(f"subway_eta{i}_min", "")) for i in (1, 2, 3)]
+    etas = [e for e in etas if e is not None]
+    if stop and route and etas:
+        arrivals[(norm_stop(stop), route)] = etas
+
+    plan = plan_bindings(bindings)
+    # 정책의 max_wait은 실제 노선명 기준 -> 엔진 노선명에도 같은 값
+    max_wait = dict(max_wait_by_route)
+    for b in bindings:
+        if b.live_route in max_wait_by_route:
+            max_wait[b.route] = max_wait_by_route[b.live_route]
+
+    snap = WaitSnapshot(
+        now=datetime.fromisoformat(row["collected_at"]),
+        arrivals_after_now=arrivals,
+        max_wait_by_route=max_wait,
+    )
+    return snap.with_aliases(plan.aliases)
+
+
+def _departures(
+    destinations: list[int],
+    segments: list[Move | Board],
+    snap: WaitSnapshot,
+    transfer_buffer_min: int,
+) -> list[tuple[int | None, str]]:
+    errors: dict[int, str] = {}
+    deps = compute_departure_minutes_batch(
+        destination_mins=destinations,
+        segments=segments,
+        wait_provider=snap,
+        transfer_buffer_min=transfer_buffer_min,
+        errors=errors,
+    )
+    return [(d, f"ValueError: {errors[i]}" if d is None else "") for i, d in enumerate(deps)]
+
+
+def replay_rows(
+    rows: list[dict],
+    policies: list[ReplayPolicy],
+    destinations: list[int],
+    segments: list[Move | Board] = FIXED_ROUTE_SEGMENTS,
+) -> list[list[str]]:
+    """
+    행 x 정책 x 목표 도착 시각 결과(REPLAY_FIELDS 순서).
+    - 스냅샷은 (행, max_wait 설정)당 1번, 출발 시각은 목표 시각 전체를 배치로 계산
+    """
+    out: list[list[str]] = []
+    for row in rows:
+        collected_at = row["collected_at"]
+        snaps: dict[tuple[tuple[str, int], ...], WaitSnapshot] = {}
+
+        for policy in policies:
+            snap = snaps.get(policy.max_wait_by_route)
+            if snap is None:
+                snap = snapshot_from_row(row, dict(policy.max_wait_by_route))
+                snaps[policy.max_wait_by_route] = snap
+
+            now_min = snap.now.hour * 60 + snap.now.minute
+            results = _departures(destinations, segments, snap, policy.transfer_buffer_min)
+            for dest, (dep, err) in zip(destinations, results):
+                if dep is None:
+                    out.append([collected_at, policy.name, minutes_to_hhmm(dest), "", "", err])
+                    continue
+                # 지금 기준 남은 시간(-720 ~ 719, 음수면 이미 늦음)
+                slack = (dep - now_min + MINUTES_PER_DAY // 2) % MINUTES_PER_DAY - MINUTES_PER_DAY // 2
+                out.append([collected_at, policy.name, minutes_to_hhmm(dest), minutes_to_hhmm(dep), str(slack), ""])
+    return out
+
+
+def _replay_chunk(args: tuple[list[dict], list[ReplayPolicy], list[int]]) -> list[list[str]]:
+    rows, policies, destinations = args
+    return replay_rows(rows, policies, destinations)
+
+
+@contextmanager
+def open_snapshot_rows(path: Path) -> Iterator[Iterator[dict]]:
+    """route snapshot CSV(.csv.gz 포함) 또는 binlog(.otlog) -> CSV 스키마 dict 행 iterator"""
+    if is_binlog(path):
+        with BinLogReader(path) as reader:
+            yield reader.iter_dicts()
+    else:
+        with open_log_text(path) as f:
+            yield iter(csv.DictReader(f))
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    executor.map과 같은 순서로 결과를 내지만, 동시에 제출하는 작업을 window개로 제한한다.
+    - 입력(CSV)을 끝까지 읽지 않고 결과를 바로 흘려보낸다(메모리 일정)
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def replay_file(
+    path: Path,
+    out: TextIO,
+    policies: list[ReplayPolicy],
+    destinations: list[int],
+    workers: int = 0,
+    chunk_rows: int = 200,
+) -> int:
+    """
+    CSV를 읽으며 chunk 단위로 process pool에 나눠 재계산하고 결과를 순서대로 out에 쓴다.
+    - workers <= 1이면 현재 프로세스에서 실행
+    - 반환: 쓴 결과 행 수
+    """
+    w = csv.writer(out)
+    w.writerow(REPLAY_FIELDS)
+    written = 0
+
+    with open_snapshot_rows(path) as source:
+        tasks = ((chunk, policies, destinations) for chunk in _chunks(source, chunk_rows))
+
+        if workers <= 1:
+            results: Iterable[list[list[str]]] = map(_replay_chunk, tasks)
+            for rows in results:
+                w.writerows(rows)
+                written += len(rows)
+            return written
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for rows in ordered_map(ex, _replay_chunk, tasks, window=workers * 2):
+                w.writerows(rows)
+                written += len(rows)
+    return written
+
+
+def _parse_destinations(spec: str) -> list[int]:
+    """
+    "08:30,09:00" 또는 범위 "07:00-10:00/5"(5분 간격, 끝 포함)
+    """
+    out: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            rng, _, step = part.partition("/")
+            start, _, end = rng.partition("-")
+            lo, hi, st = hhmm_to_minutes(start), hhmm_to_minutes(end), int(step or 1)
+            if st <= 0 or hi < lo:
+                raise SystemExit(f"Bad destination range: {part!r}")
+            out.extend(range(lo, hi + 1, st))
+        else:
+            out.append(hhmm_to_minutes(part))
+    if not out:
+        raise SystemExit("No destination times")
+    return out
+
+
+def _parse_max_wait(spec: str) -> tuple[tuple[str, int], ...]:
+    """ "51=15,5100=25,수인분당선=10" -> DEFAULT_MAX_WAIT를 덮어쓴 값 """
+    merged = dict(DEFAULT_MAX_WAIT)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        route, _, minutes = part.partition("=")
+        merged[route.strip()] = int(minutes)
+    return tuple(sorted(merged.items()))
+
+
+def build_policy_grid(buffers: list[int], max_waits: list[str]) -> list[ReplayPolicy]:
+    policies = []
+    for buf, mw in itertools.product(buffers, max_waits or [""]):
+        max_wait = _parse_max_wait(mw)
+        name = f"buf={buf}" + (f";{mw}" if mw else "")
+        policies.append(ReplayPolicy(name=name, transfer_buffer_min=buf, max_wait_by_route=max_wait))
+    return policies
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Replay logged route snapshots through the engine.")
+    p.add_argument("--input", default="logs/day6_route_snapshot.csv", help="CSV 또는 binlog(.otlog)")
+    p.add_argument("--output", default="-", help="결과 CSV(기본: stdout)")
+    p.add_argument("--destinations", default="", help='예: "08:30,09:00" 또는 "07:00-10:00/5" (기본: 행의 destination_time)')
+    p.add_argument("--buffer", type=int, action="append", default=[], help="transfer_buffer_min (여러 번 지정 가능)")
+    p.add_argument("--max-wait", action="append", default=[], help='예: "51=20,5100=30" (여러 번 지정 가능)')
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--chunk-rows", type=int, default=200)
+    args = p.parse_args()
+
+    path = Path(args.input)
+    if not path.exists():
+        raise SystemExit(f"File not found: {path}")
+
+    if args.destinations:
+        destinations = _parse_destinations(args.destinations)
+    else:
+        with open_snapshot_rows(path) as source:
+            first = next(source, None)
+        if first is None or not (first.get("destination_time") or "").strip():
+            raise SystemExit("No --destinations and no destination_time in CSV")
+        destinations = [hhmm_to_minutes(first["destination_time"])]
+
+    policies = build_policy_grid(args.buffer or [3], args.max_wait)
+
+    if args.output == "-":
+        n = replay_file(path, sys.stdout, policies, destinations, args.workers, args.chunk_rows)
+    else:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with out_path.open("w", newline="", encoding="utf-8-sig") as out:
+            n = replay_file(path, out, policies, destinations, args.workers, args.chunk_rows)
+        print(f"Saved replay CSV: {out_path} ({n} rows, {len(policies)} policies x {len(destinations)} destinations)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,34 @@
 import os
 from urllib.parse import quote
 
+import httpx
 import requests
 
+SEOUL_SUBWAY_BASE_URL = "http://swopenAPI.seoul.go.kr"
 
-class SeoulSubwayEtaProvider:
-    name = "seoul_subway"
+
+def check_seoul_response(status_code: int, text: str, data_fn, source: str, api: str) -> dict:
+    """
+    서울 열린데이터 지하철 API 응답 검사(HTTP 상태 + errorMessage.status).
+    - source/api: 오류 메시지용 이름 (예: "seoul subway API", "subway")
+    """
+    if status_code != 200:
+        # 키가 URL에 포함되므로 url은 출력하지 않는다.
+        raise ValueError(f"HTTP {status_code} from {source}: {text[:200]}")
+
+    data = data_fn()
+    err = data.get("errorMessage") or {}
+    status = int(err.get("status", 200))
+    if status != 200:
+        raise ValueError(f"Seoul {api} API error: {err}")
+    return data
+
+
+class _SeoulArrivalApi:
+    """
+    realtimeStationArrival 요청 URL + 응답 해석(전송은 각 provider가 한다).
+    - updn_line("상행"/"하행" 등)을 주면 그 방향 열차만 본다(None이면 양방향)
+    """
 
     LINE_ID_BY_ROUTE = {
         "수인분당선": "1075",
@@ -14,38 +37,34 @@ class SeoulSubwayEtaProvider:
         "신분당선": "1077",
     }
 
-    def __init__(self, api_key: str | None = None, limit: int = 20, timeout_sec: int = 10):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        limit: int = 20,
+        base_url: str = SEOUL_SUBWAY_BASE_URL,
+        updn_line: str | None = None,
+    ):
         key = api_key or os.environ.get("SEOUL_OPENAPI_KEY")
         if not key:
             raise ValueError("Missing SEOUL_OPENAPI_KEY (or pass api_key)")
         self._key = key.strip()
         self._limit = limit
-        self._timeout = timeout_sec
+        self._base_url = base_url.rstrip("/")
+        self._updn_line = updn_line.strip() if updn_line else None
 
-    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+    def url(self, stop: str) -> str:
         statn = stop.strip()
         if statn.endswith("역"):
             statn = statn[:-1]
 
-        url = (
-            f"http://swopenAPI.seoul.go.kr/api/subway/{self._key}/json/"
+        return (
+            f"{self._base_url}/api/subway/{self._key}/json/"
             f"realtimeStationArrival/0/{self._limit}/{quote(statn)}"
         )
 
-        r = requests.get(url, timeout=self._timeout)
-        if r.status_code != 200:
-            # 키가 URL에 포함되므로 url은 출력하지 않는다.
-            raise ValueError(f"HTTP {r.status_code} from seoul subway API: {r.text[:200]}")
-
-        data = r.json()
-        err = data.get("errorMessage") or {}
-        status = int(err.get("status", 200))
-        if status != 200:
-            raise ValueError(f"Seoul subway API error: {err}")
-
+    def etas(self, data: dict, route: str) -> list[int]:
+        """응답 -> 도착 예정(분) 오름차순"""
         rows = data.get("realtimeArrivalList") or []
-        if not rows:
-            return None
 
         route = (route or "").strip()
         if route:
@@ -54,6 +73,8 @@ class SeoulSubwayEtaProvider:
                 rows = [x for x in rows if str(x.get("subwayId", "")).strip() == wanted_id]
             else:
                 rows = [x for x in rows if route in str(x.get("trainLineNm", ""))]
+        if self._updn_line:
+            rows = [x for x in rows if str(x.get("updnLine", "")).strip() == self._updn_line]
 
         minutes_list: list[int] = []
         for x in rows:
@@ -65,4 +86,65 @@ class SeoulSubwayEtaProvider:
                 continue
             minutes_list.append((sec + 59) // 60)
 
-        return min(minutes_list) if minutes_list else None
+        return sorted(minutes_list)
+
+    def parse(self, status_code: int, text: str, data_fn, route: str) -> list[int]:
+        data = check_seoul_response(status_code, text, data_fn, "seoul subway API", "subway")
+        return self.etas(data, route)
+
+
+class SeoulSubwayEtaProvider:
+    """
+    서울 열린데이터 실시간 역 도착정보(realtimeStationArrival) ETA provider.
+    - updn_line("상행"/"하행" 등)을 주면 그 방향 열차만 본다(None이면 양방향 중 가장 빠른 열차)
+    """
+    name = "seoul_subway"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        limit: int = 20,
+        timeout_sec: int = 10,
+        session: requests.Session | None = None,
+        base_url: str = SEOUL_SUBWAY_BASE_URL,
+        updn_line: str | None = None,
+    ):
+        self._api = _SeoulArrivalApi(api_key, limit, base_url, updn_line)
+        self._timeout = timeout_sec
+        self._session = session or requests.Session()
+
+    def get_next_arrivals(self, stop: str, route: str, max_results: int = 3) -> list[int]:
+        r = self._session.get(self._api.url(stop), timeout=self._timeout)
+        return self._api.parse(r.status_code, r.text, r.json, route)[:max_results]
+
+    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        arr = self.get_next_arrivals(stop, route, max_results=1)
+        return arr[0] if arr else None
+
+
+class AsyncSeoulSubwayEtaProvider:
+    """
+    SeoulSubwayEtaProvider의 async 버전(공유 httpx.AsyncClient 사용, 요청/해석은 _SeoulArrivalApi 공유).
+    """
+    name = "seoul_subway"
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_key: str | None = None,
+        limit: int = 20,
+        timeout_sec: int = 10,
+        base_url: str = SEOUL_SUBWAY_BASE_URL,
+        updn_line: str | None = None,
+    ):
+        self._api = _SeoulArrivalApi(api_key, limit, base_url, updn_line)
+        self._timeout = timeout_sec
+        self._client = client
+
+    async def get_next_arrivals(self, stop: str, route: str, max_results: int = 3) -> list[int]:
+        r = await self._client.get(self._api.url(stop), timeout=self._timeout)
+        return self._api.parse(r.status_code, r.text, r.json, route)[:max_results]
+
+    async def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        arr = await self.get_next_arrivals(stop, route, max_results=1)
+        return arr[0] if arr else None
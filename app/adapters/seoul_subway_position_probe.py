@@ -1,32 +1,74 @@
+import argparse
+import csv
 import os
+import time
+from datetime import datetime
+from pathlib import Path
 from urllib.parse import quote
 
 import requests
 
 URL_FMT = "http://swopenAPI.seoul.go.kr/api/subway/{key}/json/realtimePosition/0/500/{line}"
 
+# fit_subway_travel_times 입력 형식
+POSITION_LOG_FIELDS = [
+    "collected_at", "line", "trainNo", "statnNm", "statnTnm", "updnLine", "trainSttus", "recptnDt",
+]
+
+
+def _fetch_rows(key: str, line: str) -> list[dict]:
+    url = URL_FMT.format(key=key, line=quote(line))
+    r = requests.get(url, timeout=10)
+    if r.status_code != 200:
+        raise SystemExit(f"HTTP {r.status_code}: {r.text[:200]}")
+    return r.json().get("realtimePositionList") or []
+
+
+def _append_log(path: Path, line: str, rows: list[dict], now: datetime) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_exists = path.exists()
+    with path.open("a", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=POSITION_LOG_FIELDS)
+        if not file_exists:
+            w.writeheader()
+        for x in rows:
+            w.writerow(
+                {
+                    "collected_at": now.isoformat(timespec="seconds"),
+                    "line": line,
+                    **{k: str(x.get(k) or "").strip() for k in POSITION_LOG_FIELDS[2:]},
+                }
+            )
+
 
 def main() -> int:
+    p = argparse.ArgumentParser(description="Probe (and optionally log) Seoul realtimePosition.")
+    p.add_argument("--line", default="수인분당선")
+    p.add_argument("--log", default="", help="열차 위치를 CSV에 누적 저장(fit_subway_travel_times 입력)")
+    p.add_argument("--count", type=int, default=1)
+    p.add_argument("--interval-sec", type=float, default=20.0)
+    args = p.parse_args()
+
     key = os.environ.get("SEOUL_OPENAPI_KEY", "").strip()
     if not key:
         raise SystemExit("Missing SEOUL_OPENAPI_KEY")
 
-    line = "수인분당선"
-    url = URL_FMT.format(key=key, line=quote(line))
+    line = args.line
+    for i in range(args.count):
+        rows = _fetch_rows(key, line)
+        stations = sorted({(x.get("statnNm") or "").strip() for x in rows if x.get("statnNm")})
 
-    r = requests.get(url, timeout=10)
-    if r.status_code != 200:
-        raise SystemExit(f"HTTP {r.status_code}: {r.text[:200]}")
+        if args.log:
+            _append_log(Path(args.log), line, rows, datetime.now())
 
-    data = r.json()
-    rows = data.get("realtimePositionList") or []
-    stations = sorted({(x.get("statnNm") or "").strip() for x in rows if x.get("statnNm")})
+        print("line:", line)
+        print("train_count:", len(rows))
+        print("has_migeum:", ("미금" in stations))
+        print("has_cheongmyeong:", ("청명" in stations))
+        print("sample_stations:", stations[:30])
 
-    print("line:", line)
-    print("train_count:", len(rows))
-    print("has_migeum:", ("미금" in stations))
-    print("has_cheongmyeong:", ("청명" in stations))
-    print("sample_stations:", stations[:30])
+        if i < args.count - 1 and args.interval_sec > 0:
+            time.sleep(args.interval_sec)
     return 0
 
 
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SingleFlightCache(Generic[V]):
+    """
+    thread-safe TTL cache + single-flight.
+    - fresh(age <= ttl_sec): 캐시 값
+    - stale(ttl_sec < age <= ttl_sec + stale_sec): 캐시 값을 바로 돌려주고, 백그라운드에서 키당 1번만 갱신
+    - 없음/만료: 같은 키의 동시 호출은 fetch 1번의 결과(또는 예외)를 함께 받는다
+    - 실패는 캐시하지 않는다(백그라운드 갱신 실패면 stale 값을 계속 쓴다). 항목 수는 max_entries(LRU)
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float,
+        stale_sec: float = 0.0,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_sec = ttl_sec
+        self.stale_sec = stale_sec
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def peek(self, key: Hashable) -> V | None:
+        """fresh 값만(없으면 None). fetch하지 않는다"""
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is not None and self._clock() - hit[0] <= self.ttl_sec:
+            return hit[1]
+        return None
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable, fetch: Callable[[], V]) -> V:
+        with self._lock:
+            hit = self._entries.get(key)
+            age = self._clock() - hit[0] if hit is not None else None
+            if hit is not None and age <= self.ttl_sec:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return hit[1]
+
+            flight = self._flights.get(key)
+            stale = hit is not None and age <= self.ttl_sec + self.stale_sec
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            if stale:
+                self.stale_hits += 1
+            elif leader:
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if stale:
+            if leader:
+                threading.Thread(target=self._run, args=(key, fetch, flight), daemon=True).start()
+            return hit[1]
+
+        if leader:
+            self._run(key, fetch, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run(self, key: Hashable, fetch: Callable[[], V], flight: _Flight) -> None:
+        # 어떤 식으로 끝나든(KeyboardInterrupt/SystemExit 포함) flight를 치우고 대기자를 깨운다
+        try:
+            flight.value = fetch()
+        except Exception as e:
+            flight.error = e
+        except BaseException:
+            # leader에게는 원래 예외를, 대기자에게는 일반 예외를 준다
+            flight.error = RuntimeError(f"fetch for {key!r} was interrupted")
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._store(key, flight.value)
+                self._flights.pop(key, None)
+            flight.done.set()
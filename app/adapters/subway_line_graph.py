@@ -0,0 +1,85 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_LINES_PATH = Path(__file__).parent / "data" / "subway_lines.json"
+
+FORWARD = 1    # branch 순서대로(예: 수인분당선 왕십리 -> 인천)
+BACKWARD = -1  # 반대 방향
+
+
+@lru_cache(maxsize=1024)
+def norm_station(name: str) -> str:
+    s = (name or "").strip()
+    if s.endswith("역"):
+        s = s[:-1]
+    s = re.sub(r"\(.*?\)", "", s)
+    s = re.sub(r"\s+", "", s)
+    return s
+
+
+class LineGraph:
+    """
+    지하철 노선 1개의 역 순서(분기 포함).
+    - branches: {branch명: 한쪽 끝 -> 다른 끝 역 목록}. 공통 구간은 여러 branch에 중복해서 들어간다
+    - 방향은 branch 순서 기준 FORWARD/BACKWARD
+    """
+
+    def __init__(self, name: str, branches: dict[str, list[str]]):
+        if not branches:
+            raise ValueError(f"Line {name!r} has no branches")
+        self.name = name
+        self.branches: dict[str, tuple[str, ...]] = {}
+        self._pos: dict[str, dict[str, int]] = {}
+        for branch, stations in branches.items():
+            order = tuple(norm_station(s) for s in stations)
+            if len(set(order)) != len(order):
+                raise ValueError(f"Duplicate station in {name}/{branch}")
+            self.branches[branch] = order
+            self._pos[branch] = {s: i for i, s in enumerate(order)}
+
+    @classmethod
+    def from_dict(cls, name: str, spec: dict) -> "LineGraph":
+        """
+        spec = {"branches": {branch명: [역, ...]}}
+        - 첫 branch가 아닌 목록이 앞선 branch의 역(분기역)으로 시작하면, 그 branch의 분기역 앞부분을 이어 붙인다
+        """
+        resolved: dict[str, list[str]] = {}
+        for branch, stations in spec.get("branches", {}).items():
+            stations = list(stations)
+            if stations:
+                fork = norm_station(stations[0])
+                for prev in resolved.values():
+                    normed = [norm_station(s) for s in prev]
+                    if fork in normed:
+                        stations = prev[: normed.index(fork)] + stations
+                        break
+            resolved[branch] = stations
+        return cls(name, resolved)
+
+    def __contains__(self, station: str) -> bool:
+        s = norm_station(station)
+        return any(s in pos for pos in self._pos.values())
+
+    def position(self, branch: str, station: str) -> int | None:
+        return self._pos[branch].get(norm_station(station))
+
+    def branches_with(self, *stations: str) -> list[str]:
+        """주어진 역을 모두 지나는 branch들"""
+        names = [norm_station(s) for s in stations]
+        return [b for b, pos in self._pos.items() if all(n in pos for n in names)]
+
+
+def load_line_graphs(path: Path | str | None = None) -> dict[str, LineGraph]:
+    """
+    노선 데이터 파일(JSON) -> {노선명: LineGraph}. 기본은 app/adapters/data/subway_lines.json
+    """
+    with Path(path or DEFAULT_LINES_PATH).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: LineGraph.from_dict(name, spec) for name, spec in data.get("lines", {}).items()}
+
+
+@lru_cache(maxsize=None)
+def default_line_graphs() -> dict[str, LineGraph]:
+    return load_line_graphs()
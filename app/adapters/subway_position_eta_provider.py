@@ -0,0 +1,377 @@
+import asyncio
+import math
+import os
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from typing import NamedTuple
+from urllib.parse import quote
+
+import httpx
+import requests
+
+from app.adapters.seoul_subway_eta_provider import SEOUL_SUBWAY_BASE_URL, check_seoul_response
+from app.adapters.subway_line_graph import (
+    BACKWARD,
+    FORWARD,
+    LineGraph,
+    default_line_graphs,
+    norm_station,
+)
+from app.adapters.subway_travel_model import TravelTimeTable, cumulative_minutes, default_travel_tables
+
+
+def _parse_dt(s: str) -> datetime | None:
+    s = (s or "").strip()
+    if not s:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y%m%d%H%M%S"):
+        try:
+            return datetime.strptime(s, fmt)
+        except Exception:
+            pass
+    return None
+
+
+class _TrainPosition(NamedTuple):
+    # 위치는 진행 방향 기준(branch 순서 x 방향)이라 "앞으로 간다" = 값이 커진다
+    cur: int
+    term: int
+    recpt_ts: float | None     # 수신 시각(timestamp), 없으면 None
+
+
+class _Lane:
+    """(branch, 방향) 하나의 열차들. 진행 방향 기준 현재 위치로 정렬"""
+
+    __slots__ = ("trains", "_cur_keys")
+
+    def __init__(self, trains: list[_TrainPosition]):
+        self.trains = sorted(trains, key=lambda t: t.cur)
+        self._cur_keys = [t.cur for t in self.trains]
+
+    def at_or_before(self, cur: int) -> list[_TrainPosition]:
+        """아직 cur를 지나치지 않은 열차들"""
+        return self.trains[: bisect_right(self._cur_keys, cur)]
+
+
+class _PositionIndex:
+    """
+    realtimePosition 1회 응답을 파싱/정규화해 (branch, 방향)별로 정렬해 둔 색인.
+    - fetch당 1번만 만들고, 역별 조회는 이진 탐색 slice로 끝낸다
+    """
+
+    def __init__(self, lanes: dict[tuple[str, int], _Lane], train_count: int):
+        self.lanes = lanes
+        self.train_count = train_count
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], graph: LineGraph) -> "_PositionIndex":
+        by_lane: dict[tuple[str, int], list[_TrainPosition]] = {}
+        train_count = 0
+        for x in rows:
+            cur = norm_station(x.get("statnNm", ""))
+            term = norm_station(x.get("statnTnm", ""))  # 종착역
+            branches = graph.branches_with(cur, term)
+            if not branches:
+                continue
+
+            recpt = _parse_dt(x.get("recptnDt") or x.get("lastRecptnDt") or "")
+            recpt_ts = recpt.timestamp() if recpt else None
+            train_count += 1
+
+            # 공통 구간 열차는 해당하는 모든 branch에 넣는다
+            for branch in branches:
+                cur_pos = graph.position(branch, cur)
+                term_pos = graph.position(branch, term)
+                direction = FORWARD if term_pos >= cur_pos else BACKWARD
+                by_lane.setdefault((branch, direction), []).append(
+                    _TrainPosition(cur_pos * direction, term_pos * direction, recpt_ts)
+                )
+
+        return cls({k: _Lane(v) for k, v in by_lane.items()}, train_count)
+
+    def __len__(self) -> int:
+        return self.train_count
+
+
+class PositionFeedCache:
+    """
+    노선별 최신 _PositionIndex를 provider 인스턴스끼리 공유한다.
+    - 같은 노선을 묻는 provider가 여럿이어도(역 x 방향) upstream fetch는 노선당 TTL마다 1번
+    - 빈 색인(운행 열차 없음)도 같은 TTL 동안 캐시한다
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, _PositionIndex]] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: dict[str, threading.Lock] = {}
+
+    def get(self, key: str, now_ts: float, ttl_sec: float) -> _PositionIndex | None:
+        hit = self._entries.get(key)
+        if hit is not None and (now_ts - hit[0]) <= ttl_sec:
+            return hit[1]
+        return None
+
+    def put(self, key: str, index: _PositionIndex, now_ts: float) -> None:
+        self._entries[key] = (now_ts, index)
+
+    def fetch_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+
+_default_feed = PositionFeedCache()
+
+
+def default_position_feed() -> PositionFeedCache:
+    return _default_feed
+
+
+class _PositionModel:
+    """
+    realtimePosition 요청 URL + 색인/ETA 계산(전송은 각 provider가 한다).
+    - 노선 구조(역 순서, 분기)는 LineGraph(데이터 파일)에서 읽는다
+    - 역간 소요시간은 학습된 TravelTimeTable이 있으면 그 값(정차 포함), 없으면 per_station_min + dwell_min
+    - 색인은 feed(PositionFeedCache)에 두고 provider끼리 공유한다
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        line_name: str = "수인분당선",
+        toward_station: str | None = None,
+        direction: int = FORWARD,
+        per_station_min: float = 2.0,
+        dwell_min: float = 0.5,
+        limit: int = 500,
+        cache_ttl_sec: int = 20,
+        base_url: str = SEOUL_SUBWAY_BASE_URL,
+        graph: LineGraph | None = None,
+        feed: PositionFeedCache | None = None,
+        travel_table: TravelTimeTable | None = None,
+    ):
+        key = api_key or os.environ.get("SEOUL_OPENAPI_KEY")
+        if not key:
+            raise ValueError("Missing SEOUL_OPENAPI_KEY")
+        self._key = key.strip()
+        self._line = line_name
+
+        if graph is None:
+            graph = default_line_graphs().get(line_name)
+            if graph is None:
+                raise ValueError(f"Unknown line: {line_name!r}")
+        self.graph = graph
+
+        if toward_station is not None and toward_station not in graph:
+            raise ValueError(f"Unknown toward_station: {toward_station!r}")
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError("direction must be FORWARD(1) or BACKWARD(-1)")
+        self._toward = toward_station
+        self._direction = direction
+
+        if travel_table is None:
+            travel_table = default_travel_tables().get(line_name)
+        # (branch, 방향) -> 위치별 누적 분. 열차 1대의 ETA는 두 값의 차이
+        self._cum = cumulative_minutes(graph, travel_table, per_station_min)
+        # 학습된 구간 시간은 정차를 이미 포함한다 -> 학습된 방향에는 dwell을 더하지 않는다
+        learned = travel_table.steps if travel_table is not None else {}
+        self._dwell = {lane: 0.0 if lane in learned else dwell_min for lane in self._cum}
+        self._limit = limit
+        self._ttl = cache_ttl_sec
+        self._base_url = base_url.rstrip("/")
+        self._feed = feed or default_position_feed()
+        self._feed_key = f"{self._base_url}|{self._line}"
+
+    def position_url(self) -> str:
+        return (
+            f"{self._base_url}/api/subway/{self._key}/json/"
+            f"realtimePosition/0/{self._limit}/{quote(self._line)}"
+        )
+
+    def cached_index(self, now_ts: float) -> _PositionIndex | None:
+        return self._feed.get(self._feed_key, now_ts, self._ttl)
+
+    def store_index(self, data: dict, now_ts: float) -> _PositionIndex:
+        idx = _PositionIndex.from_rows(data.get("realtimePositionList") or [], self.graph)
+        self._feed.put(self._feed_key, idx, now_ts)
+        return idx
+
+    def parse(self, status_code: int, text: str, data_fn, now_ts: float) -> _PositionIndex:
+        data = check_seoul_response(status_code, text, data_fn, "realtimePosition", "realtimePosition")
+        return self.store_index(data, now_ts)
+
+    def fetch_lock(self) -> threading.Lock:
+        return self._feed.fetch_lock(self._feed_key)
+
+    def lane_queries(
+        self, stop: str, toward: str | None, direction: int | None
+    ) -> list[tuple[tuple[str, int], int, int]]:
+        """
+        (stop, toward, direction) -> [(lane key, target 위치, 종착역 최소 위치)] (진행 방향 기준 위치)
+        - toward가 stop과 다르면 방향은 stop -> toward, 아니면 direction(기본: 생성 시 direction)
+        - toward까지 가는 열차만(종착역이 toward 이후) 센다
+        """
+        toward = toward if toward is not None else self._toward
+        if toward is not None and norm_station(toward) == norm_station(stop):
+            toward = None
+
+        stations = (stop, toward) if toward is not None else (stop,)
+        queries = []
+        for branch in self.graph.branches_with(*stations):
+            t_pos = self.graph.position(branch, stop)
+            if toward is not None:
+                w_pos = self.graph.position(branch, toward)
+                d = direction or (FORWARD if w_pos > t_pos else BACKWARD)
+            else:
+                w_pos = t_pos
+                d = direction or self._direction
+            queries.append(((branch, d), t_pos * d, w_pos * d))
+        return queries
+
+    def arrivals_from_index(
+        self,
+        index: _PositionIndex,
+        queries: list[tuple[tuple[str, int], int, int]],
+        max_results: int,
+        now: datetime,
+    ) -> list[int]:
+        now_ts = now.timestamp()
+        etas: set[int] = set()
+
+        for lane_key, t_cur, min_term in queries:
+            lane = index.lanes.get(lane_key)
+            if lane is None:
+                continue
+
+            d = lane_key[1]
+            cum = self._cum[lane_key]
+            dwell = self._dwell[lane_key]
+            t_travel = cum[t_cur * d]
+
+            # 아직 target을 지나치지 않은 열차 중 toward까지 가는 것만
+            for t in lane.at_or_before(t_cur):
+                if t.term < min_term:
+                    continue
+
+                age_min = 0.0
+                if t.recpt_ts is not None:
+                    age_min = max(0.0, (now_ts - t.recpt_ts) / 60.0)
+
+                eta = (t_travel - cum[t.cur * d]) + dwell
+                eta = max(0.0, eta - age_min)
+
+                etas.add(int(math.ceil(eta)))
+
+        return sorted(etas)[:max_results]
+
+
+class SubwayPositionEtaProvider:
+    """
+    서울 realtimePosition(열차 위치)로 '특정 역까지 다음 열차 도착(분)'을 추정한다.
+    - 노선 fetch 1번으로 어느 역, 어느 방향이든 조회
+    - 정확한 ETA API가 없을 때 쓰는 우회로(추정치)
+    - kwargs: _PositionModel 인자(line_name, toward_station, direction, travel_table, ...)
+    """
+    name = "seoul_subway_pos"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        timeout_sec: int = 10,
+        session: requests.Session | None = None,
+        **kwargs,
+    ):
+        self._model = _PositionModel(api_key=api_key, **kwargs)
+        self._timeout = timeout_sec
+        self._session = session or requests.Session()
+
+    @property
+    def graph(self) -> LineGraph:
+        return self._model.graph
+
+    def _fetch_index(self) -> _PositionIndex:
+        now_ts = datetime.now().timestamp()
+        cached = self._model.cached_index(now_ts)
+        if cached is not None:
+            return cached
+
+        # 같은 노선을 동시에 물으면 1번만 fetch하고 나머지는 캐시를 읽는다
+        with self._model.fetch_lock():
+            cached = self._model.cached_index(now_ts)
+            if cached is not None:
+                return cached
+
+            r = self._session.get(self._model.position_url(), timeout=self._timeout)
+            return self._model.parse(r.status_code, r.text, r.json, now_ts)
+
+    def get_next_arrivals(
+        self,
+        stop: str,
+        max_results: int = 3,
+        toward: str | None = None,
+        direction: int | None = None,
+    ) -> list[int]:
+        queries = self._model.lane_queries(stop, toward, direction)
+        if not queries:
+            return []
+
+        now = datetime.now()
+        index = self._fetch_index()
+        return self._model.arrivals_from_index(index, queries, max_results, now)
+
+    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        arr = self.get_next_arrivals(stop, max_results=1)
+        return arr[0] if arr else None
+
+
+class AsyncSubwayPositionEtaProvider:
+    """
+    SubwayPositionEtaProvider의 async 버전(공유 httpx.AsyncClient 사용, 색인/ETA 계산은 _PositionModel 공유).
+    - 여러 역을 동시에 물어도 realtimePosition fetch는 캐시 TTL당 1번
+    """
+    name = "seoul_subway_pos"
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_key: str | None = None,
+        timeout_sec: int = 10,
+        **kwargs,
+    ):
+        self._model = _PositionModel(api_key=api_key, **kwargs)
+        self._timeout = timeout_sec
+        self._client = client
+        self._fetch_lock = asyncio.Lock()
+
+    @property
+    def graph(self) -> LineGraph:
+        return self._model.graph
+
+    async def _fetch_index(self) -> _PositionIndex:
+        async with self._fetch_lock:
+            now_ts = datetime.now().timestamp()
+            cached = self._model.cached_index(now_ts)
+            if cached is not None:
+                return cached
+
+            r = await self._client.get(self._model.position_url(), timeout=self._timeout)
+            return self._model.parse(r.status_code, r.text, r.json, now_ts)
+
+    async def get_next_arrivals(
+        self,
+        stop: str,
+        max_results: int = 3,
+        toward: str | None = None,
+        direction: int | None = None,
+    ) -> list[int]:
+        queries = self._model.lane_queries(stop, toward, direction)
+        if not queries:
+            return []
+
+        now = datetime.now()
+        index = await self._fetch_index()
+        return self._model.arrivals_from_index(index, queries, max_results, now)
+
+    async def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        arr = await self.get_next_arrivals(stop, max_results=1)
+        return arr[0] if arr else None
@@ -0,0 +1,151 @@
+import json
+import os
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from app.adapters.subway_line_graph import BACKWARD, FORWARD, LineGraph, norm_station
+
+DEFAULT_TRAVEL_TABLE_PATH = Path(__file__).parent / "data" / "subway_travel_times.json"
+
+# 같은 열차의 두 관측 사이가 이보다 벌어지면 다른 운행으로 본다
+MAX_STEP_GAP_MIN = 15.0
+
+
+@dataclass
+class TravelTimeTable:
+    """
+    노선 1개의 학습된 역간 소요시간(분).
+    - steps[(branch, 방향)][i]: 위치 i <-> i+1 구간의 "도착 -> 다음 역 도착" 시간(정차 포함). None이면 미학습
+    - 두 방향 모두 낮은 위치 기준 index(i)로 저장
+    """
+    line: str
+    steps: dict[tuple[str, int], list[float | None]] = field(default_factory=dict)
+    samples: dict[tuple[str, int], list[int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "lanes": {
+                f"{branch}:{d}": {"steps": steps, "samples": self.samples.get((branch, d), [])}
+                for (branch, d), steps in self.steps.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, line: str, spec: dict) -> "TravelTimeTable":
+        table = cls(line)
+        for key, lane in spec.get("lanes", {}).items():
+            branch, d = key.rsplit(":", 1)
+            lane_key = (branch, int(d))
+            table.steps[lane_key] = [None if v is None else float(v) for v in lane.get("steps", [])]
+            table.samples[lane_key] = [int(v) for v in lane.get("samples", [])]
+        return table
+
+
+def load_travel_tables(path: Path | str | None = None) -> dict[str, TravelTimeTable]:
+    """
+    {노선명: TravelTimeTable}. 기본 경로는 SUBWAY_TRAVEL_TABLE 또는 data/subway_travel_times.json
+    - 파일이 없으면 빈 dict(-> provider는 상수 per_station_min 사용)
+    """
+    path = Path(path or os.environ.get("SUBWAY_TRAVEL_TABLE") or DEFAULT_TRAVEL_TABLE_PATH)
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {line: TravelTimeTable.from_dict(line, spec) for line, spec in data.get("lines", {}).items()}
+
+
+@lru_cache(maxsize=None)
+def default_travel_tables() -> dict[str, TravelTimeTable]:
+    return load_travel_tables()
+
+
+def save_travel_tables(path: Path | str, tables: dict[str, TravelTimeTable]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"version": 1, "lines": {line: t.to_dict() for line, t in tables.items()}}
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+def cumulative_minutes(
+    graph: LineGraph,
+    table: TravelTimeTable | None,
+    per_station_min: float,
+) -> dict[tuple[str, int], list[float]]:
+    """
+    (branch, 방향) -> 위치별 누적 소요시간 배열.
+    - 현재 위치 cur에서 target까지 = cum[target] - cum[cur] (O(1))
+    - 학습되지 않은 구간은 per_station_min
+    """
+    out: dict[tuple[str, int], list[float]] = {}
+    for branch, stations in graph.branches.items():
+        n = len(stations)
+        for d in (FORWARD, BACKWARD):
+            learned = table.steps.get((branch, d), []) if table else []
+            steps = [
+                learned[i] if i < len(learned) and learned[i] is not None else per_station_min
+                for i in range(n - 1)
+            ]
+
+            cum = [0.0] * n
+            if d == FORWARD:
+                for i in range(1, n):
+                    cum[i] = cum[i - 1] + steps[i - 1]
+            else:
+                # 역방향은 뒤에서부터 누적(위치가 작을수록 값이 크다)
+                for i in range(n - 2, -1, -1):
+                    cum[i] = cum[i + 1] + steps[i]
+            out[(branch, d)] = cum
+    return out
+
+
+def _visits(observations: list[tuple[datetime, str]]) -> list[tuple[datetime, str]]:
+    """시간순 (시각, 역) 관측 -> 역이 바뀐 시점(=그 역 첫 관측)만 남긴다"""
+    visits: list[tuple[datetime, str]] = []
+    for ts, station in observations:
+        if not visits or visits[-1][1] != station:
+            visits.append((ts, station))
+    return visits
+
+
+def fit_travel_table(
+    graph: LineGraph,
+    trains: dict[str, list[tuple[datetime, str]]],
+    min_samples: int = 3,
+) -> TravelTimeTable:
+    """
+    열차별 위치 관측 -> 구간별 소요시간(중앙값).
+    - 인접한 두 역의 첫 관측 시각 차이 = 도착 -> 다음 역 도착(정차 포함)
+    - 샘플링 간격 때문에 개별 값은 흔들리지만, 양쪽 모두 같은 편향이라 중앙값은 안정적
+    """
+    durations: dict[tuple[str, int, int], list[float]] = {}
+
+    for observations in trains.values():
+        visits = _visits(sorted((ts, norm_station(s)) for ts, s in observations))
+        for (t_a, a), (t_b, b) in zip(visits, visits[1:]):
+            minutes = (t_b - t_a).total_seconds() / 60.0
+            if minutes <= 0 or minutes > MAX_STEP_GAP_MIN:
+                continue
+            for branch in graph.branches_with(a, b):
+                pa, pb = graph.position(branch, a), graph.position(branch, b)
+                if abs(pa - pb) != 1:
+                    continue
+                d = FORWARD if pb > pa else BACKWARD
+                durations.setdefault((branch, d, min(pa, pb)), []).append(minutes)
+
+    table = TravelTimeTable(graph.name)
+    for branch, stations in graph.branches.items():
+        for d in (FORWARD, BACKWARD):
+            steps: list[float | None] = []
+            samples: list[int] = []
+            for i in range(len(stations) - 1):
+                values = durations.get((branch, d, i), [])
+                samples.append(len(values))
+                steps.append(round(statistics.median(values), 2) if len(values) >= min_samples else None)
+            if any(v is not None for v in steps):
+                table.steps[(branch, d)] = steps
+                table.samples[(branch, d)] = samples
+    return table
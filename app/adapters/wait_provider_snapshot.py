@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Callable
 
-from app.adapters.gbis_bus_eta_provider import GbisBusEtaProvider
-from app.adapters.suin_bundang_position_eta_provider import SuinBundangPositionEtaProvider
+from app.adapters.gbis_bus_eta_provider import AsyncGbisBusEtaProvider, GbisBusEtaProvider
+from app.adapters.suin_bundang_position_eta_provider import (
+    AsyncSuinBundangPositionEtaProvider,
+    SuinBundangPositionEtaProvider,
+)
+from app.services.decision_engine import DepartureSchedule
 
 MINUTES_PER_DAY = 24 * 60
 TIME_FMT = "%H:%M"
@@ -20,12 +27,7 @@ def _now_minutes(now: datetime) -> int:
     return now.hour * 60 + now.minute
 
 
-def _delta_from_now(now_min: int, target_hhmm: str) -> int:
-    target = _hhmm_to_minutes(target_hhmm)
-    return (target - now_min) % MINUTES_PER_DAY
-
-
-def _norm_stop(stop: str) -> str:
+def norm_stop(stop: str) -> str:
     s = stop.strip()
     if s.isdigit():
         return s
@@ -42,12 +44,23 @@ class WaitSnapshot:
     now: datetime
     arrivals_after_now: dict[tuple[str, str], list[int]]  # key=(stop,route) -> [etaMin1, etaMin2,...]
     max_wait_by_route: dict[str, int]
-
-    def wait(self, stop: str, route: str, time_hhmm: str) -> int:
-        key = (_norm_stop(stop), route.strip())
+    sources: dict[tuple[str, str], str] = field(default_factory=dict)  # key -> 답한 ETA source(fallback chain)
+
+    @cached_property
+    def content_version(self) -> str:
+        """
+        계산 결과를 정하는 내용(now, ETA, max_wait)의 해시.
+        프로세스/재시작과 무관하게 같은 내용이면 같은 값(ETag 등 외부에 보이는 버전용).
+        """
+        parts = [self.now.isoformat(timespec="minutes")]
+        parts += [f"{stop}\x1f{route}\x1f{','.join(map(str, etas))}" for (stop, route), etas in sorted(self.arrivals_after_now.items())]
+        parts += [f"{route}\x1f{w}" for route, w in sorted(self.max_wait_by_route.items())]
+        return hashlib.blake2b("\x1e".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+    def wait_minutes(self, stop: str, route: str, minute_of_day: int) -> int:
+        key = (norm_stop(stop), route.strip())
         etas = self.arrivals_after_now.get(key, [])
-        now_min = _now_minutes(self.now)
-        delta = _delta_from_now(now_min, time_hhmm)
+        delta = (minute_of_day - _now_minutes(self.now)) % MINUTES_PER_DAY
 
         # delta 시각에 도착했을 때, 아직 안 지난 열차(eta >= delta)가 있으면 그 차이가 wait
         candidates = [eta - delta for eta in etas if eta >= delta]
@@ -57,6 +70,60 @@ class WaitSnapshot:
         # 없으면: 아직 배차/열차 정보를 모름(또는 운행 종료) -> 보수적으로 max_wait
         return self.max_wait_by_route.get(route.strip(), 0)
 
+    def with_aliases(self, aliases: dict[tuple[str, str], tuple[str, str]]) -> WaitSnapshot:
+        """
+        다른 이름의 (stop, route) 키로도 같은 ETA를 조회할 수 있는 새 스냅샷을 만든다.
+        - aliases: {(별칭 stop, 별칭 route): (원래 stop, 원래 route)}
+        """
+        arrivals = dict(self.arrivals_after_now)
+        sources = dict(self.sources)
+        for (stop, route), (src_stop, src_route) in aliases.items():
+            src_key = (norm_stop(src_stop), src_route.strip())
+            etas = self.arrivals_after_now.get(src_key)
+            if etas is not None:
+                arrivals[(norm_stop(stop), route.strip())] = etas
+            if src_key in self.sources:
+                sources[(norm_stop(stop), route.strip())] = self.sources[src_key]
+        return WaitSnapshot(
+            now=self.now,
+            arrivals_after_now=arrivals,
+            max_wait_by_route=self.max_wait_by_route,
+            sources=sources,
+        )
+
+    def wait(self, stop: str, route: str, time_hhmm: str) -> int:
+        return self.wait_minutes(stop, route, _hhmm_to_minutes(time_hhmm))
+
+    def __call__(self, stop: str, route: str, time_hhmm: str) -> int:
+        return self.wait(stop, route, time_hhmm)
+
+    def departure_schedule(self, stop: str, route: str) -> DepartureSchedule | None:
+        key = (norm_stop(stop), route.strip())
+        etas = self.arrivals_after_now.get(key, [])
+        max_wait = self.max_wait_by_route.get(route.strip(), 0)
+
+        # 하루 주기 시각표로 표현할 수 없는 값이면 분 단위 탐색에 맡긴다
+        if max_wait < 0 or any(eta < 0 or eta >= MINUTES_PER_DAY for eta in etas):
+            return None
+
+        now_min = _now_minutes(self.now)
+        if not etas:
+            return DepartureSchedule(
+                departures=(),
+                fallback_wait_min=max_wait,
+                fallback_start=now_min,
+                fallback_len=MINUTES_PER_DAY,
+            )
+
+        # now ~ now+마지막ETA 구간은 알려진 열차/버스, 그 뒤는 max_wait
+        last_eta = max(etas)
+        return DepartureSchedule(
+            departures=tuple(sorted({(now_min + eta) % MINUTES_PER_DAY for eta in etas})),
+            fallback_wait_min=max_wait,
+            fallback_start=(now_min + last_eta + 1) % MINUTES_PER_DAY,
+            fallback_len=MINUTES_PER_DAY - last_eta - 1,
+        )
+
 
 def build_wait_provider_snapshot(
     now: datetime,
@@ -65,22 +132,65 @@ def build_wait_provider_snapshot(
     bus_stops: list[tuple[str, str]],
     subway_stops: list[tuple[str, str]],
     max_wait_by_route: dict[str, int],
-) -> WaitProvider:
+) -> WaitSnapshot:
     arrivals: dict[tuple[str, str], list[int]] = {}
 
-    # 버스: (정류장ID, 노선)별 "다음 도착" 1개만 스냅샷
+    # 버스: 정류소당 1번 호출로 모든 노선을 받고, (정류장ID, 노선)별 알려진 도착(predictTime1/2)을 모두 스냅샷
     if bus_provider:
+        by_station: dict[str, dict[str, list[int]]] = {}
         for stop, route in bus_stops:
-            eta = bus_provider.get_eta_minutes(stop, route)
-            if eta is not None:
-                arrivals[(_norm_stop(stop), route.strip())] = [int(eta)]
+            if stop not in by_station:
+                by_station[stop] = bus_provider.get_station_arrivals(stop)
+            times = by_station[stop].get(route.strip())
+            if times:
+                arrivals[(norm_stop(stop), route.strip())] = [int(x) for x in times]
 
     # 지하철(수인분당선): 위치기반으로 next 3개까지 스냅샷
     if subway_provider:
         for stop, route in subway_stops:
             etas = subway_provider.get_next_arrivals(stop, max_results=3)
             if etas:
-                arrivals[(_norm_stop(stop), route.strip())] = [int(x) for x in etas]
+                arrivals[(norm_stop(stop), route.strip())] = [int(x) for x in etas]
+
+    # WaitSnapshot 자체가 wait_provider(호출 가능 + 출발 시각표 제공)
+    return WaitSnapshot(now=now, arrivals_after_now=arrivals, max_wait_by_route=max_wait_by_route)
+
+
+async def build_wait_provider_snapshot_async(
+    now: datetime,
+    bus_provider: AsyncGbisBusEtaProvider | None,
+    subway_provider: AsyncSuinBundangPositionEtaProvider | None,
+    bus_stops: list[tuple[str, str]],
+    subway_stops: list[tuple[str, str]],
+    max_wait_by_route: dict[str, int],
+) -> WaitSnapshot:
+    """
+    build_wait_provider_snapshot의 async 버전.
+    - 모든 버스/지하철 정류장을 동시에 조회 -> 지연시간은 합이 아니라 가장 느린 호출 수준
+    """
+
+    async def subway_etas(stop: str, route: str) -> list[int]:
+        etas = await subway_provider.get_next_arrivals(stop, max_results=3)
+        return [int(x) for x in etas]
+
+    # 버스는 정류소 단위로 1번씩만 호출(여러 노선 fan-out)
+    stations = list(dict.fromkeys(stop for stop, _ in bus_stops)) if bus_provider else []
+    subway_keys = list(subway_stops) if subway_provider else []
+
+    results = await asyncio.gather(
+        *(bus_provider.get_station_arrivals(stop) for stop in stations),
+        *(subway_etas(stop, route) for stop, route in subway_keys),
+    )
+    by_station = dict(zip(stations, results[: len(stations)]))
 
-    snap = WaitSnapshot(now=now, arrivals_after_now=arrivals, max_wait_by_route=max_wait_by_route)
-    return snap.wait
+    arrivals: dict[tuple[str, str], list[int]] = {}
+    if bus_provider:
+        for stop, route in bus_stops:
+            times = by_station[stop].get(route.strip())
+            if times:
+                arrivals[(norm_stop(stop), route.strip())] = [int(x) for x in times]
+    for (stop, route), etas in zip(subway_keys, results[len(stations):]):
+        if etas:
+            arrivals[(norm_stop(stop), route.strip())] = etas
+
+    return WaitSnapshot(now=now, arrivals_after_now=arrivals, max_wait_by_route=max_wait_by_route)
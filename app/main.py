@@ -1,14 +1,53 @@
-﻿from fastapi import FastAPI, HTTPException
+﻿import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.services.departure_stream import DepartureBroadcaster, sse_event
+from app.services.departure_table import DepartureTableCache
+from app.services.result_cache import CachedResult, ComputeResultCache, etag_matches
+from app.services.route_registry import DEFAULT_ROUTE_ID, SHARED_OWNER, RouteRegistry
+from app.services.snapshot_service import SnapshotService, create_live_snapshot_service
+from app.services.transit_graph import RideEdge, TransitGraph
 from app.services.decision_engine import (
     FIXED_ROUTE_SEGMENTS,
-    compute_departure_time,
-    parse_hhmm,
+    MINUTES_PER_DAY,
+    Board,
+    CompiledPlan,
+    Move,
+    compute_departure_profile,
+    hhmm_to_minutes,
+    minutes_to_hhmm,
 )
 
-app = FastAPI(title="Ontime Engine API")
+# Live ETA snapshot refreshed in the background (ONTIME_LIVE_SNAPSHOT=1).
+# Requests only read the latest snapshot, so upstream calls scale with the
+# refresh interval instead of request volume.
+snapshot_service: SnapshotService | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global snapshot_service
+    if os.environ.get("ONTIME_LIVE_SNAPSHOT", "0") == "1":
+        interval = float(os.environ.get("ONTIME_SNAPSHOT_INTERVAL_SEC", "30"))
+        snapshot_service = create_live_snapshot_service(interval_sec=interval)
+        snapshot_service.start()
+    try:
+        yield
+    finally:
+        if snapshot_service is not None:
+            snapshot_service.stop(timeout=5)
+            snapshot_service = None
+
+
+app = FastAPI(title="Ontime Engine API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,47 +60,458 @@ app.add_middleware(
 
 class ComputeRequest(BaseModel):
     destination_time: str
+    route_id: str = DEFAULT_ROUTE_ID
 
 
 class ComputeResponse(BaseModel):
     recommended_departure_time: str
 
 
-def wait_provider_stub(stop: str, route: str, time_hhmm: str) -> int:
-    # Headway-based fallback to avoid zero-wait unrealistic results.
-    headway_by_route = {
+class ComputeBatchRequest(BaseModel):
+    # destination_times 목록 또는 (start_time, end_time, step_min) 범위 중 하나
+    destination_times: list[str] | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+    step_min: int = 1
+    route_id: str = DEFAULT_ROUTE_ID
+
+
+class ComputeBatchItem(BaseModel):
+    destination_time: str
+    recommended_departure_time: str
+
+
+class ComputeBatchResponse(BaseModel):
+    results: list[ComputeBatchItem]
+
+
+class ComputeProfileRequest(BaseModel):
+    # end_time < start_time 이면 자정을 넘어가는 범위
+    start_time: str
+    end_time: str
+    route_id: str = DEFAULT_ROUTE_ID
+
+
+class ComputeProfileStep(BaseModel):
+    # start_time~end_time(양끝 포함) 도착 목표는 모두 같은 출발
+    start_time: str
+    end_time: str
+    recommended_departure_time: str | None
+    error: str | None = None
+
+
+class ComputeProfileResponse(BaseModel):
+    steps: list[ComputeProfileStep]
+
+
+class ComputeJourneyRequest(BaseModel):
+    # route_ids 경로들을 대안으로 합쳐(같은 이름 정류장에서 환승 가능) 가장 늦게 출발해도 되는 여정을 고른다
+    destination_time: str
+    route_ids: list[str] = [DEFAULT_ROUTE_ID]
+
+
+class ComputeJourneyLeg(BaseModel):
+    type: Literal["walk", "ride"]
+    from_stop: str
+    to_stop: str
+    route: str | None = None
+    minutes: int
+    leave_by: str
+    arrive_by: str
+
+
+class ComputeJourneyResponse(BaseModel):
+    recommended_departure_time: str
+    legs: list[ComputeJourneyLeg]
+
+
+class RouteSegment(BaseModel):
+    # {"type": "move", "minutes": 8} 또는 {"type": "board", "stop": "...", "route": "..."}
+    type: Literal["move", "board"]
+    minutes: int | None = None
+    stop: str | None = None
+    route: str | None = None
+
+
+class RouteDefinition(BaseModel):
+    segments: list[RouteSegment]
+
+
+class RouteInfo(BaseModel):
+    route_id: str
+    segments: list[RouteSegment]
+
+
+MAX_BATCH_ITEMS = MINUTES_PER_DAY
+MAX_ROUTE_SEGMENTS = 64
+MAX_JOURNEY_ROUTES = 16
+MAX_USER_ID_LEN = 64
+# 클라이언트/프록시는 이 시간 뒤 ETag로 재검증(304)한다
+COMPUTE_CACHE_CONTROL = "public, max-age=5, must-revalidate"
+# SSE 연결이 프록시에서 끊기지 않게 보내는 주석 줄 간격
+STREAM_KEEPALIVE_SEC = 15.0
+
+
+# Headway-based fallback to avoid zero-wait unrealistic results.
+wait_provider_stub = HeadwayWaitProvider(
+    headway_by_route={
         "subway_suin": 8,
         "bus_5100": 12,
         "bus_51": 10,
-    }
-    headway = headway_by_route.get(route, 8)
+    },
+    default_headway=8,
+)
 
-    minutes = int(time_hhmm.split(":")[1])
-    return (headway - (minutes % headway)) % headway
+# For a fixed wait provider (stub or one published snapshot) the answer depends
+# only on minute of day -> serve from a 1440-entry table built on first use
+# (rebuilt when route/provider changes, i.e. on every new snapshot).
+departure_tables = DepartureTableCache()
 
+# (사용자, route_id) -> Move/Board 정의 + 컴파일된 계획(LRU). "default"는 모두가 같이 쓰는 고정 경로(수정 불가)
+route_registry = RouteRegistry()
+route_registry.register(DEFAULT_ROUTE_ID, FIXED_ROUTE_SEGMENTS)
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+# (경로, 목표 도착 분, 스냅샷 버전) -> 결과. 새 스냅샷이 발행되면 비워진다
+compute_results = ComputeResultCache()
 
 
-@app.post("/compute", response_model=ComputeResponse)
-def compute(req: ComputeRequest) -> ComputeResponse:
+def current_wait_provider_versioned():
+    """
+    (버전 태그, wait_provider). 스냅샷이면 "s<내용 해시>", 없으면 "h<배차간격 설정 해시>".
+    - 태그는 ETag에 들어가므로 프로세스 안 발행 번호가 아니라 내용으로 만든다
+      (워커/재시작이 달라도 같은 태그 = 같은 결과)
+    """
+    published = snapshot_service.current_versioned() if snapshot_service is not None else None
+    if published is not None:
+        return f"s{published[1].content_version}", published[1]
+    return f"h{wait_provider_stub.content_version}", wait_provider_stub
+
+
+def current_wait_provider():
+    return current_wait_provider_versioned()[1]
+
+
+def _parse_hhmm_or_422(value: str, field: str) -> int:
     try:
-        parse_hhmm(req.destination_time)
+        return hhmm_to_minutes(value)
     except Exception:
         raise HTTPException(
             status_code=422,
-            detail="destination_time must be in HH:MM format (e.g., '10:00')",
+            detail=f"{field} must be in HH:MM format (e.g., '10:00')",
         )
 
+
+def _caller_id(x_user_id: str | None = Header(default=None)) -> str:
+    """
+    X-User-Id 헤더: 경로 이름공간을 고르는 호출자 id(인증은 아님).
+    - 없으면 공용 이름공간
+    """
+    if x_user_id is None:
+        return SHARED_OWNER
+    user = x_user_id.strip()
+    if not user or len(user) > MAX_USER_ID_LEN:
+        raise HTTPException(status_code=422, detail=f"X-User-Id must have 1..{MAX_USER_ID_LEN} characters")
+    return user
+
+
+def _route_owner(user: str, route_id: str) -> str:
+    # 기본 경로는 누가 불러도 같은 공용 경로
+    return SHARED_OWNER if route_id == DEFAULT_ROUTE_ID else user
+
+
+def _route_plan_or_404(user: str, route_id: str) -> CompiledPlan:
+    try:
+        return route_registry.plan(route_id, owner=_route_owner(user, route_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown route_id: {route_id!r}")
+
+
+def _route_segments_or_404(user: str, route_id: str) -> list[Move | Board]:
     try:
-        departure = compute_departure_time(
-            destination_time=req.destination_time,
-            segments=FIXED_ROUTE_SEGMENTS,
-            wait_provider=wait_provider_stub,
+        return route_registry.segments(route_id, owner=_route_owner(user, route_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown route_id: {route_id!r}")
+
+
+def _cached_compute(user: str, route_id: str, destination_min: int) -> CachedResult:
+    plan = _route_plan_or_404(user, route_id)
+    version, provider = current_wait_provider_versioned()
+    return compute_results.get(
+        plan.fingerprint,
+        version,
+        destination_min,
+        lambda: departure_tables.get(plan, provider).lookup(destination_min),
+    )
+
+
+def _compute_response(result: CachedResult, response: Response) -> ComputeResponse:
+    if result.error is not None:
+        raise HTTPException(status_code=400, detail=result.error)
+    response.headers["ETag"] = result.etag
+    response.headers["Cache-Control"] = COMPUTE_CACHE_CONTROL
+    return ComputeResponse(recommended_departure_time=minutes_to_hhmm(result.departure_min))
+
+
+def _stream_payload(key: tuple[str, str, int]) -> dict:
+    user, route_id, destination_min = key
+    version = current_wait_provider_versioned()[0]
+    payload = {
+        "route_id": route_id,
+        "destination_time": minutes_to_hhmm(destination_min),
+        "recommended_departure_time": None,
+        "error": None,
+        "version": version,
+    }
+    try:
+        result = _cached_compute(user, route_id, destination_min)
+    except HTTPException as err:
+        payload["error"] = err.detail
+        return payload
+    if result.error is not None:
+        payload["error"] = result.error
+    else:
+        payload["recommended_departure_time"] = minutes_to_hhmm(result.departure_min)
+    return payload
+
+
+# /compute/stream 구독 허브: 스냅샷(또는 경로 정의)이 바뀔 때마다 (사용자, route_id, 목표 도착 분) 키당 1번 계산,
+# 권장 출발이 바뀐 키의 구독자에게만 push
+departure_stream = DepartureBroadcaster(
+    compute=_stream_payload,
+    version=lambda: (current_wait_provider_versioned()[0], route_registry.revision),
+)
+
+
+def _segments_from_definition(req: RouteDefinition) -> list[Move | Board]:
+    if not req.segments or len(req.segments) > MAX_ROUTE_SEGMENTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"segments must have 1..{MAX_ROUTE_SEGMENTS} items",
+        )
+    segments: list[Move | Board] = []
+    for i, seg in enumerate(req.segments):
+        if seg.type == "move":
+            if seg.minutes is None:
+                raise HTTPException(status_code=422, detail=f"segments[{i}]: move needs minutes")
+            segments.append(Move(seg.minutes))
+        else:
+            if not seg.stop or not seg.route:
+                raise HTTPException(status_code=422, detail=f"segments[{i}]: board needs stop and route")
+            segments.append(Board(stop=seg.stop, route=seg.route))
+    return segments
+
+
+def _route_info(route_id: str, segments: list[Move | Board]) -> RouteInfo:
+    return RouteInfo(
+        route_id=route_id,
+        segments=[
+            RouteSegment(type="move", minutes=seg.minutes)
+            if isinstance(seg, Move)
+            else RouteSegment(type="board", stop=seg.stop, route=seg.route)
+            for seg in segments
+        ],
+    )
+
+
+def _batch_destination_minutes(req: ComputeBatchRequest) -> list[int]:
+    if req.destination_times is not None:
+        if req.start_time is not None or req.end_time is not None:
+            raise HTTPException(
+                status_code=422,
+                detail="Use either destination_times or start_time/end_time, not both",
+            )
+        minutes = [_parse_hhmm_or_422(t, "destination_times") for t in req.destination_times]
+
+    else:
+        if req.start_time is None or req.end_time is None:
+            raise HTTPException(
+                status_code=422,
+                detail="destination_times or both start_time and end_time are required",
+            )
+        if req.step_min <= 0:
+            raise HTTPException(status_code=422, detail="step_min must be > 0")
+
+        start = _parse_hhmm_or_422(req.start_time, "start_time")
+        end = _parse_hhmm_or_422(req.end_time, "end_time")
+        # end < start 이면 자정을 넘어가는 범위로 본다
+        span = (end - start) % MINUTES_PER_DAY
+        minutes = [start + d for d in range(0, span + 1, req.step_min)]
+
+    if len(minutes) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many destination times: {len(minutes)} > {MAX_BATCH_ITEMS}",
+        )
+    return minutes
+
+
+@app.get("/health")
+def health():
+    body = {"status": "ok"}
+    snap = snapshot_service.current() if snapshot_service is not None else None
+    if snap is not None:
+        # 실시간 스냅샷의 ETA를 어느 source가 답했는지(fallback chain)
+        body["eta_sources"] = {f"{stop}/{route}": source for (stop, route), source in snap.sources.items()}
+    return body
+
+
+@app.put("/routes/{route_id}", response_model=RouteInfo)
+def put_route(route_id: str, req: RouteDefinition, user: str = Depends(_caller_id)) -> RouteInfo:
+    if route_id == DEFAULT_ROUTE_ID:
+        raise HTTPException(status_code=409, detail=f"{DEFAULT_ROUTE_ID!r} route is read-only")
+    segments = _segments_from_definition(req)
+    try:
+        route_registry.register(route_id, segments, owner=user)
+    except (ValueError, TypeError) as err:
+        raise HTTPException(status_code=422, detail=str(err))
+    return _route_info(route_id, segments)
+
+
+@app.get("/routes/{route_id}", response_model=RouteInfo)
+def get_route(route_id: str, user: str = Depends(_caller_id)) -> RouteInfo:
+    return _route_info(route_id, _route_segments_or_404(user, route_id))
+
+
+@app.delete("/routes/{route_id}", status_code=204)
+def delete_route(route_id: str, user: str = Depends(_caller_id)) -> None:
+    if route_id == DEFAULT_ROUTE_ID:
+        raise HTTPException(status_code=409, detail=f"{DEFAULT_ROUTE_ID!r} route is read-only")
+    if not route_registry.remove(route_id, owner=user):
+        raise HTTPException(status_code=404, detail=f"Unknown route_id: {route_id!r}")
+
+
+@app.post("/compute", response_model=ComputeResponse)
+def compute(req: ComputeRequest, response: Response, user: str = Depends(_caller_id)) -> ComputeResponse:
+    destination_min = _parse_hhmm_or_422(req.destination_time, "destination_time")
+    return _compute_response(_cached_compute(user, req.route_id, destination_min), response)
+
+
+@app.get("/compute", response_model=ComputeResponse)
+def compute_get(
+    destination_time: str,
+    request: Request,
+    response: Response,
+    route_id: str = DEFAULT_ROUTE_ID,
+    user: str = Depends(_caller_id),
+):
+    # polling 클라이언트용: 같은 스냅샷이면 If-None-Match로 304
+    destination_min = _parse_hhmm_or_422(destination_time, "destination_time")
+    result = _cached_compute(user, route_id, destination_min)
+    if result.error is None and etag_matches(request.headers.get("if-none-match"), result.etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": result.etag, "Cache-Control": COMPUTE_CACHE_CONTROL},
         )
+    return _compute_response(result, response)
+
+
+@app.post("/compute/batch", response_model=ComputeBatchResponse)
+def compute_batch(req: ComputeBatchRequest, user: str = Depends(_caller_id)) -> ComputeBatchResponse:
+    destination_mins = _batch_destination_minutes(req)
+
+    table = departure_tables.get(_route_plan_or_404(user, req.route_id), current_wait_provider())
+    try:
+        departures = [table.lookup(m) for m in destination_mins]
     except ValueError as err:
         raise HTTPException(status_code=400, detail=str(err))
 
-    return ComputeResponse(recommended_departure_time=departure)
+    return ComputeBatchResponse(
+        results=[
+            ComputeBatchItem(
+                destination_time=minutes_to_hhmm(dest),
+                recommended_departure_time=minutes_to_hhmm(dep),
+            )
+            for dest, dep in zip(destination_mins, departures)
+        ]
+    )
+
+
+@app.post("/compute/profile", response_model=ComputeProfileResponse)
+def compute_profile(req: ComputeProfileRequest, user: str = Depends(_caller_id)) -> ComputeProfileResponse:
+    start = _parse_hhmm_or_422(req.start_time, "start_time")
+    end = _parse_hhmm_or_422(req.end_time, "end_time")
+    span = (end - start) % MINUTES_PER_DAY
+    plan = _route_plan_or_404(user, req.route_id)
+
+    try:
+        steps = compute_departure_profile(start, start + span, plan, current_wait_provider())
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+    return ComputeProfileResponse(
+        steps=[
+            ComputeProfileStep(
+                start_time=minutes_to_hhmm(step.start_min),
+                end_time=minutes_to_hhmm(step.end_min),
+                recommended_departure_time=(
+                    None if step.departure_min is None else minutes_to_hhmm(step.departure_min)
+                ),
+                error=step.error,
+            )
+            for step in steps
+        ]
+    )
+
+
+@app.post("/compute/journey", response_model=ComputeJourneyResponse)
+def compute_journey(req: ComputeJourneyRequest, user: str = Depends(_caller_id)) -> ComputeJourneyResponse:
+    destination_min = _parse_hhmm_or_422(req.destination_time, "destination_time")
+    route_ids = list(dict.fromkeys(req.route_ids))
+    if not route_ids or len(route_ids) > MAX_JOURNEY_ROUTES:
+        raise HTTPException(status_code=422, detail=f"route_ids must have 1..{MAX_JOURNEY_ROUTES} items")
+    graph = TransitGraph.from_alternatives([_route_segments_or_404(user, rid) for rid in route_ids])
+
+    try:
+        journey = graph.search("origin", "destination", destination_min, current_wait_provider())
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+    return ComputeJourneyResponse(
+        recommended_departure_time=minutes_to_hhmm(journey.departure_min),
+        legs=[
+            ComputeJourneyLeg(
+                type="ride" if isinstance(leg.edge, RideEdge) else "walk",
+                from_stop=leg.edge.from_stop,
+                to_stop=leg.edge.to_stop,
+                route=leg.edge.route if isinstance(leg.edge, RideEdge) else None,
+                minutes=leg.edge.minutes,
+                leave_by=minutes_to_hhmm(leg.leave_by_min),
+                arrive_by=minutes_to_hhmm(leg.arrive_by_min),
+            )
+            for leg in journey.legs
+        ],
+    )
+
+
+@app.get("/compute/stream")
+async def compute_stream(
+    destination_time: str,
+    route_id: str = DEFAULT_ROUTE_ID,
+    user: str = Depends(_caller_id),
+):
+    """
+    Server-Sent Events. 연결 직후 현재 권장 출발을 1번 보내고,
+    새 스냅샷으로 권장 출발(또는 오류)이 바뀔 때만 다시 보낸다.
+    """
+    destination_min = _parse_hhmm_or_422(destination_time, "destination_time")
+    _route_plan_or_404(user, route_id)
+    key = (user, route_id, destination_min)
+
+    async def events():
+        queue = await departure_stream.subscribe(key)
+        try:
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(payload)
+        finally:
+            departure_stream.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
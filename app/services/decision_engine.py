@@ -1,11 +1,19 @@
-﻿from dataclasses import dataclass
+﻿import hashlib
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
-from typing import Callable
+from typing import Callable, Protocol, runtime_checkable
 
 TIME_FMT = "%H:%M"
 MINUTES_PER_DAY = 24 * 60
 
 
+class InfeasibleRouteError(ValueError):
+    """탐색 범위 안에서 제시간에 탈 수 있는 출발이 없다(입력 오류가 아님)."""
+
+
 def parse_hhmm(s: str) -> datetime:
     s = s.strip()
     return datetime.strptime(s, TIME_FMT)
@@ -37,6 +45,66 @@ class Board:
 WaitProvider = Callable[[str, str, str], int]
 
 
+@dataclass(frozen=True)
+class DepartureSchedule:
+    """
+    한 (정류장, 노선)의 하루 주기 출발 시각표.
+    - departures: 도착 즉시 탑승할 수 있는 분(0~1439), 오름차순
+    - fallback_*: 시각표로 모르는 구간(하루 주기). 이 구간에 도착하면 fallback_wait_min 대기
+    """
+    departures: tuple[int, ...]
+    fallback_wait_min: int = 0
+    fallback_start: int = 0
+    fallback_len: int = 0
+
+    def __post_init__(self):
+        if self.fallback_wait_min < 0:
+            raise ValueError(f"fallback_wait_min must be >= 0: {self.fallback_wait_min}")
+        if not 0 <= self.fallback_len <= MINUTES_PER_DAY:
+            raise ValueError(f"fallback_len must be within a day: {self.fallback_len}")
+        prev = -1
+        for d in self.departures:
+            if not prev < d < MINUTES_PER_DAY:
+                raise ValueError("departures must be sorted unique minutes of day")
+            prev = d
+
+
+@runtime_checkable
+class DepartureScheduleProvider(Protocol):
+    """
+    wait_provider가 선택적으로 구현하는 출발 시각표 인터페이스.
+    구현하면 엔진이 분 단위 탐색 대신 bisect로 가장 늦은 정류장 도착 시각을 찾는다.
+    None을 반환한 (stop, route)는 기존 분 단위 탐색으로 처리한다.
+    """
+
+    def departure_schedule(self, stop: str, route: str) -> DepartureSchedule | None:
+        ...
+
+
+@runtime_checkable
+class MinuteWaitProvider(Protocol):
+    """
+    wait_provider가 선택적으로 구현하는 분 단위 인터페이스.
+    - minute_of_day: 0~1439 정수 (HH:MM 문자열 변환/파싱 없이 호출)
+    구현하면 엔진이 (stop, route, "HH:MM") 호출 대신 이 메서드를 쓴다.
+    """
+
+    def wait_minutes(self, stop: str, route: str, minute_of_day: int) -> int:
+        ...
+
+
+def as_minute_wait(
+    wait_provider: WaitProvider | MinuteWaitProvider,
+) -> Callable[[str, str, int], int]:
+    if isinstance(wait_provider, MinuteWaitProvider):
+        return wait_provider.wait_minutes
+
+    def wait_minutes(stop: str, route: str, minute_of_day: int) -> int:
+        return wait_provider(stop, route, minutes_to_hhmm(minute_of_day))
+
+    return wait_minutes
+
+
 # Forward order (home -> school) for current MVP fixed route.
 # Values align with the route diagram currently shown in frontend.
 FIXED_ROUTE_SEGMENTS: list[Move | Board] = [
@@ -53,11 +121,11 @@ FIXED_ROUTE_SEGMENTS: list[Move | Board] = [
 ]
 
 
-def _latest_stop_arrival_time(
+def latest_stop_arrival_time(
     board_deadline_min: int,
     stop: str,
     route: str,
-    wait_provider: WaitProvider,
+    wait_minutes: Callable[[str, str, int], int],
     max_search_min: int,
 ) -> int:
     if max_search_min < 0:
@@ -65,54 +133,373 @@ def _latest_stop_arrival_time(
 
     for delta in range(0, max_search_min + 1):
         arrival = board_deadline_min - delta
-        arrival_hhmm = minutes_to_hhmm(arrival)
 
-        wait_minutes = wait_provider(stop, route, arrival_hhmm)
-        if wait_minutes < 0:
+        wait = wait_minutes(stop, route, arrival % MINUTES_PER_DAY)
+        if wait < 0:
             raise ValueError(
-                f"wait_provider returned negative minutes: {wait_minutes}"
+                f"wait_provider returned negative minutes: {wait}"
             )
 
-        if arrival + wait_minutes <= board_deadline_min:
+        if arrival + wait <= board_deadline_min:
             return arrival
 
-    raise ValueError(
+    raise InfeasibleRouteError(
         f"No feasible stop arrival time found within {max_search_min} minutes "
         f"for stop={stop!r}, route={route!r}"
     )
 
 
-def compute_departure_time(
-    destination_time: str,
-    segments: list[Move | Board],
-    wait_provider: WaitProvider,
-    transfer_buffer_min: int = 3,
-    max_wait_search_min: int = 180,
-) -> str:
-    if transfer_buffer_min < 0:
-        raise ValueError("transfer_buffer_min must be >= 0")
+def latest_stop_arrival_from_schedule(
+    board_deadline_min: int,
+    stop: str,
+    route: str,
+    schedule: DepartureSchedule,
+    max_search_min: int,
+) -> int:
+    if max_search_min < 0:
+        raise ValueError("max_search_min must be >= 0")
+
+    earliest = board_deadline_min - max_search_min
+    best: int | None = None
+
+    # 1) 마감 이전의 가장 늦은 출발(그 시각에 도착하면 대기 0분)
+    deps = schedule.departures
+    if deps:
+        day_start = board_deadline_min - board_deadline_min % MINUTES_PER_DAY
+        i = bisect_right(deps, board_deadline_min - day_start) - 1
+        if i >= 0:
+            dep = day_start + deps[i]
+        else:
+            dep = day_start - MINUTES_PER_DAY + deps[-1]
+        if dep >= earliest:
+            best = dep
 
-    t = hhmm_to_minutes(destination_time)
+    # 2) 시각표 밖 구간: fallback 대기 후에도 마감을 지키는 가장 늦은 도착
+    if schedule.fallback_len > 0:
+        latest = board_deadline_min - schedule.fallback_wait_min
+        offset = (latest - schedule.fallback_start) % MINUTES_PER_DAY
+        if offset >= schedule.fallback_len:
+            latest -= offset - (schedule.fallback_len - 1)
+        if latest >= earliest and (best is None or latest > best):
+            best = latest
 
+    if best is None:
+        raise InfeasibleRouteError(
+            f"No feasible stop arrival time found within {max_search_min} minutes "
+            f"for stop={stop!r}, route={route!r}"
+        )
+    return best
+
+
+def _reverse_plan(segments: list[Move | Board]) -> list[int | Board]:
+    """
+    segments를 뒤에서부터 처리할 단계로 변환한다.
+    - 연속된 Move는 검증 후 하나의 int(분)로 합친다
+    """
+    steps: list[int | Board] = []
     for seg in reversed(segments):
         if isinstance(seg, Move):
             if seg.minutes < 0:
                 raise ValueError(
                     f"Negative travel minutes not allowed: {seg.minutes}"
                 )
-            t -= seg.minutes
+            if steps and isinstance(steps[-1], int):
+                steps[-1] += seg.minutes
+            else:
+                steps.append(seg.minutes)
 
         elif isinstance(seg, Board):
-            arrival_at_stop = _latest_stop_arrival_time(
-                board_deadline_min=t,
-                stop=seg.stop,
-                route=seg.route,
-                wait_provider=wait_provider,
-                max_search_min=max_wait_search_min,
-            )
-            t = arrival_at_stop - transfer_buffer_min
+            steps.append(seg)
 
         else:
             raise TypeError(f"Unknown segment type: {type(seg)!r}")
 
-    return minutes_to_hhmm(t)
+    return steps
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """
+    segments를 뒤에서부터 처리할 단계로 미리 바꿔 둔 것(재사용할 경로용).
+    - 연속 Move는 합친 int(분), Board의 stop/route는 intern된 문자열
+    - 엔진 함수들은 segments 자리에 이것을 받으면 변환/검증을 건너뛴다
+    """
+    steps: tuple[int | Board, ...]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """단계 내용의 안정적인 요약(프로세스가 달라도 같음). 캐시 키/ETag용"""
+        parts = [str(s) if isinstance(s, int) else f"{s.stop}\x1f{s.route}" for s in self.steps]
+        return hashlib.blake2b("\x1e".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def compile_plan(segments: list[Move | Board]) -> CompiledPlan:
+    steps: list[int | Board] = []
+    for step in _reverse_plan(segments):
+        if isinstance(step, Board):
+            if not step.stop or not step.route:
+                raise ValueError(f"Board needs non-empty stop and route: {step!r}")
+            step = Board(stop=sys.intern(step.stop), route=sys.intern(step.route))
+        elif isinstance(step, bool) or not isinstance(step, int):
+            raise ValueError(f"Move minutes must be an integer: {step!r}")
+        steps.append(step)
+    return CompiledPlan(tuple(steps))
+
+
+def _plan_steps(segments: list[Move | Board] | CompiledPlan) -> tuple[int | Board, ...] | list[int | Board]:
+    if isinstance(segments, CompiledPlan):
+        return segments.steps
+    return _reverse_plan(segments)
+
+
+def compute_departure_minutes_batch(
+    destination_mins: list[int],
+    segments: list[Move | Board] | CompiledPlan,
+    wait_provider: WaitProvider | MinuteWaitProvider,
+    transfer_buffer_min: int = 3,
+    max_wait_search_min: int = 180,
+    errors: dict[int, str] | None = None,
+) -> list[int | None]:
+    """
+    여러 목표 도착 시각(분)에 대한 권장 출발 시각(분, 0~1439)을 한 번에 계산한다.
+    - 경로 단계(Move 합계)와 정류장별 시각표 조회는 배치당 1회
+    - 이웃한 목표 시각이 같은 탑승 마감으로 모이면 정류장 도착 계산(실패 포함)을 재사용
+    - errors를 주면 실행 불가능한 목표는 결과가 None이고 errors[목표 index]에 사유를 남긴다
+      (없으면 첫 실패에서 ValueError)
+    """
+    if transfer_buffer_min < 0:
+        raise ValueError("transfer_buffer_min must be >= 0")
+
+    wait_minutes = as_minute_wait(wait_provider)
+    schedule_provider = (
+        wait_provider if isinstance(wait_provider, DepartureScheduleProvider) else None
+    )
+
+    # (Board, 시각표 또는 None, 탑승 마감 -> 정류장 도착 또는 실패 memo)
+    steps: list[int | tuple[Board, DepartureSchedule | None, dict[int, int | str]]] = []
+    for step in _plan_steps(segments):
+        if isinstance(step, Board):
+            schedule = None
+            if schedule_provider is not None:
+                schedule = schedule_provider.departure_schedule(step.stop, step.route)
+            steps.append((step, schedule, {}))
+        else:
+            steps.append(step)
+
+    def departure(destination_min: int) -> int:
+        t = destination_min
+        for step in steps:
+            if isinstance(step, int):
+                t -= step
+                continue
+
+            seg, schedule, memo = step
+            arrival_at_stop = memo.get(t)
+            if arrival_at_stop is None:
+                try:
+                    if schedule is not None:
+                        arrival_at_stop = latest_stop_arrival_from_schedule(
+                            board_deadline_min=t,
+                            stop=seg.stop,
+                            route=seg.route,
+                            schedule=schedule,
+                            max_search_min=max_wait_search_min,
+                        )
+                    else:
+                        arrival_at_stop = latest_stop_arrival_time(
+                            board_deadline_min=t,
+                            stop=seg.stop,
+                            route=seg.route,
+                            wait_minutes=wait_minutes,
+                            max_search_min=max_wait_search_min,
+                        )
+                except InfeasibleRouteError as err:
+                    arrival_at_stop = str(err)
+                memo[t] = arrival_at_stop
+            if isinstance(arrival_at_stop, str):
+                raise InfeasibleRouteError(arrival_at_stop)
+            t = arrival_at_stop - transfer_buffer_min
+
+        return t % MINUTES_PER_DAY
+
+    results: list[int | None] = []
+    for i, destination_min in enumerate(destination_mins):
+        try:
+            results.append(departure(destination_min))
+        except ValueError as err:
+            if errors is None:
+                raise
+            errors[i] = str(err)
+            results.append(None)
+    return results
+
+
+def compute_departure_minutes(
+    destination_min: int,
+    segments: list[Move | Board] | CompiledPlan,
+    wait_provider: WaitProvider | MinuteWaitProvider,
+    transfer_buffer_min: int = 3,
+    max_wait_search_min: int = 180,
+) -> int:
+    """
+    compute_departure_time의 분 단위 버전(문자열 변환 없음).
+    - destination_min: 목표 도착 시각(분)
+    - 반환: 권장 출발 시각(분, 0~1439)
+    """
+    return compute_departure_minutes_batch(
+        destination_mins=[destination_min],
+        segments=segments,
+        wait_provider=wait_provider,
+        transfer_buffer_min=transfer_buffer_min,
+        max_wait_search_min=max_wait_search_min,
+    )[0]
+
+
+def compute_departure_time(
+    destination_time: str,
+    segments: list[Move | Board] | CompiledPlan,
+    wait_provider: WaitProvider | MinuteWaitProvider,
+    transfer_buffer_min: int = 3,
+    max_wait_search_min: int = 180,
+) -> str:
+    departure = compute_departure_minutes(
+        destination_min=hhmm_to_minutes(destination_time),
+        segments=segments,
+        wait_provider=wait_provider,
+        transfer_buffer_min=transfer_buffer_min,
+        max_wait_search_min=max_wait_search_min,
+    )
+    return minutes_to_hhmm(departure)
+
+
+@dataclass(frozen=True)
+class ProfileStep:
+    """목표 도착 start_min~end_min(양끝 포함)에서 권장 출발이 같은 구간."""
+    start_min: int
+    end_min: int
+    departure_min: int | None   # 0~1439, 불가능한 구간이면 None
+    error: str | None = None
+
+
+def _latest_stop_arrivals_sweep(
+    deadlines: list[int],
+    stop: str,
+    route: str,
+    wait_minutes: Callable[[str, str, int], int],
+    max_search_min: int,
+) -> list[int | None]:
+    """
+    오름차순 탑승 마감들에 대한 latest_stop_arrival_time(불가능하면 None).
+    - 답은 마감에 대해 단조 증가 -> 이전 답 이후 구간만 훑으면 된다
+    - 대기 시간은 분마다 1번만 조회(창 전체에서 provider 호출 ~ 창 길이 + max_search_min)
+    """
+    waits: dict[int, int] = {}
+    results: list[int | None] = []
+    prev: int | None = None
+    for deadline in deadlines:
+        earliest = deadline - max_search_min
+        lower = earliest if prev is None else max(earliest, prev + 1)
+
+        found = None
+        for arrival in range(deadline, lower - 1, -1):
+            wait = waits.get(arrival)
+            if wait is None:
+                wait = wait_minutes(stop, route, arrival % MINUTES_PER_DAY)
+                if wait < 0:
+                    raise ValueError(f"wait_provider returned negative minutes: {wait}")
+                waits[arrival] = wait
+            if arrival + wait <= deadline:
+                found = arrival
+                break
+        if found is None and prev is not None and prev >= earliest:
+            found = prev  # 이전 마감에 탈 수 있었으면 더 늦은 마감에도 탈 수 있다
+
+        results.append(found)
+        if found is not None:
+            prev = found
+    return results
+
+
+def compute_departure_profile(
+    start_min: int,
+    end_min: int,
+    segments: list[Move | Board] | CompiledPlan,
+    wait_provider: WaitProvider | MinuteWaitProvider,
+    transfer_buffer_min: int = 3,
+    max_wait_search_min: int = 180,
+) -> list[ProfileStep]:
+    """
+    목표 도착 start_min~end_min(분, 양끝 포함, 자정을 넘기려면 end_min > 1439)의 권장 출발 곡선.
+    - 경로를 뒤에서부터 한 단계씩, 창 전체를 한꺼번에 처리한다
+    - 같은 시각으로 모인 이웃 도착 분은 한 구간으로 합쳐 다음 단계부터 1번만 계산
+    - 반환: 출발이 같은 구간들(계단 함수). 각 분의 값은 compute_departure_minutes와 같다
+    """
+    if transfer_buffer_min < 0:
+        raise ValueError("transfer_buffer_min must be >= 0")
+    if max_wait_search_min < 0:
+        raise ValueError("max_search_min must be >= 0")
+    if end_min < start_min:
+        raise ValueError("end_min must be >= start_min")
+
+    wait_minutes = as_minute_wait(wait_provider)
+    schedule_provider = (
+        wait_provider if isinstance(wait_provider, DepartureScheduleProvider) else None
+    )
+
+    # 구간 k: 목표 도착 run_starts[k]부터, 현재 역산 시각 times[k](불가능이면 None, errors[k])
+    run_starts = list(range(start_min, end_min + 1))
+    times: list[int | None] = list(run_starts)
+    errors: list[str | None] = [None] * len(run_starts)
+
+    for step in _plan_steps(segments):
+        if isinstance(step, int):
+            times = [None if t is None else t - step for t in times]
+            continue
+
+        live = [k for k, t in enumerate(times) if t is not None]
+        schedule = None
+        if schedule_provider is not None:
+            schedule = schedule_provider.departure_schedule(step.stop, step.route)
+
+        if schedule is not None:
+            arrivals: list[int | None] = []
+            for k in live:
+                try:
+                    arrivals.append(
+                        latest_stop_arrival_from_schedule(
+                            times[k], step.stop, step.route, schedule, max_wait_search_min
+                        )
+                    )
+                except InfeasibleRouteError:
+                    arrivals.append(None)
+        else:
+            arrivals = _latest_stop_arrivals_sweep(
+                [times[k] for k in live], step.stop, step.route, wait_minutes, max_wait_search_min
+            )
+
+        for k, arrival in zip(live, arrivals):
+            if arrival is None:
+                times[k] = None
+                errors[k] = (
+                    f"No feasible stop arrival time found within {max_wait_search_min} minutes "
+                    f"for stop={step.stop!r}, route={step.route!r}"
+                )
+            else:
+                times[k] = arrival - transfer_buffer_min
+
+        # 같은 결과로 모인 이웃 구간 합치기
+        merged = [0]
+        for k in range(1, len(times)):
+            last = merged[-1]
+            if times[k] != times[last] or errors[k] != errors[last]:
+                merged.append(k)
+        run_starts = [run_starts[k] for k in merged]
+        times = [times[k] for k in merged]
+        errors = [errors[k] for k in merged]
+
+    profile: list[ProfileStep] = []
+    for k, t in enumerate(times):
+        run_end = run_starts[k + 1] - 1 if k + 1 < len(run_starts) else end_min
+        departure = None if t is None else t % MINUTES_PER_DAY
+        profile.append(ProfileStep(run_starts[k], run_end, departure, errors[k]))
+    return profile
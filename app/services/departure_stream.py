@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Topic:
+    def __init__(self):
+        self.queues: set[asyncio.Queue] = set()
+        self.ready = asyncio.Event()
+        self.last: dict[str, Any] | None = None
+        self.error: Exception | None = None  # 첫 계산 실패(같이 기다리던 구독자에게 전달)
+
+
+def _changed(old: dict[str, Any] | None, new: dict[str, Any], ignore: tuple[str, ...]) -> bool:
+    if old is None:
+        return True
+    return {k: v for k, v in old.items() if k not in ignore} != {k: v for k, v in new.items() if k not in ignore}
+
+
+class DepartureBroadcaster:
+    """
+    (경로, 목표 도착 시각) 키별 구독 허브(SSE용, 한 event loop 안에서 사용).
+    - 같은 키의 구독자는 계산 1번을 공유한다(처음 구독할 때 1번, 이후 스냅샷 버전마다 1번)
+    - version()이 바뀌면 모든 키를 다시 계산하고, 결과가 바뀐 키의 구독자에게만 보낸다
+      (ignore_fields는 비교에서 뺀다. 예: 버전 번호)
+    - 구독자가 하나라도 있을 때만 버전 감시 task가 돈다
+    - 느린 구독자 큐가 차면 오래된 메시지를 버린다(최신 값만 중요)
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[Hashable], dict[str, Any]],
+        version: Callable[[], Hashable],
+        poll_sec: float = 1.0,
+        max_queue: int = 8,
+        ignore_fields: tuple[str, ...] = ("version",),
+    ):
+        if poll_sec <= 0:
+            raise ValueError("poll_sec must be > 0")
+        self._compute = compute
+        self._version_fn = version
+        self.poll_sec = poll_sec
+        self.max_queue = max_queue
+        self.ignore_fields = ignore_fields
+        self._topics: dict[Hashable, _Topic] = {}
+        self._version: Hashable | None = None
+        self._task: asyncio.Task | None = None
+        self.computations = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(t.queues) for t in self._topics.values())
+
+    def _compute_many(self, keys: list[Hashable]) -> dict[Hashable, dict[str, Any]]:
+        self.computations += len(keys)
+        return {key: self._compute(key) for key in keys}
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, payload: dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    async def subscribe(self, key: Hashable) -> asyncio.Queue:
+        """
+        구독 큐를 돌려준다. 첫 메시지(현재 값)는 이미 들어 있다.
+        - 첫 계산이 실패하면 그 키를 함께 기다리던 구독자 모두에게 같은 예외를 올린다
+        - 계산하던 구독자가 취소되기만 했으면 기다리던 구독자가 다시 계산한다
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        while True:
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = _Topic()
+                self._topics[key] = topic
+                topic.queues.add(queue)
+                self._ensure_running()
+                try:
+                    if self._version is None:
+                        self._version = self._version_fn()
+                    topic.last = (await asyncio.to_thread(self._compute_many, [key]))[key]
+                except BaseException as e:
+                    if isinstance(e, Exception):
+                        topic.error = e
+                    # 실패한 topic은 버려서 다음 구독이 새로 계산하게 한다
+                    if self._topics.get(key) is topic:
+                        del self._topics[key]
+                    raise
+                finally:
+                    topic.ready.set()
+            else:
+                topic.queues.add(queue)
+                try:
+                    await topic.ready.wait()
+                except BaseException:
+                    self.unsubscribe(key, queue)
+                    raise
+                if topic.last is None:
+                    topic.queues.discard(queue)
+                    if topic.error is not None:
+                        raise topic.error
+                    continue  # 계산하던 구독자가 취소됨 -> 다시 시도
+
+            self._offer(queue, topic.last)
+            return queue
+
+    def unsubscribe(self, key: Hashable, queue: asyncio.Queue) -> None:
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        topic.queues.discard(queue)
+        if not topic.queues:
+            del self._topics[key]
+
+    async def publish(self) -> None:
+        """모든 키를 1번씩 다시 계산하고 바뀐 키에만 보낸다"""
+        keys = [k for k, t in self._topics.items() if t.ready.is_set()]
+        if not keys:
+            return
+        payloads = await asyncio.to_thread(self._compute_many, keys)
+        for key, payload in payloads.items():
+            topic = self._topics.get(key)
+            if topic is None or not _changed(topic.last, payload, self.ignore_fields):
+                continue
+            topic.last = payload
+            for queue in topic.queues:
+                self._offer(queue, payload)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._topics:
+            await asyncio.sleep(self.poll_sec)
+            try:
+                version = self._version_fn()
+                if version != self._version:
+                    self._version = version
+                    await self.publish()
+            except Exception:
+                logger.exception("departure stream publish failed")
+        self._version = None
+
+
+def sse_event(payload: dict[str, Any], event: str = "departure") -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
@@ -0,0 +1,109 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+from app.services.decision_engine import (
+    MINUTES_PER_DAY,
+    Board,
+    CompiledPlan,
+    MinuteWaitProvider,
+    Move,
+    WaitProvider,
+    compute_departure_minutes_batch,
+)
+
+_NO_DEPARTURE = -1
+
+
+class DepartureTable:
+    """
+    목표 도착 분(0~1439) -> 권장 출발 분 조회표.
+    - 시각에만 의존하는 wait_provider(예: headway 모델)일 때 하루치를 미리 계산해 O(1)로 조회
+    - 실행 불가능한 분은 -1로 저장하고, 조회 시 원래 ValueError 메시지를 다시 올린다
+    """
+
+    def __init__(self, departures: array, errors: dict[int, str]):
+        if len(departures) != MINUTES_PER_DAY:
+            raise ValueError(f"departures must have {MINUTES_PER_DAY} entries")
+        self._departures = departures
+        self._errors = errors
+
+    @classmethod
+    def build(
+        cls,
+        segments: list[Move | Board] | CompiledPlan,
+        wait_provider: WaitProvider | MinuteWaitProvider,
+        transfer_buffer_min: int = 3,
+        max_wait_search_min: int = 180,
+    ) -> "DepartureTable":
+        errors: dict[int, str] = {}
+        values = compute_departure_minutes_batch(
+            destination_mins=list(range(MINUTES_PER_DAY)),
+            segments=segments,
+            wait_provider=wait_provider,
+            transfer_buffer_min=transfer_buffer_min,
+            max_wait_search_min=max_wait_search_min,
+            errors=errors,
+        )
+        # 목표 index == 목표 분
+        return cls(array("h", [_NO_DEPARTURE if v is None else v for v in values]), errors)
+
+    def lookup(self, destination_min: int) -> int:
+        m = destination_min % MINUTES_PER_DAY
+        departure = self._departures[m]
+        if departure == _NO_DEPARTURE:
+            raise ValueError(self._errors[m])
+        return departure
+
+
+class DepartureTableCache:
+    """
+    현재 wait_provider 1개에 대해 (경로, 정책)별 DepartureTable을 유지한다.
+    - 처음 사용할 때 생성, 경로가 많으면 max_tables개까지만 두고 오래 안 쓴 것부터 버린다(LRU)
+    - provider 객체가 바뀌면(새 스냅샷) 전부 다시 만든다
+    - invalidate()로 강제 무효화(예: provider 설정 변경)
+    """
+
+    def __init__(self, max_tables: int = 64):
+        if max_tables <= 0:
+            raise ValueError("max_tables must be > 0")
+        self.max_tables = max_tables
+        self._lock = threading.Lock()
+        self._provider: object | None = None
+        self._tables: OrderedDict[tuple, DepartureTable] = OrderedDict()
+
+    def get(
+        self,
+        segments: list[Move | Board] | CompiledPlan,
+        wait_provider: WaitProvider | MinuteWaitProvider,
+        transfer_buffer_min: int = 3,
+        max_wait_search_min: int = 180,
+    ) -> DepartureTable:
+        route_key = segments if isinstance(segments, CompiledPlan) else tuple(segments)
+        key = (route_key, transfer_buffer_min, max_wait_search_min)
+
+        with self._lock:
+            if self._provider is not wait_provider:
+                self._provider = wait_provider
+                self._tables.clear()
+
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+
+            table = DepartureTable.build(
+                segments=segments if isinstance(segments, CompiledPlan) else list(route_key),
+                wait_provider=wait_provider,
+                transfer_buffer_min=transfer_buffer_min,
+                max_wait_search_min=max_wait_search_min,
+            )
+            self._tables[key] = table
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+            return table
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._provider = None
+            self._tables.clear()
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    departure_min: int | None   # 0~1439, 실행 불가능하면 None
+    error: str | None
+    etag: str
+
+
+class ComputeResultCache:
+    """
+    (경로 fingerprint, provider 버전, 목표 도착 분) -> /compute 결과.
+    - provider 버전이 바뀌면(새 스냅샷 발행) 이전 결과를 모두 버린다
+    - 실행 불가능(ValueError)도 같은 키에서는 같은 답이라 함께 저장
+    - ETag는 키에서 만든다(프로세스가 달라도 같은 입력이면 같은 값)
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._results: OrderedDict[tuple[str, int], CachedResult] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        route_fingerprint: str,
+        provider_version: str,
+        destination_min: int,
+        compute: Callable[[], int],
+    ) -> CachedResult:
+        key = (route_fingerprint, destination_min)
+        with self._lock:
+            if self._version != provider_version:
+                self._version = provider_version
+                self._results.clear()
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        etag = f'"{route_fingerprint}-{provider_version}-{destination_min}"'
+        try:
+            result = CachedResult(departure_min=compute(), error=None, etag=etag)
+        except ValueError as err:
+            result = CachedResult(departure_min=None, error=str(err), etag=etag)
+
+        with self._lock:
+            # 계산 중에 새 스냅샷이 발행됐으면 저장하지 않는다
+            if self._version == provider_version:
+                self._results[key] = result
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        return result
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._results.clear()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더(쉼표 구분, W/ 접두어 허용)에 etag가 있는지"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+from app.services.decision_engine import Board, CompiledPlan, Move, compile_plan
+
+DEFAULT_ROUTE_ID = "default"
+# 사용자 구분 없는 공용 이름공간(기본 경로, 사용자 id 없는 호출자)
+SHARED_OWNER = ""
+
+RouteKey = tuple[str, str]  # (owner, route_id)
+
+
+class RouteRegistry:
+    """
+    (owner, route_id)로 등록한 경로(Move/Board 목록) + 컴파일된 계획 캐시.
+    - owner(사용자)마다 route_id 이름공간이 따로 있다. 같은 route_id라도 owner가 다르면 다른 경로
+    - 등록할 때 한 번 검증/컴파일(compile_plan), 계산할 때는 캐시된 CompiledPlan을 쓴다
+    - 경로 정의는 전체 max_routes개, owner당 max_routes_per_owner개까지 보관
+    - 계획은 max_plans개까지(LRU), 밀려난 경로는 다시 쓸 때 정의에서 재컴파일
+    """
+
+    def __init__(self, max_routes: int = 10_000, max_plans: int = 256, max_routes_per_owner: int = 100):
+        if max_routes <= 0 or max_plans <= 0 or max_routes_per_owner <= 0:
+            raise ValueError("max_routes, max_plans and max_routes_per_owner must be > 0")
+        self.max_routes = max_routes
+        self.max_plans = max_plans
+        self.max_routes_per_owner = max_routes_per_owner
+        self._lock = threading.Lock()
+        self._routes: dict[RouteKey, tuple[Move | Board, ...]] = {}
+        self._owner_counts: dict[str, int] = {}
+        self._plans: OrderedDict[RouteKey, CompiledPlan] = OrderedDict()
+        self.compiles = 0
+        # 등록/삭제마다 증가(구독자에게 경로 변경을 알릴 때 사용)
+        self.revision = 0
+
+    def __contains__(self, key: str | RouteKey) -> bool:
+        """route_id(공용 이름공간) 또는 (owner, route_id)"""
+        if isinstance(key, str):
+            key = (SHARED_OWNER, key)
+        return key in self._routes
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def _cache_plan(self, key: RouteKey, plan: CompiledPlan) -> None:
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+
+    def register(self, route_id: str, segments: list[Move | Board], owner: str = SHARED_OWNER) -> CompiledPlan:
+        """등록(같은 owner/id면 교체). 잘못된 경로면 ValueError/TypeError."""
+        if not route_id or route_id != route_id.strip():
+            raise ValueError(f"Invalid route_id: {route_id!r}")
+        segments = tuple(segments)
+        plan = compile_plan(list(segments))
+        key = (owner, route_id)
+
+        with self._lock:
+            if key not in self._routes:
+                if len(self._routes) >= self.max_routes:
+                    raise ValueError(f"Too many routes: {self.max_routes}")
+                if self._owner_counts.get(owner, 0) >= self.max_routes_per_owner:
+                    raise ValueError(f"Too many routes for this user: {self.max_routes_per_owner}")
+                self._owner_counts[owner] = self._owner_counts.get(owner, 0) + 1
+            self._routes[key] = segments
+            self.compiles += 1
+            self.revision += 1
+            self._cache_plan(key, plan)
+        return plan
+
+    def remove(self, route_id: str, owner: str = SHARED_OWNER) -> bool:
+        key = (owner, route_id)
+        with self._lock:
+            self._plans.pop(key, None)
+            if self._routes.pop(key, None) is None:
+                return False
+            self._owner_counts[owner] -= 1
+            if not self._owner_counts[owner]:
+                del self._owner_counts[owner]
+            self.revision += 1
+            return True
+
+    def segments(self, route_id: str, owner: str = SHARED_OWNER) -> list[Move | Board]:
+        """등록된 정의(없으면 KeyError)"""
+        return list(self._routes[(owner, route_id)])
+
+    def plan(self, route_id: str, owner: str = SHARED_OWNER) -> CompiledPlan:
+        """컴파일된 계획(없으면 KeyError)"""
+        key = (owner, route_id)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+            plan = compile_plan(list(self._routes[key]))
+            self.compiles += 1
+            self._cache_plan(key, plan)
+            return plan
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import threading
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable
+
+from app.adapters.fallback_eta_provider import (
+    AsyncFallbackEtaProvider,
+    arrival_api_source,
+    headway_source,
+    position_source,
+)
+from app.adapters.gbis_bus_eta_provider import AsyncGbisBusEtaProvider, GbisBusEtaProvider
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.http_client import create_async_client
+from app.adapters.live_bindings import DEFAULT_LIVE_BINDINGS, LiveBinding, plan_bindings
+from app.adapters.seoul_subway_eta_provider import AsyncSeoulSubwayEtaProvider
+from app.adapters.suin_bundang_position_eta_provider import (
+    SUIN_BUNDANG_FORWARD_UPDN_LINE,
+    AsyncSuinBundangPositionEtaProvider,
+    SuinBundangPositionEtaProvider,
+)
+from app.adapters.wait_provider_snapshot import (
+    WaitSnapshot,
+    build_wait_provider_snapshot,
+    build_wait_provider_snapshot_async,
+    norm_stop,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def live_snapshot_builder(
+    bus_provider: GbisBusEtaProvider | None,
+    subway_provider: SuinBundangPositionEtaProvider | None,
+    bindings: list[LiveBinding],
+) -> Callable[[datetime], WaitSnapshot]:
+    """
+    실시간 provider로 WaitSnapshot을 만드는 함수를 반환한다.
+    결과 스냅샷은 엔진 키(stop, route)로도 조회할 수 있다.
+    """
+    plan = plan_bindings(bindings)
+
+    def build(now: datetime) -> WaitSnapshot:
+        snap = build_wait_provider_snapshot(
+            now=now,
+            bus_provider=bus_provider,
+            subway_provider=subway_provider,
+            bus_stops=plan.bus_stops,
+            subway_stops=plan.subway_stops,
+            max_wait_by_route=plan.max_wait_by_route,
+        )
+        return snap.with_aliases(plan.aliases)
+
+    return build
+
+
+class AsyncLiveSnapshotBuilder:
+    """
+    async provider + 공유 연결 풀로 스냅샷을 만드는 builder.
+    - 갱신 스레드에서 호출되며, 자기 이벤트 루프를 계속 재사용해 keep-alive 연결을 유지한다
+    - 모든 정류장을 동시에 조회한다
+    - 지하철은 위치 추정 -> 역 도착정보 API -> 배차간격 순의 fallback chain(subway_budget_sec 안에서)
+    """
+
+    def __init__(self, bindings: list[LiveBinding], timeout_sec: float = 10.0, subway_budget_sec: float = 3.0):
+        self._plan = plan_bindings(bindings)
+        self._now = datetime.now()
+        self._loop = asyncio.new_event_loop()
+        self._client = create_async_client(timeout_sec=timeout_sec)
+        self._bus = AsyncGbisBusEtaProvider(self._client)
+        self._subway = AsyncFallbackEtaProvider(
+            route="수인분당선",
+            sources=[
+                position_source(AsyncSuinBundangPositionEtaProvider(self._client, toward_station="청명")),
+                # 위치 source와 같은 방향(미금 -> 청명 = 인천 방향) 열차만
+                arrival_api_source(
+                    AsyncSeoulSubwayEtaProvider(self._client, updn_line=SUIN_BUNDANG_FORWARD_UPDN_LINE)
+                ),
+                # main.wait_provider_stub과 같은 배차, 기준 시각은 만드는 중인 스냅샷의 now
+                headway_source(HeadwayWaitProvider({}, default_headway=8), clock=lambda: self._now),
+            ],
+            budget_sec=subway_budget_sec,
+            source_timeout_sec=subway_budget_sec / 2,
+        )
+
+    def __call__(self, now: datetime) -> WaitSnapshot:
+        self._now = now
+        snap = self._loop.run_until_complete(
+            build_wait_provider_snapshot_async(
+                now=now,
+                bus_provider=self._bus,
+                subway_provider=self._subway,
+                bus_stops=self._plan.bus_stops,
+                subway_stops=self._plan.subway_stops,
+                max_wait_by_route=self._plan.max_wait_by_route,
+            )
+        )
+        sources = {
+            (norm_stop(stop), route.strip()): self._subway.last_sources.get(stop, "")
+            for stop, route in self._plan.subway_stops
+        }
+        return replace(snap, sources=sources).with_aliases(self._plan.aliases)
+
+    def close(self) -> None:
+        """
+        연결 풀을 닫고 루프를 정리한다.
+        - 호출한 스레드에 다른 루프가 돌고 있을 수 있으므로(FastAPI lifespan) 별도 스레드에서 실행하고 기다린다
+        """
+        if self._loop.is_closed():
+            return
+
+        def run() -> None:
+            try:
+                self._loop.run_until_complete(self._client.aclose())
+            finally:
+                self._loop.close()
+
+        thread = threading.Thread(target=run, name="snapshot-builder-close")
+        thread.start()
+        thread.join()
+
+
+class SnapshotService:
+    """
+    실시간 WaitSnapshot을 백그라운드 스레드에서 interval_sec마다 갱신한다.
+    - 요청은 current()로 최신(불변) 스냅샷을 락 없이 읽는다
+    - 사용자 수와 무관하게 upstream 호출은 갱신 주기에만 비례
+    - 갱신 실패 시 이전 스냅샷을 유지하고, max_age_sec보다 오래되면 None(-> 호출자 fallback)
+    """
+
+    def __init__(
+        self,
+        build_snapshot: Callable[[datetime], WaitSnapshot],
+        interval_sec: float = 30.0,
+        max_age_sec: float | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be > 0")
+        self._build = build_snapshot
+        self._interval = interval_sec
+        self._max_age = max_age_sec if max_age_sec is not None else interval_sec * 3
+        self._clock = clock
+
+        # (version, snapshot)을 한 번에 교체해 읽는 쪽이 항상 짝이 맞는 값을 보게 한다
+        self._published: tuple[int, WaitSnapshot] | None = None
+        self._last_error: str | None = None
+
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def version(self) -> int:
+        published = self._published
+        return published[0] if published else 0
+
+    @property
+    def last_error(self) -> str | None:
+        return self._last_error
+
+    def current(self) -> WaitSnapshot | None:
+        published = self.current_versioned()
+        return published[1] if published else None
+
+    def current_versioned(self) -> tuple[int, WaitSnapshot] | None:
+        published = self._published
+        if published is None:
+            return None
+        age = (self._clock() - published[1].now).total_seconds()
+        if age > self._max_age:
+            return None
+        return published
+
+    def refresh(self) -> WaitSnapshot | None:
+        with self._refresh_lock:
+            try:
+                snap = self._build(self._clock())
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.warning("snapshot refresh failed: %s", self._last_error)
+                return None
+
+            self._published = (self.version + 1, snap)
+            self._last_error = None
+            return snap
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # builder가 연결 풀 등 자원을 가지고 있으면 정리
+        close = getattr(self._build, "close", None)
+        if close is not None:
+            with self._refresh_lock:
+                close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self._interval)
+
+
+def create_live_snapshot_service(
+    interval_sec: float = 30.0,
+    bindings: list[LiveBinding] | None = None,
+) -> SnapshotService:
+    """
+    env의 API 키(DATA_GO_KR_SERVICE_KEY, SEOUL_OPENAPI_KEY)로 실시간 스냅샷 서비스를 만든다.
+    """
+    build = AsyncLiveSnapshotBuilder(bindings or DEFAULT_LIVE_BINDINGS)
+    return SnapshotService(build, interval_sec=interval_sec)
@@ -0,0 +1,210 @@
+from dataclasses import dataclass
+from heapq import heappop, heappush
+
+from app.services.decision_engine import (
+    MINUTES_PER_DAY,
+    Board,
+    DepartureSchedule,
+    DepartureScheduleProvider,
+    InfeasibleRouteError,
+    MinuteWaitProvider,
+    Move,
+    WaitProvider,
+    as_minute_wait,
+    latest_stop_arrival_from_schedule,
+    latest_stop_arrival_time,
+)
+
+
+@dataclass(frozen=True)
+class WalkEdge:
+    from_stop: str
+    to_stop: str
+    minutes: int
+
+
+@dataclass(frozen=True)
+class RideEdge:
+    """from_stop에서 route를 타고(대기는 wait_provider) minutes 뒤 to_stop에 내린다."""
+    from_stop: str
+    to_stop: str
+    route: str
+    minutes: int
+
+
+Edge = WalkEdge | RideEdge
+
+
+@dataclass(frozen=True)
+class JourneyLeg:
+    edge: Edge
+    leave_by_min: int    # from_stop을 늦어도 이 시각에 출발(탑승이면 환승 여유 포함)
+    arrive_by_min: int   # to_stop에 이 시각까지 도착하면 충분
+
+
+@dataclass(frozen=True)
+class Journey:
+    departure_min: int   # 0~1439
+    legs: tuple[JourneyLeg, ...]
+
+
+class TransitGraph:
+    """
+    정류장(노드) + 도보/탑승 간선으로 된 시간 의존 그래프.
+    - 탑승 간선의 대기는 엔진과 같은 wait_provider(WaitProvider/MinuteWaitProvider/DepartureScheduleProvider)
+    - 목적지 도착 시각에서 거꾸로, 각 정류장의 '가장 늦게 있어도 되는 시각'을 구한다(역방향 시간 의존 Dijkstra)
+      대기 함수가 FIFO(늦게 도착해도 먼저 떠나지 않음)라서 한 번 확정된 정류장은 다시 볼 필요가 없다
+    """
+
+    def __init__(self):
+        self._incoming: dict[str, list[Edge]] = {}
+        self.stops: set[str] = set()
+
+    def _add(self, edge: Edge) -> None:
+        if edge.minutes < 0:
+            raise ValueError(f"Negative travel minutes not allowed: {edge.minutes}")
+        self._incoming.setdefault(edge.to_stop, []).append(edge)
+        self.stops.update((edge.from_stop, edge.to_stop))
+
+    def add_walk(self, from_stop: str, to_stop: str, minutes: int) -> None:
+        self._add(WalkEdge(from_stop, to_stop, minutes))
+
+    def add_ride(self, from_stop: str, to_stop: str, route: str, minutes: int) -> None:
+        self._add(RideEdge(from_stop, to_stop, route, minutes))
+
+    @classmethod
+    def from_alternatives(
+        cls,
+        alternatives: list[list[Move | Board]],
+        origin: str = "origin",
+        destination: str = "destination",
+    ) -> "TransitGraph":
+        """
+        Move/Board 경로 여러 개를 origin/destination을 공유하는 그래프로 합친다.
+        - 탑승 뒤 다음 탑승(또는 도착)까지의 Move 합계 = 탑승 간선 1개(엔진이 Move를 합치는 것과 같음)
+        - 같은 이름의 정류장은 같은 노드(경로끼리 환승 가능)
+        """
+        graph = cls()
+        for segments in alternatives:
+            node, route, minutes = origin, None, 0
+            for seg in segments:
+                if isinstance(seg, Move):
+                    if seg.minutes < 0:
+                        raise ValueError(f"Negative travel minutes not allowed: {seg.minutes}")
+                    minutes += seg.minutes
+                elif isinstance(seg, Board):
+                    graph._link(node, seg.stop, route, minutes)
+                    node, route, minutes = seg.stop, seg.route, 0
+                else:
+                    raise TypeError(f"Unknown segment type: {type(seg)!r}")
+            graph._link(node, destination, route, minutes)
+        return graph
+
+    def _link(self, from_stop: str, to_stop: str, route: str | None, minutes: int) -> None:
+        if route is None:
+            self.add_walk(from_stop, to_stop, minutes)
+        else:
+            self.add_ride(from_stop, to_stop, route, minutes)
+
+    def latest_times(
+        self,
+        destination: str,
+        arrival_min: int,
+        wait_provider: WaitProvider | MinuteWaitProvider,
+        transfer_buffer_min: int = 3,
+        max_wait_search_min: int = 180,
+        origin: str | None = None,
+    ) -> tuple[dict[str, int], dict[str, Edge]]:
+        """
+        정류장별 가장 늦은 시각(분, 하루를 넘으면 음수/1440 이상) + 그때 타야 할 다음 간선.
+        - origin을 주면 그 정류장이 확정되는 순간 멈춘다
+        """
+        if transfer_buffer_min < 0:
+            raise ValueError("transfer_buffer_min must be >= 0")
+
+        wait_minutes = as_minute_wait(wait_provider)
+        schedule_provider = wait_provider if isinstance(wait_provider, DepartureScheduleProvider) else None
+        schedules: dict[tuple[str, str], DepartureSchedule | None] = {}
+        boardings: dict[tuple[str, str, int], int | None] = {}
+
+        def latest_boarding(stop: str, route: str, deadline: int) -> int | None:
+            key = (stop, route, deadline)
+            if key in boardings:
+                return boardings[key]
+            if (stop, route) not in schedules:
+                schedules[(stop, route)] = (
+                    schedule_provider.departure_schedule(stop, route) if schedule_provider is not None else None
+                )
+            schedule = schedules[(stop, route)]
+            try:
+                if schedule is not None:
+                    arrival = latest_stop_arrival_from_schedule(deadline, stop, route, schedule, max_wait_search_min)
+                else:
+                    arrival = latest_stop_arrival_time(deadline, stop, route, wait_minutes, max_wait_search_min)
+            except InfeasibleRouteError:
+                arrival = None  # 이 간선으로는 제시간에 못 탐
+            boardings[key] = arrival
+            return arrival
+
+        latest: dict[str, int] = {destination: arrival_min}
+        via: dict[str, Edge] = {}
+        done: set[str] = set()
+        heap = [(-arrival_min, destination)]
+
+        while heap:
+            neg_t, stop = heappop(heap)
+            if stop in done:
+                continue
+            done.add(stop)
+            if stop == origin:
+                break
+
+            t = -neg_t
+            for edge in self._incoming.get(stop, ()):
+                prev = edge.from_stop
+                if prev in done:
+                    continue
+                if isinstance(edge, WalkEdge):
+                    cand = t - edge.minutes
+                else:
+                    arrival = latest_boarding(prev, edge.route, t - edge.minutes)
+                    if arrival is None:
+                        continue
+                    cand = arrival - transfer_buffer_min
+                if prev not in latest or cand > latest[prev]:
+                    latest[prev] = cand
+                    via[prev] = edge
+                    heappush(heap, (-cand, prev))
+
+        return latest, via
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        arrival_min: int,
+        wait_provider: WaitProvider | MinuteWaitProvider,
+        transfer_buffer_min: int = 3,
+        max_wait_search_min: int = 180,
+    ) -> Journey:
+        """
+        모든 대안 경로 중 가장 늦게 출발해도 arrival_min까지 destination에 도착하는 여정.
+        """
+        latest, via = self.latest_times(
+            destination,
+            arrival_min,
+            wait_provider,
+            transfer_buffer_min=transfer_buffer_min,
+            max_wait_search_min=max_wait_search_min,
+            origin=origin,
+        )
+        if origin not in latest:
+            raise InfeasibleRouteError(f"No feasible route from {origin!r} to {destination!r}")
+
+        legs: list[JourneyLeg] = []
+        stop = origin
+        while stop != destination:
+            edge = via[stop]
+            legs.append(JourneyLeg(edge=edge, leave_by_min=latest[stop], arrive_by_min=latest[edge.to_stop]))
+            stop = edge.to_stop
+        return Journey(departure_min=latest[origin] % MINUTES_PER_DAY, legs=tuple(legs))
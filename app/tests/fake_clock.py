@@ -0,0 +1,8 @@
+class FakeClock:
+    """테스트용 시계: clock()은 now를 돌려주고, 테스트가 now를 직접 옮긴다(float 초 또는 datetime)"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
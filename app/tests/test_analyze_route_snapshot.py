@@ -0,0 +1,83 @@
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from app.adapters.analyze_route_snapshot import (
+    SeriesStats,
+    StreamingMedian,
+    _circular_diff_min,
+    analyze_rows,
+    compute_series_stats,
+)
+
+
+def _reference_stats(name, times, values, circular=False):
+    # 리스트 기반 다중 순회 구현(스트리밍 도입 전)
+    n = len(values)
+    change_times = [times[i] for i in range(1, n) if values[i] != values[i - 1]]
+    intervals = [(change_times[i] - change_times[i - 1]).total_seconds() for i in range(1, len(change_times))]
+    jumps = [
+        _circular_diff_min(values[i], values[i - 1]) if circular else abs(values[i] - values[i - 1])
+        for i in range(1, n)
+        if values[i] is not None and values[i - 1] is not None
+    ]
+    return SeriesStats(
+        name=name,
+        n=n,
+        missing=sum(1 for v in values if v is None),
+        change_events=len(change_times),
+        change_rate=(len(change_times) / (n - 1)) if n > 1 else 0.0,
+        change_interval_median_sec=float(statistics.median(intervals)) if len(change_times) >= 2 else None,
+        jump_max=max(jumps) if jumps else None,
+        jumps_ge_2=sum(1 for j in jumps if j >= 2),
+        jumps_ge_5=sum(1 for j in jumps if j >= 5),
+    )
+
+
+def _random_series(rng, n):
+    t = datetime(2026, 1, 5, 7, 0)
+    times, values = [], []
+    v = rng.randint(0, 1439)
+    for _ in range(n):
+        t += timedelta(seconds=rng.choice([55, 60, 60, 61, 120]))
+        if rng.random() < 0.3:
+            v = rng.choice([None, rng.randint(0, 1439), (v or 0) + rng.randint(-6, 6)])
+        times.append(t)
+        values.append(None if v is None else v % 1440)
+    return times, values
+
+
+def test_streaming_median_matches_statistics():
+    rng = random.Random(3)
+    for n in range(1, 40):
+        xs = [float(rng.randint(30, 90)) for _ in range(n)]
+        m = StreamingMedian()
+        for x in xs:
+            m.add(x)
+        assert m.median() == statistics.median(xs)
+    assert StreamingMedian().median() is None
+
+
+def test_series_stats_match_reference():
+    rng = random.Random(11)
+    for n in [0, 1, 2, 3, 10, 200]:
+        for circular in (False, True):
+            times, values = _random_series(rng, n)
+            got = compute_series_stats("x", times, values, circular=circular)
+            assert got == _reference_stats("x", times, values, circular=circular)
+
+
+def test_analyze_rows_single_pass_from_iterator():
+    rows = [
+        {"collected_at": "2026-01-05T08:00:00", "bus51_eta_min": "5", "recommended_departure_time": "07:10"},
+        {"collected_at": "2026-01-05T08:01:00", "bus51_eta_min": "4", "bus_error": "x"},
+        {"collected_at": "2026-01-05T08:03:00", "bus51_eta_min": "", "recommended_departure_time": "07:20"},
+    ]
+    report = analyze_rows(iter(rows))
+
+    assert report.n == 3
+    assert report.interval_median_sec == 90.0
+    assert (report.interval_min_sec, report.interval_max_sec) == (60.0, 120.0)
+    assert report.errors == {"bus_error": 1, "subway_error": 0, "engine_error": 0}
+    assert report.stats[0].change_events == 2 and report.stats[0].missing == 1
+    assert (report.departure_min, report.departure_max) == (430, 440)
@@ -0,0 +1,53 @@
+import csv
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.adapters.analyze_route_snapshot import analyze_file
+
+pytest.importorskip("numpy")
+
+from app.adapters.analyze_route_snapshot_columnar import analyze_files  # noqa: E402
+
+FIELDS = [
+    "collected_at", "bus51_eta_min", "bus5100_eta_min", "subway_eta1_min",
+    "recommended_departure_time", "bus_error", "subway_error", "engine_error",
+]
+
+
+def _write_random_csv(path, rng, n):
+    t = datetime(2026, 1, 5, 7, 0) + timedelta(days=rng.randint(0, 30))
+    dep = rng.randint(0, 1439)
+    with path.open("w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        for _ in range(n):
+            t += timedelta(seconds=rng.choice([58, 60, 60, 61, 180]))
+            if rng.random() < 0.3:
+                dep = (dep + rng.randint(-8, 8)) % 1440
+            w.writerow(
+                {
+                    "collected_at": t.isoformat(timespec="seconds"),
+                    "bus51_eta_min": rng.choice(["", "x", str(rng.randint(0, 20)), " 7 "]),
+                    "bus5100_eta_min": str(rng.randint(0, 3)),
+                    "subway_eta1_min": rng.choice(["", "4", "4", "5"]),
+                    "recommended_departure_time": rng.choice(
+                        [f"{dep // 60:02d}:{dep % 60:02d}", "", "25:00"]
+                    ),
+                    "bus_error": rng.choice(["", "", "HTTPError: 500"]),
+                    "subway_error": "",
+                    "engine_error": rng.choice(["", "ValueError: x, y"]),
+                }
+            )
+
+
+def test_columnar_matches_streaming_for_many_files(tmp_path):
+    rng = random.Random(5)
+    paths = []
+    for i, n in enumerate([0, 1, 2, 50, 300]):
+        path = tmp_path / f"snap{i}.csv"
+        _write_random_csv(path, rng, n)
+        paths.append(path)
+
+    assert analyze_files(paths) == [analyze_file(p) for p in paths]
@@ -0,0 +1,214 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+
+client = TestClient(app)
+
+ROUTE = {
+    "segments": [
+        {"type": "move", "minutes": 5},
+        {"type": "board", "stop": "X", "route": "51"},
+        {"type": "move", "minutes": 10},
+    ]
+}
+
+
+@pytest.fixture
+def route_id():
+    rid = "test-route"
+    assert client.put(f"/routes/{rid}", json=ROUTE).status_code == 200
+    yield rid
+    client.delete(f"/routes/{rid}")
+
+
+@pytest.fixture
+def never_boards(monkeypatch):
+    # 어떤 정류장이든 대기 시간이 탐색 범위를 넘는다 -> 엔진 ValueError(infeasible)
+    def provider(stop: str, route: str, time_hhmm: str) -> int:
+        return 9999
+
+    monkeypatch.setattr(main, "current_wait_provider_versioned", lambda: ("never", provider))
+
+
+def test_batch_list_and_range_have_same_shape():
+    listed = client.post("/compute/batch", json={"destination_times": ["09:00", "09:10"]})
+    ranged = client.post("/compute/batch", json={"start_time": "09:00", "end_time": "09:10", "step_min": 10})
+
+    assert listed.status_code == ranged.status_code == 200
+    assert listed.json() == ranged.json()
+    results = listed.json()["results"]
+    assert [r["destination_time"] for r in results] == ["09:00", "09:10"]
+    single = client.post("/compute", json={"destination_time": "09:10"}).json()
+    assert results[1]["recommended_departure_time"] == single["recommended_departure_time"]
+
+
+def test_batch_range_wraps_midnight():
+    res = client.post("/compute/batch", json={"start_time": "23:50", "end_time": "00:10", "step_min": 10})
+    assert [r["destination_time"] for r in res.json()["results"]] == ["23:50", "00:00", "00:10"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"destination_times": ["9시"]},
+        {"destination_times": ["09:00"], "start_time": "08:00", "end_time": "09:00"},
+        {"start_time": "08:00"},
+        {"start_time": "08:00", "end_time": "09:00", "step_min": 0},
+        {"destination_times": ["09:00"] * (main.MAX_BATCH_ITEMS + 1)},
+        {"destination_times": "09:00"},
+    ],
+)
+def test_batch_rejects_bad_requests(body):
+    assert client.post("/compute/batch", json=body).status_code == 422
+
+
+def test_batch_maps_errors_to_status(never_boards):
+    assert client.post("/compute/batch", json={"destination_times": ["09:00"], "route_id": "nope"}).status_code == 404
+    res = client.post("/compute/batch", json={"destination_times": ["09:00"]})
+    assert res.status_code == 400 and res.json()["detail"]
+
+
+def test_profile_shape_and_validation():
+    res = client.post("/compute/profile", json={"start_time": "08:00", "end_time": "09:00"})
+    assert res.status_code == 200
+    steps = res.json()["steps"]
+    assert steps[0]["start_time"] == "08:00" and steps[-1]["end_time"] == "09:00"
+    assert set(steps[0]) == {"start_time", "end_time", "recommended_departure_time", "error"}
+
+    batch = client.post("/compute/batch", json={"destination_times": ["08:00"]}).json()
+    assert steps[0]["recommended_departure_time"] == batch["results"][0]["recommended_departure_time"]
+
+    assert client.post("/compute/profile", json={"start_time": "8", "end_time": "09:00"}).status_code == 422
+    assert client.post("/compute/profile", json={"start_time": "08:00"}).status_code == 422
+    assert (
+        client.post("/compute/profile", json={"start_time": "08:00", "end_time": "09:00", "route_id": "nope"}).status_code
+        == 404
+    )
+
+
+def test_profile_reports_infeasible_ranges_per_step(never_boards):
+    res = client.post("/compute/profile", json={"start_time": "08:00", "end_time": "08:30"})
+    assert res.status_code == 200
+    (step,) = res.json()["steps"]
+    assert step["recommended_departure_time"] is None and step["error"]
+
+
+def test_route_crud_and_routed_compute(route_id):
+    got = client.get(f"/routes/{route_id}")
+    assert got.status_code == 200
+    assert got.json()["route_id"] == route_id
+    assert [s["type"] for s in got.json()["segments"]] == ["move", "board", "move"]
+
+    default = client.post("/compute", json={"destination_time": "09:00"}).json()
+    routed = client.post("/compute", json={"destination_time": "09:00", "route_id": route_id})
+    assert routed.status_code == 200
+    assert routed.json() != default
+    by_get = client.get("/compute", params={"destination_time": "09:00", "route_id": route_id})
+    assert by_get.json() == routed.json()
+
+    batch = client.post("/compute/batch", json={"destination_times": ["09:00"], "route_id": route_id}).json()
+    assert batch["results"][0]["recommended_departure_time"] == routed.json()["recommended_departure_time"]
+
+    # 경로를 바꾸면 같은 route_id의 결과도 바뀐다
+    longer = {"segments": [{"type": "move", "minutes": 30}, *ROUTE["segments"][1:]]}
+    assert client.put(f"/routes/{route_id}", json=longer).status_code == 200
+    changed = client.post("/compute", json={"destination_time": "09:00", "route_id": route_id}).json()
+    assert changed != routed.json()
+
+    assert client.delete(f"/routes/{route_id}").status_code == 204
+    assert client.get(f"/routes/{route_id}").status_code == 404
+    assert client.delete(f"/routes/{route_id}").status_code == 404
+    assert client.post("/compute", json={"destination_time": "09:00", "route_id": route_id}).status_code == 404
+
+
+def test_routes_are_scoped_per_user():
+    alice, bob = {"X-User-Id": "alice"}, {"X-User-Id": "bob"}
+    longer = {"segments": [{"type": "move", "minutes": 30}, *ROUTE["segments"][1:]]}
+    assert client.put("/routes/commute", json=ROUTE, headers=alice).status_code == 200
+    assert client.put("/routes/commute", json=longer, headers=bob).status_code == 200
+    try:
+        # 같은 route_id라도 사용자마다 다른 경로, 다른 사용자/공용 이름공간에선 안 보인다
+        assert client.get("/routes/commute", headers=alice).json()["segments"][0]["minutes"] == 5
+        assert client.get("/routes/commute", headers=bob).json()["segments"][0]["minutes"] == 30
+        assert client.get("/routes/commute").status_code == 404
+        assert client.get("/routes/commute", headers={"X-User-Id": "carol"}).status_code == 404
+
+        body = {"destination_time": "09:00", "route_id": "commute"}
+        a = client.post("/compute", json=body, headers=alice).json()
+        b = client.post("/compute", json=body, headers=bob).json()
+        assert a != b
+        assert client.post("/compute", json=body).status_code == 404
+
+        # 기본 경로는 누구에게나 같다
+        assert client.get("/routes/default", headers=alice).json() == client.get("/routes/default").json()
+        assert client.put("/routes/default", json=ROUTE, headers=alice).status_code == 409
+
+        assert client.delete("/routes/commute", headers=alice).status_code == 204
+        assert client.get("/routes/commute", headers=bob).status_code == 200
+    finally:
+        client.delete("/routes/commute", headers=alice)
+        client.delete("/routes/commute", headers=bob)
+
+
+@pytest.mark.parametrize("user", ["", "   ", "u" * (main.MAX_USER_ID_LEN + 1)])
+def test_invalid_user_id_is_rejected(user):
+    assert client.get("/routes/default", headers={"X-User-Id": user}).status_code == 422
+
+
+def test_default_route_is_read_only():
+    assert client.get("/routes/default").status_code == 200
+    assert client.put("/routes/default", json=ROUTE).status_code == 409
+    assert client.delete("/routes/default").status_code == 409
+
+
+@pytest.mark.parametrize(
+    "segments",
+    [
+        [],
+        [{"type": "move"}],
+        [{"type": "board", "stop": "X"}],
+        [{"type": "fly", "minutes": 3}],
+        [{"type": "move", "minutes": -1}],
+        [{"type": "move", "minutes": 1}] * (main.MAX_ROUTE_SEGMENTS + 1),
+    ],
+)
+def test_put_route_rejects_invalid_segments(segments):
+    assert client.put("/routes/bad", json={"segments": segments}).status_code == 422
+    assert client.get("/routes/bad").status_code == 404
+
+
+def test_unknown_route_on_compute():
+    assert client.post("/compute", json={"destination_time": "09:00", "route_id": "nope"}).status_code == 404
+    assert client.get("/compute", params={"destination_time": "09:00", "route_id": "nope"}).status_code == 404
+    assert client.post("/compute", json={"destination_time": "25:99"}).status_code == 422
+
+
+def test_journey_picks_best_registered_route(route_id):
+    default = client.post("/compute", json={"destination_time": "09:00"}).json()
+    only_default = client.post("/compute/journey", json={"destination_time": "09:00"})
+    assert only_default.status_code == 200
+    assert only_default.json()["recommended_departure_time"] == default["recommended_departure_time"]
+
+    routed = client.post("/compute", json={"destination_time": "09:00", "route_id": route_id}).json()
+    both = client.post("/compute/journey", json={"destination_time": "09:00", "route_ids": ["default", route_id]}).json()
+    assert both["recommended_departure_time"] == max(
+        default["recommended_departure_time"], routed["recommended_departure_time"]
+    )
+    legs = both["legs"]
+    assert legs[0]["from_stop"] == "origin" and legs[-1]["to_stop"] == "destination"
+    assert legs[-1]["arrive_by"] == "09:00"
+
+
+def test_journey_errors(never_boards):
+    assert client.post("/compute/journey", json={"destination_time": "09:00", "route_ids": ["nope"]}).status_code == 404
+    assert client.post("/compute/journey", json={"destination_time": "09:00", "route_ids": []}).status_code == 422
+    assert client.post("/compute/journey", json={"destination_time": "9시"}).status_code == 422
+    res = client.post("/compute/journey", json={"destination_time": "09:00"})
+    assert res.status_code == 400 and res.json()["detail"]
+
+
+def test_compute_maps_infeasible_route_to_400(never_boards):
+    res = client.post("/compute", json={"destination_time": "09:00"})
+    assert res.status_code == 400 and res.json()["detail"]
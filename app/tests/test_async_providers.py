@@ -0,0 +1,160 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from app.adapters.gbis_bus_eta_provider import AsyncGbisBusEtaProvider, GbisBusEtaProvider
+from app.adapters.http_client import create_async_client
+from app.adapters.seoul_subway_eta_provider import AsyncSeoulSubwayEtaProvider, SeoulSubwayEtaProvider
+from app.adapters.suin_bundang_position_eta_provider import (
+    AsyncSuinBundangPositionEtaProvider,
+    SuinBundangPositionEtaProvider,
+)
+from app.adapters.wait_provider_snapshot import build_wait_provider_snapshot_async
+
+DELAY_SEC = 0.3
+
+ARRIVALS_BY_STATION = {
+    "206000043": [{"routeName": "51", "predictTime1": 4, "predictTime2": 19}],
+    "203000075": [{"routeName": "5100", "predictTime1": 7, "predictTime2": ""}],
+    "203000999": [
+        {"routeName": "5100", "predictTime1": 2, "predictTime2": 12},
+        {"routeName": "1112", "predictTime1": 5, "predictTime2": 9},
+    ],
+}
+
+STATION_ARRIVALS = [
+    {"subwayId": "1075", "updnLine": "상행", "barvlDt": "60"},
+    {"subwayId": "1075", "updnLine": "하행", "barvlDt": "300"},
+    {"subwayId": "1077", "updnLine": "하행", "barvlDt": "120"},
+]
+
+POSITIONS = [
+    {"statnNm": "오리", "statnTnm": "인천", "recptnDt": ""},
+    {"statnNm": "정자", "statnTnm": "고색", "recptnDt": ""},
+]
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    hits: list[str] = []
+
+    def do_GET(self):
+        time.sleep(DELAY_SEC)
+        url = urlparse(self.path)
+        self.hits.append(url.path)
+
+        if url.path.endswith("getBusArrivalListv2"):
+            station = parse_qs(url.query)["stationId"][0]
+            body = {
+                "response": {
+                    "msgHeader": {"resultCode": 0},
+                    "msgBody": {"busArrivalList": ARRIVALS_BY_STATION.get(station, [])},
+                }
+            }
+        elif "/realtimeStationArrival/" in url.path:
+            body = {"errorMessage": {"status": 200}, "realtimeArrivalList": STATION_ARRIVALS}
+        elif "/realtimePosition/" in url.path:
+            body = {"errorMessage": {"status": 200}, "realtimePositionList": POSITIONS}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_server():
+    _FakeHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sync_provider_uses_base_url(fake_server):
+    bus = GbisBusEtaProvider(service_key="k", arrival_url=f"{fake_server}/getBusArrivalListv2")
+    assert bus.get_eta_minutes("206000043", "51") == 4
+
+
+def test_station_arrivals_one_call_for_many_routes(fake_server):
+    bus = GbisBusEtaProvider(service_key="k", arrival_url=f"{fake_server}/getBusArrivalListv2")
+
+    assert bus.get_station_arrivals("203000999") == {"5100": [2, 12], "1112": [5, 9]}
+    assert bus.get_eta_minutes("203000999", "5100") == 2
+    assert bus.get_eta_minutes("203000999", "1112") == 5
+    assert bus.get_next_arrivals("203000999", "1112") == [5, 9]
+    assert len(_FakeHandler.hits) == 1
+
+
+def test_sync_and_async_station_arrival_providers_agree(fake_server):
+    sync = SeoulSubwayEtaProvider(api_key="k", base_url=fake_server, updn_line="하행")
+
+    async def run():
+        async with create_async_client() as client:
+            provider = AsyncSeoulSubwayEtaProvider(client, api_key="k", base_url=fake_server, updn_line="하행")
+            assert not any(isinstance(v, requests.Session) for v in vars(provider).values())
+            return await provider.get_eta_minutes("미금역", "수인분당선"), await provider.get_next_arrivals(
+                "미금", "수인분당선"
+            )
+
+    assert asyncio.run(run()) == (sync.get_eta_minutes("미금", "수인분당선"), [5])
+
+
+def test_async_snapshot_fetches_concurrently(fake_server):
+    async def run():
+        async with create_async_client() as client:
+            bus = AsyncGbisBusEtaProvider(
+                client, service_key="k", arrival_url=f"{fake_server}/getBusArrivalListv2"
+            )
+            subway = AsyncSuinBundangPositionEtaProvider(client, api_key="k", base_url=fake_server)
+            # async provider는 sync provider를 상속하지 않고 쓰지 않는 requests.Session도 만들지 않는다
+            assert not isinstance(subway, SuinBundangPositionEtaProvider)
+            assert not any(isinstance(v, requests.Session) for v in vars(subway).values())
+            return await build_wait_provider_snapshot_async(
+                now=datetime(2026, 1, 5, 8, 0),
+                bus_provider=bus,
+                subway_provider=subway,
+                bus_stops=[
+                    ("206000043", "51"),
+                    ("203000075", "5100"),
+                    ("203000999", "5100"),
+                    ("203000999", "1112"),
+                ],
+                subway_stops=[("미금", "수인분당선"), ("청명", "수인분당선")],
+                max_wait_by_route={},
+            )
+
+    started = time.perf_counter()
+    snap = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    # 5개 조회가 직렬이면 >= 1.5s; 동시 조회면 가장 느린 1~2번 호출 수준
+    assert elapsed < DELAY_SEC * 3
+    # 버스는 정류소당 1번, 지하철 두 역은 realtimePosition 1번 fetch를 공유
+    assert sum(1 for p in _FakeHandler.hits if p.endswith("getBusArrivalListv2")) == 3
+    assert sum(1 for p in _FakeHandler.hits if "/realtimePosition/" in p) == 1
+
+    assert snap.arrivals_after_now[("206000043", "51")] == [4, 19]
+    assert snap.arrivals_after_now[("203000075", "5100")] == [7]
+    assert snap.arrivals_after_now[("203000999", "1112")] == [5, 9]
+    assert snap.arrivals_after_now[("미금", "수인분당선")] == [3]
+    assert snap.arrivals_after_now[("청명", "수인분당선")] == [15, 19]
@@ -0,0 +1,131 @@
+import csv
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.adapters.analyze_route_snapshot import analyze_file
+from app.adapters.binlog import (
+    ETA_SAMPLES,
+    ROUTE_SNAPSHOT,
+    BinLogReader,
+    BinLogWriter,
+    binlog_to_csv,
+    csv_to_binlog,
+)
+from app.adapters.collect_eta import write_samples_binlog
+from app.adapters.collect_route_snapshot import CSV_FIELDS
+from app.adapters.eta_provider import EtaSample
+
+
+def _write_route_csv(path, n, seed=1):
+    rng = random.Random(seed)
+    t = datetime(2026, 1, 5, 7, 0)
+    with path.open("w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        w.writeheader()
+        for _ in range(n):
+            t += timedelta(seconds=rng.choice([59, 60, 61]))
+            dep = rng.randint(400, 460)
+            w.writerow(
+                {
+                    "collected_at": t.isoformat(timespec="seconds"),
+                    "bus51_stop": "206000043", "bus51_eta_min": rng.choice(["", str(rng.randint(0, 20))]),
+                    "bus5100_stop": "203000075", "bus5100_eta_min": str(rng.randint(0, 30)),
+                    "subway_stop": "미금", "subway_route": "수인분당선",
+                    "subway_eta1_min": str(rng.randint(0, 5)), "subway_eta2_min": "", "subway_eta3_min": "",
+                    "destination_time": "10:00",
+                    "recommended_departure_time": rng.choice(["", f"{dep // 60:02d}:{dep % 60:02d}"]),
+                    "bus_error": rng.choice(["", "", 'HTTPError: 500 "bad",\nretry']),
+                    "subway_error": "",
+                    "engine_error": "",
+                }
+            )
+
+
+def test_route_csv_round_trip_and_smaller(tmp_path):
+    src, binp, back = tmp_path / "a.csv", tmp_path / "a.otlog", tmp_path / "b.csv"
+    _write_route_csv(src, 500)
+
+    assert csv_to_binlog(src, binp, ROUTE_SNAPSHOT) == 500
+    assert binlog_to_csv(binp, back) == 500
+    assert back.read_bytes() == src.read_bytes()
+    assert binp.stat().st_size * 2 < src.stat().st_size
+
+    with BinLogReader(binp) as reader:
+        assert len(reader) == 500 and reader.schema is ROUTE_SNAPSHOT
+
+
+def test_append_and_truncated_tail_ignored(tmp_path):
+    path = tmp_path / "eta.otlog"
+    t = datetime(2026, 1, 5, 8, 0)
+    write_samples_binlog(path, [EtaSample(t, "이마트앞", "51", 4, "dummy")])
+    write_samples_binlog(path, [EtaSample(t, "이마트앞", "51", None, "dummy", "ValueError: x")])
+    with path.open("ab") as f:
+        f.write(b"\x01\x02\x03")  # 쓰다가 끊긴 레코드
+
+    with BinLogReader(path) as reader:
+        assert reader.schema is ETA_SAMPLES
+        rows = list(reader.iter_dicts())
+    assert [r["eta_min"] for r in rows] == ["4", ""]
+    assert rows[1]["error"] == "ValueError: x"
+    assert rows[0]["collected_at"] == "2026-01-05T08:00:00"
+
+
+def test_analyzers_read_binlog_like_csv(tmp_path):
+    src, binp = tmp_path / "a.csv", tmp_path / "a.otlog"
+    _write_route_csv(src, 200, seed=4)
+    csv_to_binlog(src, binp, ROUTE_SNAPSHOT)
+
+    assert analyze_file(binp) == analyze_file(src)
+
+    pytest.importorskip("numpy")
+    from app.adapters.analyze_route_snapshot_columnar import analyze_files
+
+    assert analyze_files([binp, src]) == [analyze_file(src)] * 2
+
+
+def _eta_row(t, stop, error=""):
+    return {"collected_at": t.isoformat(), "stop": stop, "route": "51", "eta_min": "3", "provider": "p", "error": error}
+
+
+def test_many_error_strings_do_not_break_stop_ids(tmp_path, monkeypatch):
+    from app.adapters import binlog
+
+    path = tmp_path / "eta.otlog"
+    writer = binlog.BinLogWriter(path, ETA_SAMPLES)
+    t = datetime(2026, 1, 5, 8, 0)
+    # 에러 문자열이 많아 공유 id가 uint16 범위를 넘은 상태를 흉내
+    writer._strings.extend(f"err{i}" for i in range(70_000))
+    writer._ids.update({s: i for i, s in enumerate(writer._strings)})
+    writer._append_strings(writer._strings[1:])
+
+    assert writer.append([_eta_row(t, "새정류장")]) == 1
+    with BinLogReader(path) as reader:
+        assert next(reader.iter_dicts())["stop"] == "새정류장"
+
+
+@pytest.mark.parametrize("field, value", [("eta_min", "3분"), ("eta_min", "40000"), ("collected_at", "어제")])
+def test_malformed_values_raise_and_write_nothing(tmp_path, field, value):
+    path = tmp_path / "eta.otlog"
+    writer = BinLogWriter(path, ETA_SAMPLES)
+    t = datetime(2026, 1, 5, 8, 0)
+    assert writer.append([_eta_row(t, "이마트앞")]) == 1
+
+    bad = {**_eta_row(t, "새정류장"), field: value}
+    with pytest.raises(ValueError):
+        writer.append([_eta_row(t, "다른정류장"), bad])
+    # 실패한 batch의 새 문자열은 표에도 파일에도 남지 않는다
+    assert "새정류장" not in writer._ids and "다른정류장" not in writer._ids
+
+    with BinLogReader(path) as reader:
+        assert [r["stop"] for r in reader.iter_dicts()] == ["이마트앞"]
+        assert reader.strings == writer._strings
+
+
+def test_malformed_hhmm_raises(tmp_path):
+    row = {name: "" for name in CSV_FIELDS}
+    row.update(collected_at="2026-01-05T08:00:00", destination_time="10시")
+
+    with pytest.raises(ValueError, match="destination_time"):
+        BinLogWriter(tmp_path / "r.otlog", ROUTE_SNAPSHOT).append([row])
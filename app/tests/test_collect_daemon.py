@@ -0,0 +1,115 @@
+import csv
+import gzip
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.adapters.analyze_route_snapshot import open_log_text
+from app.adapters.binlog import ETA_SAMPLES
+from app.adapters.collect_daemon import QueuedRowWriter, RotatingRowWriter, run_collector
+from app.adapters.collect_eta import CSV_FIELDS
+
+
+def _rows(start: datetime, n: int, step_min: int = 30) -> list[dict]:
+    return [
+        {
+            "collected_at": (start + timedelta(minutes=i * step_min)).isoformat(timespec="seconds"),
+            "stop": "A", "route": "51", "eta_min": i % 10, "provider": "x", "error": "",
+        }
+        for i in range(n)
+    ]
+
+
+def _read(path) -> list[dict]:
+    with open_log_text(path) as f:
+        return list(csv.DictReader(f))
+
+
+def _writer(tmp_path, **kw) -> RotatingRowWriter:
+    return RotatingRowWriter(tmp_path, "eta", ".csv", CSV_FIELDS, ETA_SAMPLES, flush_rows=1, **kw)
+
+
+def test_daily_rotation_compresses_closed_segments(tmp_path):
+    rows = _rows(datetime(2026, 1, 5, 22, 0), 8)  # 22:00 ~ 다음날 01:30
+    with _writer(tmp_path, compress=True) as w:
+        w.write(rows[:3])
+        w.write(rows[3:])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["eta-20260105.csv.gz", "eta-20260106.csv"]
+    day1 = _read(tmp_path / "eta-20260105.csv.gz")
+    day2 = _read(tmp_path / "eta-20260106.csv")
+    assert [r["collected_at"] for r in day1 + day2] == [r["collected_at"] for r in rows]
+
+    # 재시작: 같은 날짜 세그먼트에 헤더 없이 이어 쓴다
+    with _writer(tmp_path, compress=True) as w:
+        w.write(_rows(datetime(2026, 1, 6, 2, 0), 2))
+    assert len(_read(tmp_path / "eta-20260106.csv")) == 6
+    with gzip.open(tmp_path / "eta-20260105.csv.gz", "rt", encoding="utf-8-sig") as f:
+        assert f.readline().startswith("collected_at,")
+
+
+def test_size_rotation_and_retention(tmp_path):
+    old = tmp_path / "eta-20250101.csv"
+    old.write_text("x\n")
+    os.utime(old, (time.time() - 10 * 86400,) * 2)
+    unrelated = tmp_path / "other-20250101.csv"
+    unrelated.write_text("x\n")
+    os.utime(unrelated, (time.time() - 10 * 86400,) * 2)
+
+    rows = _rows(datetime(2026, 1, 5, 8, 0), 12, step_min=1)
+    with _writer(tmp_path, max_bytes=300, keep_days=3) as w:
+        w.write(rows)
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert "eta-20250101.csv" not in names and "other-20250101.csv" in names
+    parts = [n for n in names if n.startswith("eta-20260105")]
+    assert len(parts) > 1
+    assert sum(len(_read(tmp_path / n)) for n in parts) == 12
+
+
+class SlowSink:
+    def __init__(self):
+        self.rows: list[dict] = []
+        self.gate = threading.Event()
+        self.closed = False
+
+    def write(self, rows):
+        self.gate.wait(5)
+        self.rows.extend(rows)
+
+    def close(self):
+        self.closed = True
+
+
+def test_queued_writer_never_blocks_and_flushes_on_close():
+    sink = SlowSink()
+    w = QueuedRowWriter(sink, max_pending=2)
+
+    t0 = time.monotonic()
+    for i in range(10):
+        w.write([{"i": i}])
+    assert time.monotonic() - t0 < 1
+    assert w.dropped_rows > 0
+
+    sink.gate.set()
+    w.close()
+    assert sink.closed
+    assert len(sink.rows) + w.dropped_rows == 10
+
+
+def test_run_collector_stops_on_signal_event_and_keeps_rows(tmp_path):
+    stop = threading.Event()
+    seen: list[datetime] = []
+
+    def collect(now: datetime) -> list[dict]:
+        seen.append(now)
+        if len(seen) == 3:
+            stop.set()  # SIGTERM 핸들러와 같은 효과
+        return _rows(now, 1)
+
+    with QueuedRowWriter(_writer(tmp_path, rotate="none")) as w:
+        rounds = run_collector(collect, w, interval_sec=0.05, count=None, stop=stop)
+
+    assert rounds == 3
+    assert len(_read(tmp_path / "eta.csv")) == 3
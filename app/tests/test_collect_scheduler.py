@@ -0,0 +1,137 @@
+import csv
+import threading
+import time
+from datetime import datetime
+
+from app.adapters.binlog import ETA_SAMPLES, ROUTE_SNAPSHOT, BinLogReader
+from app.adapters.collect_eta import CSV_FIELDS, collect_round
+from app.adapters.collect_route_snapshot import CSV_FIELDS as ROUTE_FIELDS
+from app.adapters.collect_route_snapshot import collect_round as collect_route_round
+from app.adapters.replay_route_snapshot import DEFAULT_MAX_WAIT, snapshot_from_row
+from app.services.decision_engine import FIXED_ROUTE_SEGMENTS, compute_departure_time
+from app.adapters.live_bindings import DEFAULT_LIVE_BINDINGS, plan_bindings
+from app.adapters.collect_scheduler import BufferedRowWriter, ConcurrentFetcher, RoundClock
+from app.adapters.eta_provider import EtaQuery
+
+
+class FakeTime:
+    def __init__(self, t: float):
+        self.t = t
+
+    def clock(self) -> float:
+        return self.t
+
+    def sleep(self, sec: float) -> None:
+        self.t += sec
+
+
+def test_round_clock_ticks_do_not_drift_and_skip_overruns():
+    ft = FakeTime(1000.3)
+    clock = RoundClock(20, clock=ft.clock, sleep=ft.sleep)
+
+    ticks = []
+    for work in [7.5, 3.0, 45.0, 1.0]:
+        ticks.append(clock.wait())
+        ft.t += work  # 라운드 소요 시간
+    # 소요 시간과 무관하게 20초 격자, 45초 라운드 뒤에는 놓친 tick 1개를 건너뜀
+    assert ticks == [1020, 1040, 1060, 1100]
+    assert clock.skipped == 1
+
+
+class SlowProvider:
+    name = "slow"
+
+    def __init__(self, slow_stop: str, release: threading.Event):
+        self.slow_stop = slow_stop
+        self.release = release
+        self.calls: list[str] = []
+
+    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        self.calls.append(stop)
+        if stop == self.slow_stop:
+            self.release.wait(5)
+        return 4
+
+
+def test_collect_round_times_out_one_target_without_blocking_others():
+    release = threading.Event()
+    provider = SlowProvider("B", release)
+    queries = [EtaQuery(s, "51") for s in "ABCD"]
+    now = datetime(2026, 1, 5, 8, 0, 20)
+
+    with ConcurrentFetcher(max_workers=8, timeout_sec=0.2) as fetcher:
+        t0 = time.monotonic()
+        batch = collect_round(fetcher, provider, queries, now)
+        assert time.monotonic() - t0 < 2
+
+        assert [s.eta_min for s in batch] == [4, None, 4, 4]
+        assert batch[1].error.startswith("TimeoutError")
+        assert all(s.collected_at == now for s in batch)
+
+        # 느린 호출이 끝나기 전에는 같은 대상을 다시 보내지 않는다
+        collect_round(fetcher, provider, queries, now)
+        assert provider.calls.count("B") == 1
+        release.set()
+
+
+def test_buffered_writer_writes_in_batches(tmp_path):
+    path = tmp_path / "eta.csv"
+    row = {"collected_at": "2026-01-05T08:00:00", "stop": "A", "route": "51", "eta_min": 3, "provider": "x", "error": ""}
+
+    with BufferedRowWriter(path, CSV_FIELDS, ETA_SAMPLES, flush_rows=3, flush_interval_sec=999) as w:
+        w.write([row, row])
+        assert path.read_text(encoding="utf-8-sig").splitlines() == [",".join(CSV_FIELDS)]
+        w.write([row])
+        assert w.rows_written == 3
+        w.write([row])
+    with BufferedRowWriter(path, CSV_FIELDS, ETA_SAMPLES) as w:
+        w.write([row])
+
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 5 and rows[-1]["eta_min"] == "3"
+
+    binp = tmp_path / "eta.otlog"
+    with BufferedRowWriter(binp, CSV_FIELDS, ETA_SAMPLES, flush_rows=2) as w:
+        w.write([row] * 3)
+    with BinLogReader(binp) as reader:
+        assert len(reader) == 3
+
+
+class FakeBus:
+    def get_station_arrivals(self, stop: str) -> dict[str, list[int]]:
+        if stop == "203000075":
+            raise RuntimeError("boom")
+        return {"51": [4, 19]}
+
+
+class FakeSubway:
+    def get_next_arrivals(self, stop: str, max_results: int = 3) -> list[int]:
+        return [3, 11]
+
+
+def test_route_round_keeps_partial_data(tmp_path):
+    now = datetime(2026, 1, 5, 7, 40)
+    with ConcurrentFetcher(max_workers=3, timeout_sec=2) as fetcher:
+        row = collect_route_round(fetcher, FakeBus(), FakeSubway(), now, "09:00")
+
+    assert row["bus51_eta_min"] == "4" and row["bus5100_eta_min"] == ""
+    assert row["bus_error"] == "RuntimeError: boom"
+    assert row["subway_eta2_min"] == "11" and row["subway_eta3_min"] == ""
+    assert row["engine_error"] == "" and row["recommended_departure_time"]
+    assert list(row) == ROUTE_FIELDS
+
+    out = tmp_path / "r.otlog"
+    with BufferedRowWriter(out, ROUTE_FIELDS, ROUTE_SNAPSHOT) as w:
+        w.write([row])
+    with BinLogReader(out) as reader:
+        assert list(reader.iter_dicts()) == [row]
+
+
+def test_route_round_engine_keys_match_replay():
+    now = datetime(2026, 1, 5, 7, 40)
+    with ConcurrentFetcher(max_workers=3, timeout_sec=2) as fetcher:
+        row = collect_route_round(fetcher, FakeBus(), FakeSubway(), now, "09:00", plan_bindings(DEFAULT_LIVE_BINDINGS))
+
+    replayed = compute_departure_time("09:00", FIXED_ROUTE_SEGMENTS, snapshot_from_row(row, DEFAULT_MAX_WAIT))
+    assert row["recommended_departure_time"] == replayed
@@ -0,0 +1,63 @@
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    Move,
+    compute_departure_minutes,
+    compute_departure_minutes_batch,
+    compute_departure_time,
+    minutes_to_hhmm,
+)
+
+
+def test_batch_matches_single_compute():
+    provider = HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+    destinations = list(range(0, 24 * 60, 5))
+
+    batch = compute_departure_minutes_batch(destinations, FIXED_ROUTE_SEGMENTS, provider)
+
+    assert [minutes_to_hhmm(m) for m in batch] == [
+        compute_departure_time(minutes_to_hhmm(d), FIXED_ROUTE_SEGMENTS, provider)
+        for d in destinations
+    ]
+
+
+def test_batch_reuses_stop_arrival_for_same_deadline():
+    calls = []
+
+    def wait_provider(stop: str, route: str, time_hhmm: str) -> int:
+        calls.append(time_hhmm)
+        return 0 if time_hhmm.endswith("0") else 9
+
+    segments = [Board(stop="이마트앞", route="51"), Move(5)]
+    compute_departure_minutes_batch([600, 600, 600], segments, wait_provider)
+    single = len(calls)
+
+    calls.clear()
+    compute_departure_minutes_batch([600], segments, wait_provider)
+    assert len(calls) == single
+
+
+def test_batch_negative_move_raises():
+    with pytest.raises(ValueError):
+        compute_departure_minutes_batch([600], [Move(-1)], lambda *a: 0)
+
+
+def test_batch_collects_per_item_errors():
+    # 08:00 이후엔 탈 수 없다 -> 09:00 도착은 탐색 범위(30분) 안에서 불가능, 08:20 도착은 계산된다
+    def wait_provider(stop: str, route: str, time_hhmm: str) -> int:
+        return 9999 if time_hhmm > "08:00" else 0
+
+    segments = [Board(stop="이마트앞", route="51"), Move(5)]
+    errors: dict[int, str] = {}
+    got = compute_departure_minutes_batch(
+        [540, 500, 540], segments, wait_provider, max_wait_search_min=30, errors=errors
+    )
+
+    assert got[0] is None and got[2] is None
+    assert got[1] == compute_departure_minutes(500, segments, wait_provider, max_wait_search_min=30)
+    assert set(errors) == {0, 2} and errors[0]
+    with pytest.raises(ValueError):
+        compute_departure_minutes_batch([540, 500], segments, wait_provider, max_wait_search_min=30)
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    Move,
+    compute_departure_minutes,
+    compute_departure_profile,
+)
+
+
+def _expand(profile) -> dict[int, int | None]:
+    out = {}
+    for step in profile:
+        for m in range(step.start_min, step.end_min + 1):
+            out[m] = step.departure_min
+    return out
+
+
+def _single(m, segments, provider, **kwargs):
+    try:
+        return compute_departure_minutes(m, segments, provider, **kwargs)
+    except ValueError:
+        return None
+
+
+def _scan_only(provider):
+    return lambda stop, route, time_hhmm: provider(stop, route, time_hhmm)
+
+
+def test_profile_matches_per_minute_compute():
+    headway = HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+    snap = WaitSnapshot(
+        now=datetime(2026, 1, 5, 7, 0),
+        arrivals_after_now={("migeum_station", "subway_suin"): [4, 12, 20], ("stop_b", "bus_5100"): [30, 55]},
+        max_wait_by_route={"bus_51": 10, "subway_suin": 8, "bus_5100": 15},
+    )
+
+    for provider in (headway, _scan_only(headway), snap, _scan_only(snap)):
+        profile = compute_departure_profile(7 * 60, 10 * 60, FIXED_ROUTE_SEGMENTS, provider)
+        values = _expand(profile)
+        assert sorted(values) == list(range(7 * 60, 10 * 60 + 1))
+        for m, departure in values.items():
+            assert departure == _single(m, FIXED_ROUTE_SEGMENTS, provider)
+        # 계단 함수: 이웃 구간은 출발이 다르다
+        assert all(a.departure_min != b.departure_min for a, b in zip(profile, profile[1:]))
+
+
+def test_profile_keeps_infeasible_ranges_and_wraps_midnight():
+    def wait_provider(stop: str, route: str, time_hhmm: str) -> int:
+        return 0 if time_hhmm.startswith(("23:", "00:")) else 9999
+
+    segments = [Move(5), Board(stop="X", route="51"), Move(10)]
+    profile = compute_departure_profile(23 * 60 + 50, 25 * 60 + 30, segments, wait_provider, max_wait_search_min=5)
+
+    values = _expand(profile)
+    for m, departure in values.items():
+        assert departure == _single(m, segments, wait_provider, max_wait_search_min=5)
+    assert any(step.departure_min is None and "stop='X'" in step.error for step in profile)
+    assert profile[0].departure_min == (23 * 60 + 50 - 10 - 3 - 5)
+
+
+def test_profile_scans_each_minute_about_once():
+    calls = []
+
+    def wait_provider(stop: str, route: str, time_hhmm: str) -> int:
+        calls.append(time_hhmm)
+        return 0 if time_hhmm.endswith("0") else 9
+
+    compute_departure_profile(6 * 60, 12 * 60, [Board(stop="A", route="51"), Move(5)], wait_provider)
+    assert len(calls) < 2 * (6 * 60 + 1)
+
+
+def test_profile_rejects_reversed_window():
+    with pytest.raises(ValueError):
+        compute_departure_profile(600, 599, FIXED_ROUTE_SEGMENTS, lambda *a: 0)
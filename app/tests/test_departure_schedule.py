@@ -0,0 +1,113 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    DepartureSchedule,
+    Move,
+    compute_departure_time,
+    minutes_to_hhmm,
+)
+
+
+def _scan_only(provider):
+    # 시각표 인터페이스를 숨겨 기존 분 단위 탐색 경로를 강제한다
+    return lambda stop, route, time_hhmm: provider(stop, route, time_hhmm)
+
+
+def _both_paths(destination_time, segments, provider, **kwargs):
+    try:
+        fast = compute_departure_time(destination_time, segments, provider, **kwargs)
+    except ValueError:
+        fast = "ValueError"
+    try:
+        slow = compute_departure_time(destination_time, segments, _scan_only(provider), **kwargs)
+    except ValueError:
+        slow = "ValueError"
+    return fast, slow
+
+
+def test_headway_schedule_matches_minute_scan_all_day():
+    provider = HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+    for m in range(0, 24 * 60, 7):
+        fast, slow = _both_paths(minutes_to_hhmm(m), FIXED_ROUTE_SEGMENTS, provider)
+        assert fast == slow
+
+
+def test_snapshot_schedule_matches_minute_scan_randomized():
+    rng = random.Random(7)
+    segments = [
+        Move(3),
+        Board(stop="미금역", route="수인분당선"),
+        Move(20),
+        Board(stop="203000075", route="5100"),
+        Move(12),
+    ]
+    for _ in range(300):
+        now = datetime(2026, 1, 5, rng.randrange(24), rng.randrange(60))
+        arrivals = {}
+        for key in [("미금", "수인분당선"), ("203000075", "5100")]:
+            if rng.random() < 0.8:
+                arrivals[key] = sorted(rng.sample(range(0, 60), rng.randint(1, 4)))
+        snap = WaitSnapshot(
+            now=now,
+            arrivals_after_now=arrivals,
+            max_wait_by_route={"수인분당선": rng.randint(0, 12), "5100": rng.randint(0, 30)},
+        )
+        dest = minutes_to_hhmm(now.hour * 60 + now.minute + rng.randint(-30, 200))
+        fast, slow = _both_paths(
+            dest, segments, snap, transfer_buffer_min=rng.randint(0, 4), max_wait_search_min=rng.randint(0, 60)
+        )
+        assert fast == slow
+
+
+def test_schedule_none_falls_back_to_scan():
+    calls = []
+
+    class Provider:
+        def __call__(self, stop, route, time_hhmm):
+            calls.append(time_hhmm)
+            return 7
+
+        def departure_schedule(self, stop, route):
+            return None
+
+    segments = [Move(5), Board(stop="이마트앞", route="51"), Move(30)]
+    assert compute_departure_time("10:00", segments, Provider()) == "09:15"
+    assert calls
+
+
+def test_departure_schedule_rejects_unsorted():
+    with pytest.raises(ValueError):
+        DepartureSchedule(departures=(10, 5))
+
+
+def test_minute_wait_provider_is_called_with_ints():
+    calls = []
+
+    class Provider:
+        def __call__(self, stop, route, time_hhmm):
+            raise AssertionError("string path should not be used")
+
+        def wait_minutes(self, stop, route, minute_of_day):
+            calls.append(minute_of_day)
+            return 7
+
+    segments = [Move(5), Board(stop="이마트앞", route="51"), Move(30)]
+    assert compute_departure_time("00:20", segments, Provider()) == "23:35"
+    assert calls and all(isinstance(m, int) and 0 <= m < 24 * 60 for m in calls)
+
+
+def test_snapshot_wait_minutes_matches_hhmm_wait():
+    snap = WaitSnapshot(
+        now=datetime(2026, 1, 5, 23, 50),
+        arrivals_after_now={("미금", "수인분당선"): [3, 11, 25]},
+        max_wait_by_route={"수인분당선": 10},
+    )
+    for m in range(24 * 60):
+        assert snap.wait_minutes("미금역", "수인분당선", m) == snap("미금역", "수인분당선", minutes_to_hhmm(m))
@@ -0,0 +1,138 @@
+import asyncio
+
+from app.services.departure_stream import DepartureBroadcaster, sse_event
+
+
+class FakeSource:
+    def __init__(self):
+        self.version = 1
+        self.departures = {"a": "07:21", "b": "08:00"}
+        self.calls: list[str] = []
+
+    def compute(self, key):
+        self.calls.append(key)
+        return {"departure": self.departures[key], "version": self.version}
+
+
+def test_same_key_subscribers_share_computation_and_get_only_changes():
+    source = FakeSource()
+    hub = DepartureBroadcaster(source.compute, lambda: source.version, poll_sec=0.01)
+
+    async def run():
+        q1 = await hub.subscribe("a")
+        q2 = await hub.subscribe("a")
+        q3 = await hub.subscribe("b")
+        first = [q.get_nowait() for q in (q1, q2, q3)]
+        assert source.calls == ["a", "b"]
+
+        # 새 버전이지만 결과가 같으면 push 없음
+        source.version = 2
+        await asyncio.sleep(0.05)
+        assert q1.empty() and q3.empty()
+        assert sorted(source.calls) == ["a", "a", "b", "b"]
+
+        source.version = 3
+        source.departures["a"] = "07:29"
+        await asyncio.sleep(0.05)
+        pushed = [q1.get_nowait(), q2.get_nowait()]
+        assert q3.empty()
+
+        hub.unsubscribe("a", q1)
+        hub.unsubscribe("a", q2)
+        hub.unsubscribe("b", q3)
+        await asyncio.sleep(0.05)
+        return first, pushed
+
+    first, pushed = asyncio.run(run())
+    assert [p["departure"] for p in first] == ["07:21", "07:21", "08:00"]
+    assert pushed == [{"departure": "07:29", "version": 3}] * 2
+    assert hub.subscriber_count == 0
+
+
+def test_slow_subscriber_keeps_latest_messages():
+    source = FakeSource()
+    hub = DepartureBroadcaster(source.compute, lambda: source.version, poll_sec=0.01, max_queue=2)
+
+    async def run():
+        queue = await hub.subscribe("a")
+        for i in range(5):
+            source.version += 1
+            source.departures["a"] = f"07:0{i}"
+            await hub.publish()
+        hub.unsubscribe("a", queue)
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert [p["departure"] for p in asyncio.run(run())] == ["07:03", "07:04"]
+
+
+def test_failed_first_compute_does_not_leave_subscriber():
+    def boom(key):
+        raise RuntimeError("down")
+
+    hub = DepartureBroadcaster(boom, lambda: 1, poll_sec=0.01)
+
+    async def run():
+        try:
+            await hub.subscribe("a")
+        except RuntimeError:
+            pass
+
+    asyncio.run(run())
+    assert hub.subscriber_count == 0
+
+
+def test_failed_first_compute_reaches_concurrent_subscribers():
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        if len(calls) == 1:
+            import time
+
+            time.sleep(0.05)
+            raise RuntimeError("down")
+        return {"departure": "07:21"}
+
+    hub = DepartureBroadcaster(compute, lambda: 1, poll_sec=0.01)
+
+    async def run():
+        results = await asyncio.gather(hub.subscribe("a"), hub.subscribe("a"), return_exceptions=True)
+        # 실패한 topic은 남지 않으므로 다음 구독은 새로 계산한다
+        queue = await hub.subscribe("a")
+        return results, queue.get_nowait()
+
+    results, later = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert later == {"departure": "07:21"} and len(calls) == 2
+
+
+def test_cancelled_first_subscriber_hands_over_compute():
+    import threading
+
+    gate = threading.Event()
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        gate.wait(2)
+        return {"departure": "07:21"}
+
+    hub = DepartureBroadcaster(compute, lambda: 1, poll_sec=0.01)
+
+    async def run():
+        first = asyncio.create_task(hub.subscribe("a"))
+        await asyncio.sleep(0.02)
+        second = asyncio.create_task(hub.subscribe("a"))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        await asyncio.sleep(0.02)
+        gate.set()
+        queue = await asyncio.wait_for(second, 2)
+        return queue.get_nowait()
+
+    assert asyncio.run(run()) == {"departure": "07:21"}
+    assert len(calls) == 2
+
+
+def test_sse_event_format():
+    assert sse_event({"t": "07:21"}) == 'event: departure\ndata: {"t": "07:21"}\n\n'
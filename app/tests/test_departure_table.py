@@ -0,0 +1,47 @@
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    Move,
+    compute_departure_minutes,
+)
+from app.services.departure_table import DepartureTable, DepartureTableCache
+
+
+def test_table_matches_engine_for_every_minute():
+    provider = HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+    table = DepartureTable.build(FIXED_ROUTE_SEGMENTS, provider)
+
+    for m in range(24 * 60):
+        assert table.lookup(m) == compute_departure_minutes(m, FIXED_ROUTE_SEGMENTS, provider)
+
+
+def test_table_keeps_per_minute_errors():
+    def wait_provider(stop: str, route: str, time_hhmm: str) -> int:
+        return 0 if time_hhmm.startswith("10:") else 9999
+
+    table = DepartureTable.build([Board(stop="X", route="51")], wait_provider, max_wait_search_min=5)
+
+    assert table.lookup(10 * 60 + 30) == 10 * 60 + 30 - 3
+    with pytest.raises(ValueError):
+        table.lookup(12 * 60)
+
+
+def test_cache_rebuilds_on_route_or_provider_change():
+    cache = DepartureTableCache()
+    provider = HeadwayWaitProvider({"51": 10})
+    segments = [Move(5), Board(stop="X", route="51"), Move(10)]
+
+    first = cache.get(segments, provider)
+    assert cache.get(segments, provider) is first
+
+    segments.append(Move(1))
+    second = cache.get(segments, provider)
+    assert second is not first
+
+    assert cache.get(segments, HeadwayWaitProvider({"51": 10})) is not second
+
+    cache.invalidate()
+    assert cache.get(segments, provider) is not second
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from datetime import datetime
+
+from app.adapters.fallback_eta_provider import (
+    AsyncFallbackEtaProvider,
+    CircuitBreaker,
+    EtaSource,
+    arrival_api_source,
+    headway_source,
+)
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.tests.fake_clock import FakeClock
+
+
+def test_breaker_opens_then_allows_one_trial():
+    clock = FakeClock(100.0)
+    b = CircuitBreaker(failure_threshold=2, reset_after_sec=10, clock=clock)
+
+    b.record_failure()
+    assert b.allow()
+    b.record_failure()
+    assert b.state == "open" and not b.allow()
+
+    clock.now += 11
+    assert b.allow() and not b.allow()  # half-open: 시험 호출 1번만
+    b.record_failure()
+    assert b.state == "open"
+
+    clock.now += 11
+    assert b.allow()
+    b.record_success()
+    assert b.state == "closed" and b.allow()
+
+
+class Counting:
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, stop, route, n):
+        self.calls += 1
+        return self.fn()
+
+
+async def _slow():
+    await asyncio.sleep(1.0)
+    return [1]
+
+
+def _headway():
+    return headway_source(HeadwayWaitProvider({}, default_headway=8), clock=lambda: datetime(2026, 1, 5, 8, 3))
+
+
+def test_slow_source_is_cut_by_budget_and_next_source_answers():
+    slow = Counting(_slow)
+    chain = AsyncFallbackEtaProvider(
+        "수인분당선",
+        [EtaSource("position", slow), EtaSource("arrival_api", Counting(lambda: [4]))],
+        budget_sec=0.3,
+    )
+
+    t0 = time.monotonic()
+    res = asyncio.run(chain.lookup("미금"))
+    assert time.monotonic() - t0 < 0.8
+    # 예산을 다 쓴 뒤라 arrival_api는 건너뛴다
+    assert res.source is None and res.etas == []
+    assert res.errors[0].startswith("position: TimeoutError")
+    assert res.errors[1] == "arrival_api: no budget left"
+
+    chain.sources.append(_headway())
+    res = asyncio.run(chain.lookup("미금"))
+    assert res.source == "headway" and res.etas == [5, 13, 21]
+    assert chain.last_sources["미금"] == "headway"
+
+
+def test_failing_source_is_skipped_while_circuit_is_open():
+    def boom():
+        raise RuntimeError("502")
+
+    failing = Counting(boom)
+    empty = Counting(lambda: [])
+    chain = AsyncFallbackEtaProvider(
+        "수인분당선",
+        [
+            EtaSource("position", failing, CircuitBreaker(failure_threshold=2, reset_after_sec=60)),
+            EtaSource("arrival_api", empty, CircuitBreaker(failure_threshold=1)),
+            _headway(),
+        ],
+    )
+
+    for _ in range(4):
+        assert asyncio.run(chain.get_next_arrivals("미금", max_results=1)) == [5]
+    assert failing.calls == 2
+    # 데이터 없음은 실패가 아니다 -> 차단되지 않음
+    assert empty.calls == 4
+    assert asyncio.run(chain.lookup("미금")).errors[:2] == ("position: circuit open", "arrival_api: no data")
+
+
+class HangingSeoul:
+    name = "seoul_subway"
+
+    def __init__(self, eta):
+        self.eta = eta
+
+    async def get_next_arrivals(self, stop, route, max_results=3):
+        if self.eta is None:
+            await asyncio.sleep(10)
+        return [self.eta, self.eta + 8][:max_results]
+
+
+def test_async_chain_bounds_latency():
+    async def hang(stop, route, n):
+        await asyncio.sleep(10)
+
+    chain = AsyncFallbackEtaProvider(
+        "수인분당선",
+        [EtaSource("position", hang), arrival_api_source(HangingSeoul(6)), _headway()],
+        budget_sec=0.4,
+        source_timeout_sec=0.15,
+    )
+
+    async def run():
+        t0 = time.monotonic()
+        res = await chain.lookup("미금")
+        return res, time.monotonic() - t0
+
+    res, elapsed = asyncio.run(run())
+    assert elapsed < 0.6
+    assert res.source == "seoul_subway" and res.etas == [6]
+    assert asyncio.run(chain.get_eta_minutes("미금")) == 6
+
+
+def test_snapshot_sources_follow_aliases():
+    snap = WaitSnapshot(
+        now=datetime(2026, 1, 5, 8, 0),
+        arrivals_after_now={("미금", "수인분당선"): [3]},
+        max_wait_by_route={},
+        sources={("미금", "수인분당선"): "headway"},
+    )
+    aliased = snap.with_aliases({("migeum_station", "subway_suin"): ("미금역", "수인분당선")})
+    assert aliased.sources[("migeum_station", "subway_suin")] == "headway"
+
+
+def test_arrival_api_fallback_keeps_position_direction():
+    from app.adapters.seoul_subway_eta_provider import _SeoulArrivalApi
+    from app.adapters.suin_bundang_position_eta_provider import SUIN_BUNDANG_FORWARD_UPDN_LINE
+
+    data = {
+        "realtimeArrivalList": [
+            {"subwayId": "1075", "updnLine": "상행", "barvlDt": "60"},
+            {"subwayId": "1075", "updnLine": "하행", "barvlDt": "300"},
+        ]
+    }
+    both = _SeoulArrivalApi(api_key="k")
+    forward = _SeoulArrivalApi(api_key="k", updn_line=SUIN_BUNDANG_FORWARD_UPDN_LINE)
+
+    assert both.etas(data, "수인분당선") == [1, 5]
+    assert forward.etas(data, "수인분당선") == [5]
@@ -0,0 +1,91 @@
+from app.adapters.gbis_bus_eta_provider import GbisBusEtaProvider
+from app.adapters.gbis_cache import STATION_SEARCH, GbisLookupCache
+from app.tests.fake_clock import FakeClock
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "gbis.json"
+    GbisLookupCache(path).put(STATION_SEARCH, "이마트앞", [{"stationId": "206000043"}])
+
+    assert GbisLookupCache(path).get(STATION_SEARCH, "이마트앞") == [{"stationId": "206000043"}]
+    assert GbisLookupCache(path).get(STATION_SEARCH, "없는정류장") is None
+
+
+def test_cache_entries_expire(tmp_path):
+    clock = FakeClock(1_000_000.0)
+    cache = GbisLookupCache(tmp_path / "gbis.json", ttl_sec=60, clock=clock)
+    cache.put(STATION_SEARCH, "k", ["v"])
+
+    clock.now += 61
+    assert cache.get(STATION_SEARCH, "k") is None
+    assert GbisLookupCache(tmp_path / "gbis.json", ttl_sec=60, clock=clock).get(STATION_SEARCH, "k") is None
+
+
+def test_lru_is_bounded_and_falls_back_to_disk(tmp_path):
+    cache = GbisLookupCache(tmp_path / "gbis.json", max_entries=2)
+    for i in range(5):
+        cache.put(STATION_SEARCH, str(i), i)
+
+    assert len(cache._lru) == 2
+    assert cache.get(STATION_SEARCH, "0") == 0
+
+
+def test_provider_resolves_keyword_once(tmp_path):
+    calls = []
+
+    def fake_get_json(url, params):
+        calls.append(url)
+        if "keyword" in params:
+            stations = [{"stationId": "206000043", "stationName": "이마트앞"}]
+            return {"response": {"msgHeader": {"resultCode": 0}, "msgBody": {"busStationList": stations}}}
+        arrivals = [{"routeName": "51", "predictTime1": 3, "predictTime2": 11}]
+        return {"response": {"msgHeader": {"resultCode": 0}, "msgBody": {"busArrivalList": arrivals}}}
+
+    path = tmp_path / "gbis.json"
+    for _ in range(2):  # 두 번째 인스턴스 = 재시작
+        bus = GbisBusEtaProvider(service_key="k", lookup_cache=GbisLookupCache(path), station_ttl_sec=0)
+        bus._get_json = fake_get_json
+        assert bus.get_eta_minutes("이마트앞", "51") == 3
+        assert bus.get_eta_minutes("이마트앞", "51") == 3
+
+    search_calls = [u for u in calls if "StationList" in u]
+    assert len(search_calls) == 1
+
+
+def test_concurrent_writers_do_not_lose_entries(tmp_path):
+    import threading
+
+    path = tmp_path / "gbis.json"
+    caches = [GbisLookupCache(path) for _ in range(4)]  # 프로세스마다 인스턴스 1개인 상황
+
+    def write(i):
+        for j in range(10):
+            caches[i].put(STATION_SEARCH, f"{i}-{j}", j)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    fresh = GbisLookupCache(path)
+    assert all(fresh.get(STATION_SEARCH, f"{i}-{j}") == j for i in range(4) for j in range(10))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_file_is_parsed_only_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "gbis.json"
+    GbisLookupCache(path).put(STATION_SEARCH, "a", 1)
+    reader = GbisLookupCache(path, max_entries=1)
+
+    reads = []
+    original = reader._read_file
+    monkeypatch.setattr(reader, "_read_file", lambda: reads.append(1) or original())
+
+    for key in ["a", "x", "y", "a"]:
+        reader.get(STATION_SEARCH, key)
+    assert len(reads) == 1
+
+    GbisLookupCache(path).put(STATION_SEARCH, "b", 2)
+    assert reader.get(STATION_SEARCH, "b") == 2
+    assert len(reads) == 2
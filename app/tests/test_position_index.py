@@ -0,0 +1,166 @@
+import math
+import random
+from datetime import datetime
+
+import pytest
+
+from app.adapters.subway_line_graph import BACKWARD, FORWARD, LineGraph, load_line_graphs
+from app.adapters.subway_position_eta_provider import (
+    PositionFeedCache,
+    SubwayPositionEtaProvider,
+    _PositionIndex,
+)
+from app.adapters.suin_bundang_position_eta_provider import (
+    SUIN_BUNDANG_ORDER,
+    SuinBundangPositionEtaProvider,
+)
+
+
+class _CountingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        rows = self.rows
+
+        class _Resp:
+            status_code = 200
+            text = ""
+
+            @staticmethod
+            def json():
+                return {"errorMessage": {"status": 200}, "realtimePositionList": rows}
+
+        return _Resp()
+
+
+def _naive_arrivals(rows, t_idx, toward_idx, max_results, per_station=2.0, dwell=0.5):
+    # 색인 도입 전 방식: 매 조회마다 전체 row를 훑는다(recptnDt 없음 -> age 0)
+    idx = {n: i for i, n in enumerate(SUIN_BUNDANG_ORDER)}
+    etas = []
+    for x in rows:
+        cur_idx = idx.get(x["statnNm"].removesuffix("역"))
+        term_idx = idx.get(x["statnTnm"].removesuffix("역"))
+        if cur_idx is None or term_idx is None:
+            continue
+        if term_idx < cur_idx or term_idx < toward_idx or cur_idx > t_idx:
+            continue
+        etas.append(int(math.ceil((t_idx - cur_idx) * per_station + dwell)))
+    return sorted(set(etas))[:max_results]
+
+
+def _random_rows(rng, n):
+    names = SUIN_BUNDANG_ORDER + ["없는역"]
+    return [
+        {
+            "statnNm": rng.choice(names) + rng.choice(["", "역"]),
+            "statnTnm": rng.choice(names),
+            "recptnDt": "",
+        }
+        for _ in range(n)
+    ]
+
+
+def test_index_sorted_and_sliced():
+    graph = load_line_graphs()["수인분당선"]
+    index = _PositionIndex.from_rows(
+        [
+            {"statnNm": "정자", "statnTnm": "인천"},
+            {"statnNm": "왕십리", "statnTnm": "고색"},
+            {"statnNm": "없는역", "statnTnm": "인천"},
+            {"statnNm": "오리", "statnTnm": "왕십리"},
+        ],
+        graph,
+    )
+    assert len(index) == 3
+    forward = index.lanes[("main", FORWARD)]
+    assert [t.cur for t in forward.trains] == [0, 20]
+    assert len(forward.at_or_before(19)) == 1
+    # 반대 방향은 위치 부호를 뒤집어 같은 방식으로 slice
+    assert [t.cur for t in index.lanes[("main", BACKWARD)].trains] == [-22]
+
+
+def test_indexed_matches_naive_scan():
+    rng = random.Random(7)
+    toward = "청명"
+    provider = SuinBundangPositionEtaProvider(api_key="k", toward_station=toward, feed=PositionFeedCache())
+    toward_idx = SUIN_BUNDANG_ORDER.index(toward)
+
+    for _ in range(30):
+        rows = _random_rows(rng, rng.randint(0, 80))
+        index = provider._model.store_index({"realtimePositionList": rows}, datetime.now().timestamp())
+
+        for t_idx in range(toward_idx + 1):
+            queries = provider._model.lane_queries(SUIN_BUNDANG_ORDER[t_idx], None, None)
+            got = provider._model.arrivals_from_index(index, queries, 3, datetime.now())
+            assert got == _naive_arrivals(rows, t_idx, toward_idx, 3)
+
+
+def test_branch_prefix_and_both_directions():
+    graph = load_line_graphs()["5호선"]
+    assert graph.branches["마천"][0] == "방화"
+    assert graph.branches_with("천호", "마천") == ["마천"]
+    assert sorted(graph.branches_with("천호")) == ["마천", "하남"]
+
+    rows = [
+        {"statnNm": "광나루", "statnTnm": "마천"},       # 공통 구간 -> 마천 branch
+        {"statnNm": "아차산", "statnTnm": "하남검단산"},  # 공통 구간 -> 하남 branch
+        {"statnNm": "강동", "statnTnm": "방화"},         # 반대 방향
+    ]
+    session = _CountingSession(rows)
+    provider = SubwayPositionEtaProvider(
+        api_key="k", line_name="5호선", session=session, feed=PositionFeedCache()
+    )
+
+    # 천호(광나루 다음) 정방향: 두 branch 열차 모두
+    assert provider.get_next_arrivals("천호") == [3, 5]
+    # 마천 방향 열차만
+    assert provider.get_next_arrivals("천호", toward="마천") == [3]
+    # 천호 -> 방화 방향은 강동에서 오는 열차
+    assert provider.get_next_arrivals("천호", toward="방화") == [3]
+    assert provider.get_next_arrivals("천호", direction=BACKWARD) == [3]
+    assert session.calls == 1
+
+
+def test_feed_shared_across_instances_and_directions():
+    feed = PositionFeedCache()
+    session = _CountingSession([{"statnNm": "미금", "statnTnm": "신사"}])
+    kwargs = dict(api_key="k", line_name="신분당선", session=session, feed=feed)
+
+    to_gwanggyo = SubwayPositionEtaProvider(toward_station="광교", **kwargs)
+    to_sinsa = SubwayPositionEtaProvider(toward_station="신사", **kwargs)
+
+    assert to_gwanggyo.get_next_arrivals("동천") == []
+    assert to_sinsa.get_next_arrivals("판교") == [5]
+    assert to_sinsa.get_next_arrivals("강남") == [13]
+    assert session.calls == 1
+
+
+def test_stop_past_toward_uses_trains_heading_toward():
+    rows = [
+        {"statnNm": "고색", "statnTnm": "왕십리"},  # 수원 다음 역, 청명 쪽으로 오는 열차
+        {"statnNm": "수원시청", "statnTnm": "인천"},  # 수원 두 역 전, 정방향 열차
+    ]
+    provider = SuinBundangPositionEtaProvider(api_key="k", session=_CountingSession(rows), feed=PositionFeedCache())
+
+    # 수원은 청명 이후 -> 청명 방향(역방향) 열차로 답한다(초기 구현은 정방향 열차를 셌다)
+    assert provider.get_next_arrivals("수원") == [3]
+    assert provider.get_next_arrivals("수원", direction=FORWARD) == [5]
+    assert provider.get_next_arrivals("미금") == []
+
+
+def test_empty_feed_is_cached_for_ttl():
+    # 운행 열차가 없는 시간대에도 조회마다 다시 fetch하지 않는다
+    session = _CountingSession([])
+    provider = SuinBundangPositionEtaProvider(api_key="k", session=session, feed=PositionFeedCache())
+
+    assert provider.get_next_arrivals("미금") == []
+    assert provider.get_next_arrivals("정자") == []
+    assert session.calls == 1
+
+
+def test_line_graph_from_dict_rejects_duplicates():
+    with pytest.raises(ValueError):
+        LineGraph("x", {"main": ["a", "b", "a"]})
@@ -0,0 +1,65 @@
+import csv
+import io
+
+from app.adapters.replay_route_snapshot import (
+    REPLAY_FIELDS,
+    build_policy_grid,
+    replay_file,
+    replay_rows,
+    snapshot_from_row,
+)
+from app.services.decision_engine import FIXED_ROUTE_SEGMENTS, compute_departure_time, hhmm_to_minutes
+
+ROW = {
+    "collected_at": "2026-01-05T07:40:00",
+    "bus51_stop": "206000043", "bus51_eta_min": "4",
+    "bus5100_stop": "203000075", "bus5100_eta_min": "",
+    "subway_stop": "미금", "subway_route": "수인분당선",
+    "subway_eta1_min": "3", "subway_eta2_min": "11", "subway_eta3_min": "",
+    "destination_time": "09:00",
+}
+
+
+def test_snapshot_from_row_maps_engine_keys():
+    snap = snapshot_from_row(ROW, {"51": 15, "5100": 25, "수인분당선": 10})
+
+    assert snap.arrivals_after_now[("migeum_station", "subway_suin")] == [3, 11]
+    assert snap.arrivals_after_now[("stop_c", "bus_51")] == [4]
+    assert ("stop_b", "bus_5100") not in snap.arrivals_after_now
+    # 엔진 노선명에도 정책 max_wait이 적용된다
+    assert snap.wait_minutes("stop_b", "bus_5100", 7 * 60 + 50) == 25
+
+
+def test_replay_rows_grid_matches_direct_engine_call():
+    policies = build_policy_grid([2, 5], ["", "5100=40"])
+    destinations = [hhmm_to_minutes("08:30"), hhmm_to_minutes("09:00")]
+    out = replay_rows([ROW], policies, destinations)
+
+    assert len(out) == 4 * 2
+    by_key = {(r[1], r[2]): r for r in out}
+    for policy in policies:
+        snap = snapshot_from_row(ROW, dict(policy.max_wait_by_route))
+        expected = compute_departure_time(
+            "09:00", FIXED_ROUTE_SEGMENTS, snap, transfer_buffer_min=policy.transfer_buffer_min
+        )
+        assert by_key[(policy.name, "09:00")][3] == expected
+
+
+def test_replay_file_parallel_output_matches_serial(tmp_path):
+    path = tmp_path / "snap.csv"
+    with path.open("w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=list(ROW))
+        w.writeheader()
+        for i in range(25):
+            w.writerow({**ROW, "collected_at": f"2026-01-05T07:{i:02d}:00", "bus51_eta_min": str(i % 7)})
+
+    policies = build_policy_grid([3, 4], [""])
+    destinations = [hhmm_to_minutes("08:50"), hhmm_to_minutes("09:00")]
+
+    serial, parallel = io.StringIO(), io.StringIO()
+    n = replay_file(path, serial, policies, destinations, workers=1, chunk_rows=4)
+    replay_file(path, parallel, policies, destinations, workers=2, chunk_rows=4)
+
+    assert n == 25 * 2 * 2
+    assert serial.getvalue() == parallel.getvalue()
+    assert serial.getvalue().splitlines()[0] == ",".join(REPLAY_FIELDS)
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.main import app
+from app.services.result_cache import ComputeResultCache, etag_matches
+
+
+def test_results_are_reused_until_version_changes():
+    cache = ComputeResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 421
+
+    first = cache.get("fp", "s1", 540, compute)
+    assert cache.get("fp", "s1", 540, compute) is first
+    assert first.departure_min == 421 and len(calls) == 1
+
+    second = cache.get("fp", "s2", 540, compute)
+    assert second.etag != first.etag and len(calls) == 2
+    assert cache.hits == 1 and cache.misses == 2
+
+
+def test_infeasible_results_are_cached_as_errors():
+    cache = ComputeResultCache()
+
+    def infeasible():
+        raise ValueError("No feasible stop arrival time")
+
+    result = cache.get("fp", "stub", 60, infeasible)
+    assert result.departure_min is None and "No feasible" in result.error
+    assert cache.get("fp", "stub", 60, lambda: 1) is result
+
+
+def test_provider_versions_come_from_content():
+    def snap(etas, now=datetime(2026, 1, 5, 8, 0, 12)):
+        return WaitSnapshot(now=now, arrivals_after_now={("미금", "수인분당선"): etas}, max_wait_by_route={"51": 10})
+
+    # 다른 프로세스/발행 순서에서 만든 같은 내용 -> 같은 버전
+    assert snap([3, 11]).content_version == snap([3, 11], now=datetime(2026, 1, 5, 8, 0, 40)).content_version
+    assert snap([3, 11]).content_version != snap([4, 11]).content_version
+    assert snap([3]).content_version != snap([3], now=datetime(2026, 1, 5, 8, 1)).content_version
+
+    assert HeadwayWaitProvider({"51": 10}).content_version == HeadwayWaitProvider({"51": 10}).content_version
+    assert HeadwayWaitProvider({"51": 10}).content_version != HeadwayWaitProvider({"51": 12}).content_version
+
+
+def test_etag_matching():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_get_compute_revalidates_with_304():
+    client = TestClient(app)
+
+    first = client.get("/compute", params={"destination_time": "09:00"})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+
+    again = client.get("/compute", params={"destination_time": "09:00"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+
+    other = client.get("/compute", params={"destination_time": "09:10"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+    posted = client.post("/compute", json={"destination_time": "09:00"})
+    assert posted.json() == first.json() and posted.headers["etag"] == etag
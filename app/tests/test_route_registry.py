@@ -0,0 +1,99 @@
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    Move,
+    compile_plan,
+    compute_departure_minutes_batch,
+    compute_departure_profile,
+)
+from app.services.departure_table import DepartureTableCache
+from app.services.route_registry import RouteRegistry
+
+
+def test_compiled_plan_merges_moves_and_matches_segments():
+    plan = compile_plan(FIXED_ROUTE_SEGMENTS)
+    assert plan.steps == (
+        20,
+        Board(stop="stop_c", route="bus_51"),
+        20,
+        Board(stop="stop_b", route="bus_5100"),
+        32,
+        Board(stop="migeum_station", route="subway_suin"),
+        8,
+    )
+
+    provider = HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+    destinations = list(range(0, 24 * 60, 13))
+    assert compute_departure_minutes_batch(destinations, plan, provider) == compute_departure_minutes_batch(
+        destinations, FIXED_ROUTE_SEGMENTS, provider
+    )
+    assert compute_departure_profile(480, 540, plan, provider) == compute_departure_profile(
+        480, 540, FIXED_ROUTE_SEGMENTS, provider
+    )
+
+
+@pytest.mark.parametrize(
+    "segments",
+    [[Move(-1)], [Board(stop="", route="51")], [Move(1.5)], ["walk"]],
+)
+def test_invalid_routes_are_rejected_at_registration(segments):
+    registry = RouteRegistry()
+    with pytest.raises((ValueError, TypeError)):
+        registry.register("r", segments)
+    assert "r" not in registry
+
+
+def test_plans_are_evicted_and_recompiled_from_definitions():
+    registry = RouteRegistry(max_plans=2)
+    for i in range(3):
+        registry.register(f"r{i}", [Move(i), Board(stop="X", route="51")])
+    assert registry.compiles == 3
+
+    assert registry.plan("r2") is registry.plan("r2")
+    assert registry.compiles == 3
+    assert registry.plan("r0").steps == (Board(stop="X", route="51"), 0)
+    assert registry.compiles == 4
+
+    assert registry.remove("r1") and not registry.remove("r1")
+    with pytest.raises(KeyError):
+        registry.plan("r1")
+
+
+def test_table_cache_keeps_one_table_per_route():
+    registry = RouteRegistry()
+    registry.register("a", FIXED_ROUTE_SEGMENTS)
+    registry.register("b", [Move(5), Board(stop="X", route="51"), Move(10)])
+    registry.register("a-copy", FIXED_ROUTE_SEGMENTS)
+
+    cache = DepartureTableCache(max_tables=2)
+    provider = HeadwayWaitProvider({"51": 10})
+    table_a = cache.get(registry.plan("a"), provider)
+    table_b = cache.get(registry.plan("b"), provider)
+
+    assert cache.get(registry.plan("a"), provider) is table_a
+    # 같은 내용의 경로는 같은 표를 쓴다
+    assert cache.get(registry.plan("a-copy"), provider) is table_a
+    assert cache.get(registry.plan("b"), provider) is table_b
+    assert cache.get(registry.plan("b"), HeadwayWaitProvider({"51": 10})) is not table_b
+
+
+def test_owners_have_separate_namespaces_and_limits():
+    registry = RouteRegistry(max_routes_per_owner=2)
+    registry.register("r", [Move(1)], owner="alice")
+    registry.register("r", [Move(2)], owner="bob")
+
+    assert registry.plan("r", owner="alice").steps == (1,)
+    assert registry.plan("r", owner="bob").steps == (2,)
+    assert "r" not in registry and ("alice", "r") in registry
+
+    registry.register("s", [Move(3)], owner="alice")
+    registry.register("s", [Move(4)], owner="alice")  # 교체는 개수에 안 든다
+    with pytest.raises(ValueError):
+        registry.register("t", [Move(5)], owner="alice")
+    registry.register("t", [Move(5)], owner="bob")
+
+    assert registry.remove("s", owner="alice") and not registry.remove("s", owner="bob")
+    registry.register("t", [Move(5)], owner="alice")
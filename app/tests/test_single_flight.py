@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from app.adapters.coalescing_eta_provider import CoalescingEtaProvider
+from app.adapters.gbis_bus_eta_provider import GbisBusEtaProvider
+from app.adapters.gbis_cache import GbisLookupCache
+from app.adapters.single_flight import SingleFlightCache
+from app.tests.fake_clock import FakeClock
+
+
+def _concurrently(n: int, fn) -> list:
+    out = [None] * n
+
+    def run(i):
+        try:
+            out[i] = fn(i)
+        except Exception as e:
+            out[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return out
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = SingleFlightCache(ttl_sec=10)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return 7
+
+    assert _concurrently(8, lambda i: cache.get("k", fetch)) == [7] * 8
+    assert len(calls) == 1
+    assert cache.misses == 1 and cache.coalesced == 7
+
+
+def test_errors_reach_all_waiters_and_are_not_cached():
+    cache = SingleFlightCache(ttl_sec=10)
+
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("down")
+
+    out = _concurrently(4, lambda i: cache.get("k", fail))
+    assert all(isinstance(e, RuntimeError) for e in out)
+    assert cache.get("k", lambda: 3) == 3
+
+
+def test_stale_value_served_while_one_refresh_runs():
+    clock = FakeClock(1_000.0)
+    cache = SingleFlightCache(ttl_sec=10, stale_sec=30, clock=clock)
+    cache.put("k", "old")
+    clock.now += 15
+
+    gate = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        gate.wait(5)
+        return "new"
+
+    assert [cache.get("k", refresh) for _ in range(5)] == ["old"] * 5
+    gate.set()
+    for _ in range(50):
+        if cache.peek("k") == "new":
+            break
+        time.sleep(0.01)
+    assert cache.get("k", refresh) == "new"
+    assert len(calls) == 1
+
+    # stale 구간도 지나면 다시 동기 fetch
+    clock.now += 100
+    assert cache.get("k", lambda: "newer") == "newer"
+
+
+def test_entries_are_bounded():
+    cache = SingleFlightCache(ttl_sec=10, max_entries=2)
+    for i in range(5):
+        cache.get(i, lambda i=i: i)
+    assert cache.peek(0) is None and cache.peek(4) == 4
+
+
+def test_gbis_routes_at_same_station_share_one_call(tmp_path):
+    calls = []
+
+    def fake_get_json(url, params):
+        calls.append(params["stationId"])
+        time.sleep(0.2)
+        arrivals = [
+            {"routeName": "51", "predictTime1": 3, "predictTime2": 11},
+            {"routeName": "5100", "predictTime1": 6},
+        ]
+        return {"response": {"msgHeader": {"resultCode": 0}, "msgBody": {"busArrivalList": arrivals}}}
+
+    bus = GbisBusEtaProvider(service_key="k", lookup_cache=GbisLookupCache(tmp_path / "gbis.json"))
+    bus._get_json = fake_get_json
+
+    routes = ["51", "5100"] * 4
+    etas = _concurrently(len(routes), lambda i: bus.get_eta_minutes("206000043", routes[i]))
+    assert sorted(etas) == [3] * 4 + [6] * 4
+    assert calls == ["206000043"]
+
+
+class CountingProvider:
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_eta_minutes(self, stop: str, route: str) -> int | None:
+        self.calls += 1
+        time.sleep(0.1)
+        return 5
+
+
+def test_coalescing_provider_wraps_any_eta_provider():
+    inner = CountingProvider()
+    provider = CoalescingEtaProvider(inner, ttl_sec=60)
+
+    assert _concurrently(6, lambda i: provider.get_eta_minutes("이마트앞 ", "51")) == [5] * 6
+    assert provider.get_eta_minutes("이마트앞", "51") == 5
+    assert inner.calls == 1 and provider.name == "counting"
+
+    with pytest.raises(AttributeError):
+        provider.get_station_arrivals("이마트앞")
+
+
+def test_interrupted_fetch_releases_waiters():
+    cache = SingleFlightCache(ttl_sec=10)
+    started = threading.Event()
+
+    def interrupted():
+        started.set()
+        time.sleep(0.2)
+        raise KeyboardInterrupt
+
+    def follower():
+        started.wait(5)
+        try:
+            return cache.get("k", lambda: "unused")
+        except RuntimeError as e:
+            return e
+
+    out = []
+    t = threading.Thread(target=lambda: out.append(follower()))
+    t.start()
+    with pytest.raises(KeyboardInterrupt):
+        cache.get("k", interrupted)
+    t.join(5)
+
+    assert not t.is_alive() and isinstance(out[0], RuntimeError)
+    # 죽은 flight에 합류하지 않고 새로 fetch
+    assert cache.get("k", lambda: 5) == 5
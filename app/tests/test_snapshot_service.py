@@ -0,0 +1,139 @@
+import time
+from datetime import datetime, timedelta
+
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.services.snapshot_service import (
+    DEFAULT_LIVE_BINDINGS,
+    AsyncLiveSnapshotBuilder,
+    LiveBinding,
+    SnapshotService,
+    live_snapshot_builder,
+)
+from app.tests.fake_clock import FakeClock
+
+
+def _snapshot(now):
+    return WaitSnapshot(now=now, arrivals_after_now={}, max_wait_by_route={})
+
+
+def test_refresh_publishes_new_version_and_keeps_last_good_on_error():
+    clock = FakeClock(datetime(2026, 1, 5, 8, 0))
+    fail = {"on": False}
+
+    def build(now):
+        if fail["on"]:
+            raise RuntimeError("upstream down")
+        return _snapshot(now)
+
+    svc = SnapshotService(build, interval_sec=30, clock=clock)
+    assert svc.current() is None
+
+    first = svc.refresh()
+    assert svc.current() is first and svc.version == 1
+
+    fail["on"] = True
+    assert svc.refresh() is None
+    assert svc.current() is first and svc.version == 1
+    assert "upstream down" in svc.last_error
+
+    clock.now += timedelta(seconds=91)  # max_age 기본값 = interval * 3
+    assert svc.current() is None
+
+
+def test_background_thread_calls_upstream_per_interval_not_per_read():
+    calls = []
+
+    def build(now):
+        calls.append(now)
+        return _snapshot(now)
+
+    svc = SnapshotService(build, interval_sec=0.05)
+    svc.start()
+    try:
+        deadline = time.monotonic() + 2
+        while svc.current() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(1000):
+            assert svc.current() is not None
+    finally:
+        svc.stop(timeout=1)
+    assert 1 <= len(calls) < 100
+
+
+def test_live_builder_exposes_engine_keys():
+    class Bus:
+        def get_station_arrivals(self, stop):
+            return {"51": [4, 17]}
+
+    class Subway:
+        def get_next_arrivals(self, stop, max_results=3):
+            return [2, 9]
+
+    build = live_snapshot_builder(
+        bus_provider=Bus(),
+        subway_provider=Subway(),
+        bindings=[
+            LiveBinding("bus", "stop_c", "bus_51", "206000043", "51", 15),
+            LiveBinding("subway", "migeum_station", "subway_suin", "미금", "수인분당선", 10),
+        ],
+    )
+    snap = build(datetime(2026, 1, 5, 8, 0))
+
+    assert snap.wait("stop_c", "bus_51", "08:01") == 3
+    assert snap.wait("stop_c", "bus_51", "08:10") == 7  # predictTime2까지 사용
+    assert snap.wait("migeum_station", "subway_suin", "08:03") == 6
+    assert snap.wait("stop_c", "bus_51", "08:30") == 15
+
+
+def test_lifespan_starts_and_closes_live_snapshot(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.services import snapshot_service as service_module
+
+    calls = []
+
+    async def fake_build(now, **kwargs):
+        calls.append(now)
+        return _snapshot(now)
+
+    monkeypatch.setattr(service_module, "build_wait_provider_snapshot_async", fake_build)
+    monkeypatch.setenv("ONTIME_LIVE_SNAPSHOT", "1")
+    monkeypatch.setenv("DATA_GO_KR_SERVICE_KEY", "k")
+    monkeypatch.setenv("SEOUL_OPENAPI_KEY", "k")
+
+    with TestClient(main.app) as client:
+        svc = main.snapshot_service
+        deadline = time.monotonic() + 2
+        while svc.current() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.get("/health").status_code == 200
+        builder = svc._build
+
+    # 실행 중인 이벤트 루프 안(lifespan)에서 닫아도 builder 루프/연결 풀이 정리된다
+    assert calls and main.snapshot_service is None
+    assert builder._loop.is_closed() and builder._client.is_closed
+
+
+def test_live_builder_headway_fallback_uses_snapshot_now(monkeypatch):
+    from app.services import snapshot_service as service_module
+
+    seen = []
+
+    async def fake_build(now, subway_provider, **kwargs):
+        headway = subway_provider.sources[-1]
+        seen.append(headway.fetch("미금", "수인분당선", 2))
+        return _snapshot(now)
+
+    monkeypatch.setattr(service_module, "build_wait_provider_snapshot_async", fake_build)
+    monkeypatch.setenv("SEOUL_OPENAPI_KEY", "k")
+    monkeypatch.setenv("DATA_GO_KR_SERVICE_KEY", "k")
+
+    builder = AsyncLiveSnapshotBuilder(DEFAULT_LIVE_BINDINGS)
+    try:
+        builder(datetime(2026, 1, 5, 8, 3))
+        builder(datetime(2026, 1, 5, 8, 7))
+    finally:
+        builder.close()
+    # 벽시계가 아니라 스냅샷 시각 기준 배차 대기(8분 간격: 08:03 -> 5분, 08:07 -> 1분)
+    assert seen == [[5, 13], [1, 9]]
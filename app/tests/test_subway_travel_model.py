@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app.adapters.subway_line_graph import BACKWARD, FORWARD, LineGraph
+from app.adapters.subway_position_eta_provider import PositionFeedCache, SubwayPositionEtaProvider
+from app.adapters.subway_travel_model import (
+    TravelTimeTable,
+    cumulative_minutes,
+    fit_travel_table,
+    load_travel_tables,
+    save_travel_tables,
+)
+
+GRAPH = LineGraph("테스트선", {"main": ["a", "b", "c", "d"]})
+
+
+def _run(start, stations, step_min, sample_sec=20):
+    # 역마다 step_min 머문다고 보고 sample_sec 간격으로 관측
+    out = []
+    t = start
+    for s in stations:
+        end = t + timedelta(minutes=step_min[s])
+        while t < end:
+            out.append((t, s))
+            t += timedelta(seconds=sample_sec)
+    return out
+
+
+def test_fit_uses_first_sighting_per_station():
+    start = datetime(2026, 1, 5, 8, 0)
+    steps = {"a": 3, "b": 1, "c": 2, "d": 1}
+    trains = {f"t{i}": _run(start + timedelta(minutes=10 * i), "abcd", steps) for i in range(3)}
+    trains["back"] = _run(start, "dcb", {"d": 1, "c": 4, "b": 1})
+
+    table = fit_travel_table(GRAPH, trains, min_samples=3)
+    assert table.steps[("main", FORWARD)] == [3.0, 1.0, 2.0]
+    assert table.samples[("main", FORWARD)] == [3, 3, 3]
+    # 역방향은 1대뿐이라 min_samples 미달 -> 학습 안 됨
+    assert ("main", BACKWARD) not in table.steps
+
+
+def test_cumulative_minutes_fallback_and_backward():
+    table = TravelTimeTable("테스트선", steps={("main", FORWARD): [3.0, None, 2.0]})
+    cum = cumulative_minutes(GRAPH, table, per_station_min=1.5)
+    assert cum[("main", FORWARD)] == [0.0, 3.0, 4.5, 6.5]
+    # 역방향 d -> a: 위치가 작을수록 누적이 크다
+    assert cum[("main", BACKWARD)] == [4.5, 3.0, 1.5, 0.0]
+
+
+def test_provider_applies_learned_table(tmp_path):
+    table = TravelTimeTable("테스트선", steps={("main", FORWARD): [3.0, 1.0, 2.0]})
+    path = tmp_path / "travel.json"
+    save_travel_tables(path, {"테스트선": table})
+    loaded = load_travel_tables(path)["테스트선"]
+
+    provider = SubwayPositionEtaProvider(
+        api_key="k",
+        line_name="테스트선",
+        graph=GRAPH,
+        feed=PositionFeedCache(),
+        travel_table=loaded,
+    )
+    index = provider._model.store_index(
+        {
+            "realtimePositionList": [
+                {"statnNm": "a", "statnTnm": "d"},
+                {"statnNm": "b", "statnTnm": "d"},
+                {"statnNm": "c", "statnTnm": "a"},
+            ]
+        },
+        datetime.now().timestamp(),
+    )
+    queries = provider._model.lane_queries("d", None, None)
+    # a -> d = 3+1+2, b -> d = 1+2 (학습값은 정차 포함 -> dwell을 더하지 않는다)
+    assert provider._model.arrivals_from_index(index, queries, 3, datetime.now()) == [3, 6]
+    # 학습되지 않은 역방향은 상수 + dwell: c -> a = 2*2.0 + 0.5
+    queries = provider._model.lane_queries("a", None, BACKWARD)
+    assert provider._model.arrivals_from_index(index, queries, 3, datetime.now()) == [5]
@@ -0,0 +1,94 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from app.adapters.headway_wait_provider import HeadwayWaitProvider
+from app.adapters.wait_provider_snapshot import WaitSnapshot
+from app.services.decision_engine import (
+    FIXED_ROUTE_SEGMENTS,
+    Board,
+    InfeasibleRouteError,
+    Move,
+    compute_departure_minutes,
+)
+from app.services.transit_graph import RideEdge, TransitGraph
+
+
+def _headway():
+    return HeadwayWaitProvider({"subway_suin": 8, "bus_5100": 12, "bus_51": 10})
+
+
+def test_linear_route_matches_engine():
+    graph = TransitGraph.from_alternatives([FIXED_ROUTE_SEGMENTS])
+    snap = WaitSnapshot(
+        now=datetime(2026, 1, 5, 7, 0),
+        arrivals_after_now={("migeum_station", "subway_suin"): [4, 12, 20], ("stop_b", "bus_5100"): [30, 55]},
+        max_wait_by_route={"bus_51": 10, "subway_suin": 8, "bus_5100": 15},
+    )
+
+    for provider in (_headway(), snap):
+        for m in range(0, 24 * 60, 5):
+            expected = compute_departure_minutes(m, FIXED_ROUTE_SEGMENTS, provider)
+            journey = graph.search("origin", "destination", m, provider)
+            assert journey.departure_min == expected
+
+
+def test_picks_latest_departure_among_alternatives():
+    direct_5100 = [Move(12), Board(stop="stop_a", route="bus_5100"), Move(35), Board(stop="stop_c", route="bus_51"), Move(20)]
+    graph = TransitGraph.from_alternatives([FIXED_ROUTE_SEGMENTS, direct_5100])
+    provider = _headway()
+    arrival = 9 * 60
+
+    journey = graph.search("origin", "destination", arrival, provider)
+    best = max(
+        compute_departure_minutes(arrival, FIXED_ROUTE_SEGMENTS, provider),
+        compute_departure_minutes(arrival, direct_5100, provider),
+    )
+    assert journey.departure_min == best
+    routes = [leg.edge.route for leg in journey.legs if isinstance(leg.edge, RideEdge)]
+    assert routes == ["bus_5100", "bus_51"]
+    assert journey.legs[-1].arrive_by_min == arrival
+
+
+def test_unreachable_origin_raises():
+    graph = TransitGraph()
+    graph.add_ride("origin", "destination", "bus_51", 10)
+
+    with pytest.raises(InfeasibleRouteError):
+        graph.search("origin", "destination", 600, lambda s, r, t: 999, max_wait_search_min=30)
+    with pytest.raises(ValueError):
+        graph.add_walk("a", "b", -1)
+
+
+def test_provider_errors_are_not_treated_as_infeasible():
+    graph = TransitGraph()
+    graph.add_ride("origin", "destination", "bus_51", 10)
+    graph.add_walk("origin", "destination", 60)
+
+    # 음수 대기는 입력 오류 -> 도보 대안으로 넘어가지 않고 그대로 올라온다
+    with pytest.raises(ValueError, match="negative") as info:
+        graph.search("origin", "destination", 600, lambda s, r, t: -1)
+    assert not isinstance(info.value, InfeasibleRouteError)
+
+
+def test_hundreds_of_stops_answer_quickly():
+    rng = random.Random(7)
+    stops = [f"s{i}" for i in range(400)]
+    graph = TransitGraph()
+    for i, stop in enumerate(stops):
+        for _ in range(3):
+            j = rng.randrange(len(stops))
+            if j != i:
+                graph.add_ride(stop, stops[j], f"r{rng.randrange(40)}", rng.randint(2, 15))
+        graph.add_walk(stop, stops[(i + 1) % len(stops)], rng.randint(1, 10))
+    graph.add_walk("s0", "destination", 5)
+    provider = HeadwayWaitProvider({}, default_headway=10)
+
+    t0 = time.perf_counter()
+    latest, _ = graph.latest_times("destination", 9 * 60, provider)
+    elapsed = time.perf_counter() - t0
+
+    assert len(latest) > 300
+    assert elapsed < 0.5
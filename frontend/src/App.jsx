@@ -1,4 +1,4 @@
-﻿import { useCallback, useEffect, useMemo, useState } from "react";
+﻿import { useEffect, useMemo, useState } from "react";
 import Dashboard from "./pages/Dashboard.jsx";
 import RouteSettings from "./pages/RouteSettings.jsx";
 
@@ -37,18 +37,6 @@ function loadSettings() {
   }
 }
 
-function toUserError(err) {
-  if (!(err instanceof Error)) {
-    return "네트워크 오류입니다.";
-  }
-
-  if (err.message === "Failed to fetch") {
-    return `서버에 연결할 수 없습니다. 백엔드를 실행했는지 확인해주세요. (${API_BASE})`;
-  }
-
-  return err.message;
-}
-
 export default function App() {
   const [screen, setScreen] = useState("dashboard");
   const [settings, setSettings] = useState(loadSettings);
@@ -59,38 +47,6 @@ export default function App() {
   const isSupportedRoute =
     settings.origin === "집" && settings.destination === "학교";
 
-  const computeRecommendation = useCallback(async (destinationTime) => {
-    setLoading(true);
-    setError("");
-
-    try {
-      const response = await fetch(`${API_BASE}/compute`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ destination_time: destinationTime }),
-      });
-
-      const payload = await response.json().catch(() => ({}));
-      if (!response.ok) {
-        const detail =
-          typeof payload.detail === "string"
-            ? payload.detail
-            : "요청에 실패했습니다.";
-        throw new Error(`${detail} (HTTP ${response.status})`);
-      }
-
-      if (typeof payload.recommended_departure_time === "string") {
-        setRecommendedTime(payload.recommended_departure_time);
-      } else {
-        throw new Error("추천 출발 시간이 응답에 없습니다.");
-      }
-    } catch (err) {
-      setError(toUserError(err));
-    } finally {
-      setLoading(false);
-    }
-  }, []);
-
   useEffect(() => {
     localStorage.setItem(STORAGE_KEY, JSON.stringify(settings));
   }, [settings]);
@@ -110,14 +66,52 @@ export default function App() {
       return;
     }
 
-    computeRecommendation(settings.destinationTime);
+    // 서버가 새 스냅샷으로 추천 출발이 바뀔 때만 push한다(polling 없음)
+    setLoading(true);
+    setError("");
+    const query = new URLSearchParams({
+      destination_time: settings.destinationTime,
+    });
+    const source = new EventSource(`${API_BASE}/compute/stream?${query}`);
+
+    source.addEventListener("departure", (event) => {
+      setLoading(false);
+      let payload;
+      try {
+        payload = JSON.parse(event.data);
+      } catch {
+        setError("서버 응답을 해석할 수 없습니다.");
+        return;
+      }
+
+      if (typeof payload.recommended_departure_time === "string") {
+        setRecommendedTime(payload.recommended_departure_time);
+        setError("");
+      } else {
+        setError(
+          typeof payload.error === "string"
+            ? payload.error
+            : "추천 출발 시간이 응답에 없습니다."
+        );
+      }
+    });
+
+    // EventSource는 끊기면 스스로 다시 연결한다
+    source.onerror = () => {
+      setLoading(false);
+      setError(
+        `서버에 연결할 수 없습니다. 다시 연결하는 중입니다. (${API_BASE})`
+      );
+    };
+    source.onopen = () => setError("");
+
+    return () => source.close();
   }, [
     screen,
     settings.destinationTime,
     settings.origin,
     settings.destination,
     isSupportedRoute,
-    computeRecommendation,
   ]);
 
   const onSaveSettings = (nextSettings) => {